@@ -0,0 +1,64 @@
+"""Add m8flow_templates.first_bpmn_file_name and backfill it from files.
+
+TemplateModel keeps the column in sync whenever ``files`` is assigned, so reading
+a template's BPMN no longer scans the JSON files list.
+
+Revision ID: r1k2l3m4n5o6
+Revises: p9i0j1k2l3m4
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "r1k2l3m4n5o6"
+down_revision = "p9i0j1k2l3m4"
+branch_labels = None
+depends_on = None
+
+TEMPLATES_TABLE = "m8flow_templates"
+COLUMN = "first_bpmn_file_name"
+
+
+def _column_exists(table_name: str, column_name: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(column["name"] == column_name for column in inspector.get_columns(table_name))
+
+
+def _first_bpmn_file_name(files) -> str | None:
+    for entry in files or []:
+        if entry.get("file_type") == "bpmn" and entry.get("file_name"):
+            return entry["file_name"]
+    return None
+
+
+def upgrade():
+    if not _column_exists(TEMPLATES_TABLE, COLUMN):
+        op.add_column(TEMPLATES_TABLE, sa.Column(COLUMN, sa.String(length=255), nullable=True))
+
+    templates = sa.table(
+        TEMPLATES_TABLE,
+        sa.column("id", sa.Integer),
+        sa.column("files", sa.JSON),
+        sa.column(COLUMN, sa.String),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(templates.c.id, templates.c.files).where(templates.c[COLUMN].is_(None))).all()
+    updates = [
+        {"template_id": row.id, "name": name}
+        for row in rows
+        if (name := _first_bpmn_file_name(row.files)) is not None
+    ]
+    if updates:
+        bind.execute(
+            templates.update().where(templates.c.id == sa.bindparam("template_id")).values({COLUMN: sa.bindparam("name")}),
+            updates,
+        )
+
+
+def downgrade():
+    if _column_exists(TEMPLATES_TABLE, COLUMN):
+        op.drop_column(TEMPLATES_TABLE, COLUMN)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
-from sqlalchemy import Index, UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint, false
 from sqlalchemy.orm import validates
 
 from spiffworkflow_backend.helpers.spiff_enum import SpiffEnum
@@ -18,12 +18,27 @@ class TemplateVisibility(SpiffEnum):
     public = "PUBLIC"
 
 
+# Plain-string visibility values, resolved once so hot comparisons skip the Enum
+# descriptor lookup on every access.
+VISIBILITY_PRIVATE = TemplateVisibility.private.value
+VISIBILITY_TENANT = TemplateVisibility.tenant.value
+VISIBILITY_PUBLIC = TemplateVisibility.public.value
+
+# Accept either the member name (backward compatibility) or the stored value.
+_VISIBILITY_BY_NAME_OR_VALUE = {
+    **{member.name: member.value for member in TemplateVisibility},
+    **{member.value: member.value for member in TemplateVisibility},
+}
+
+
 @dataclass
 class TemplateModel(SpiffworkflowBaseDBModel, AuditDateTimeMixin):
     """Template metadata and version rows (one row per version)."""
 
     __tablename__ = "m8flow_templates"
     __table_args__ = (
+        # The unique index doubles as the (tenant, key, version) lookup index used by
+        # TemplateService; keep the column order so tenant + key queries can seek on it.
         UniqueConstraint("m8f_tenant_id", "template_key", "version", name="uq_template_key_version_tenant"),
         Index("ix_template_template_key", "template_key"),
         Index("ix_template_m8f_tenant_id", "m8f_tenant_id"),
@@ -45,38 +60,39 @@ class TemplateModel(SpiffworkflowBaseDBModel, AuditDateTimeMixin):
         db.ForeignKey("m8flow_tenant.id"),
         nullable=False,
     )  # type: ignore
-    visibility: str = db.Column(db.String(20), nullable=False, default=TemplateVisibility.private.value)
+    visibility: str = db.Column(db.String(20), nullable=False, default=VISIBILITY_PRIVATE)
     files: list[dict] = db.Column(db.JSON, nullable=False)  # [{"file_type": "bpmn"|"json"|"dmn"|"md", "file_name": str}]
+    # Denormalized from ``files`` on assignment so BPMN reads skip the JSON scan; NULL on rows
+    # written before the column existed.
+    first_bpmn_file_name: Optional[str] = db.Column(db.String(255), nullable=True)
     is_published: bool = db.Column(db.Boolean, default=False, nullable=False)
     status: Optional[str] = db.Column(db.String(50), nullable=True)
-    is_deleted: bool = db.Column(db.Boolean, default=False, nullable=False)
+    is_deleted: bool = db.Column(db.Boolean, default=False, nullable=False, server_default=false())
 
     created_by: str = db.Column(db.String(255), nullable=False)
     modified_by: str = db.Column(db.String(255), nullable=False)
 
     @validates("visibility")
     def validate_visibility(self, _key: str, value: str) -> str:
-        # First try to find by member name (for backward compatibility)
-        try:
-            m_type = getattr(TemplateVisibility, value, None)
-            if m_type is not None:
-                return m_type.value
-        except Exception:
-            pass
-        
-        # If not found by name, try to find by value
-        for member in TemplateVisibility:
-            if member.value == value:
-                return member.value
-        
-        # If neither found, raise error
+        if isinstance(value, str):
+            resolved = _VISIBILITY_BY_NAME_OR_VALUE.get(value)
+            if resolved is not None:
+                return resolved
         raise ValueError(f"{self.__class__.__name__}: invalid visibility: {value}")
 
+    @validates("files")
+    def validate_files(self, _key: str, value: list[dict]) -> list[dict]:
+        self.first_bpmn_file_name = next(
+            (e.get("file_name") for e in value or [] if e.get("file_type") == "bpmn" and e.get("file_name")),
+            None,
+        )
+        return value
+
     def is_private(self) -> bool:
-        return self.visibility == TemplateVisibility.private.value
+        return self.visibility == VISIBILITY_PRIVATE
 
     def is_tenant_visible(self) -> bool:
-        return self.visibility == TemplateVisibility.tenant.value
+        return self.visibility == VISIBILITY_TENANT
 
     def is_public(self) -> bool:
-        return self.visibility == TemplateVisibility.public.value
+        return self.visibility == VISIBILITY_PUBLIC
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import json
+import re
 from urllib.parse import quote
 
-from flask import Response, jsonify, request, g
+from flask import Response, jsonify, request, g, send_file
 
 from spiffworkflow_backend.exceptions.api_error import ApiError
 
@@ -12,8 +13,14 @@ from m8flow_backend.models.template import TemplateModel
 from m8flow_backend.services.template_service import TemplateService
 
 
+# RFC 7230 token characters minus "%", "'" and "*", which carry meaning in RFC 5987 parameters.
+_PLAIN_FILENAME_RE = re.compile(r"[A-Za-z0-9!#$&+.^_`|~-]+")
+
+
 def _safe_content_disposition(filename: str) -> dict[str, str]:
     """Build Content-Disposition header safe from injection (RFC 5987)."""
+    if _PLAIN_FILENAME_RE.fullmatch(filename):
+        return {"Content-Disposition": f'attachment; filename="{filename}"'}
     safe = quote(filename, safe="")
     return {"Content-Disposition": f"attachment; filename*=UTF-8''{safe}"}
 
@@ -297,16 +304,15 @@ def template_get_file(id: int, file_name: str):
     if not found:
         raise ApiError("not_found", f"File not found: {file_name}", status_code=404)
     try:
-        content = TemplateService.get_file_content(template, file_name)
+        path = TemplateService.file_path(template, file_name)
     except ApiError:
         raise ApiError("not_found", f"File not found: {file_name}", status_code=404)
     mimetypes = {"bpmn": "application/xml", "json": "application/json", "dmn": "application/xml", "md": "text/markdown"}
     mime = mimetypes.get(found.get("file_type", ""), "application/octet-stream")
-    return Response(
-        content,
-        mimetype=mime,
-        headers=_safe_content_disposition(file_name),
-    )
+    # A path (not a handle) gives send_file the size and mtime for Content-Length, Last-Modified and ranges.
+    response = send_file(path, mimetype=mime)
+    response.headers.update(_safe_content_disposition(file_name))
+    return response
 
 
 def template_put_file(id: int, file_name: str):
@@ -342,9 +348,10 @@ def template_delete_file(id: int, file_name: str):
 def template_export(id: int):
     """Export template as zip."""
     user = getattr(g, "user", None)
-    zip_bytes, filename = TemplateService.export_template_zip(id, user=user)
+    # Chunks are produced one stored file at a time while the response is being sent.
+    chunks, filename = TemplateService.iter_export_template_zip(id, user=user)
     return Response(
-        zip_bytes,
+        chunks,
         mimetype="application/zip",
         headers=_safe_content_disposition(filename),
     )
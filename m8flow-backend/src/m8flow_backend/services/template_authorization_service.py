@@ -6,7 +6,7 @@ from sqlalchemy import or_, and_
 from spiffworkflow_backend.services.authorization_service import AuthorizationService
 from spiffworkflow_backend.models.user import UserModel
 
-from m8flow_backend.models.template import TemplateModel, TemplateVisibility
+from m8flow_backend.models.template import TemplateModel, VISIBILITY_PRIVATE, VISIBILITY_TENANT, VISIBILITY_PUBLIC
 
 
 class TemplateAuthorizationService:
@@ -53,17 +53,8 @@ class TemplateAuthorizationService:
 
     @classmethod
     def can_view(cls, template: TemplateModel, user: UserModel | None = None) -> bool:
-        tenant_id = cls._tenant_id()
-
-        # Admin can view any template in their tenant.
-        if (
-            user is not None
-            and cls.has_admin_permission(user, "read")
-            and tenant_id is not None
-            and tenant_id == template.m8f_tenant_id
-        ):
-            return True
-
+        # In-memory checks run first; the RBAC lookup is only needed for in-tenant
+        # templates the user does not already see by visibility or ownership.
         if cls._is_super_admin_request(user=user):
             return True
 
@@ -71,19 +62,23 @@ class TemplateAuthorizationService:
         if template.is_public():
             return True
 
-        # TENANT: must match tenant
+        # TENANT and PRIVATE both require a matching tenant.
+        tenant_id = cls._tenant_id()
+        if tenant_id is None or tenant_id != template.m8f_tenant_id:
+            return False
+
         if template.is_tenant_visible():
-            return tenant_id is not None and tenant_id == template.m8f_tenant_id
-
-        # PRIVATE: must be creator and same tenant
-        if template.is_private():
-            return (
-                user is not None
-                and template.created_by == user.username
-                and tenant_id is not None
-                and tenant_id == template.m8f_tenant_id
-            )
-        return False
+            return True
+
+        if user is None:
+            return False
+
+        # PRIVATE: creator can view
+        if template.is_private() and template.created_by == user.username:
+            return True
+
+        # Admin can view any template in their tenant.
+        return cls.has_admin_permission(user, "read")
 
     @classmethod
     def can_edit(cls, template: TemplateModel, user: UserModel | None = None) -> bool:
@@ -109,21 +104,21 @@ class TemplateAuthorizationService:
         return False
 
     @classmethod
-    def filter_query_by_visibility(cls, query, user: UserModel | None = None):
-        """Apply visibility filters for the current tenant/user."""
+    def visibility_criterion(cls, user: UserModel | None = None):
+        """Return the visibility WHERE clause for the current tenant/user, or None for super-admin."""
         if cls._is_super_admin_request(user=user):
-            return query
+            return None
 
         tenant_id = cls._tenant_id()
         if tenant_id is None:
             # No tenant context; default deny non-public
-            return query.filter(TemplateModel.visibility == TemplateVisibility.public.value)
+            return TemplateModel.visibility == VISIBILITY_PUBLIC
 
         # PUBLIC or same-tenant TENANT; PRIVATE only for owner
         conditions = [
-            TemplateModel.visibility == TemplateVisibility.public.value,
+            TemplateModel.visibility == VISIBILITY_PUBLIC,
             and_(
-                TemplateModel.visibility == TemplateVisibility.tenant.value,
+                TemplateModel.visibility == VISIBILITY_TENANT,
                 TemplateModel.m8f_tenant_id == tenant_id
             ),
         ]
@@ -131,16 +126,24 @@ class TemplateAuthorizationService:
             if cls.has_admin_permission(user, "read"):
                 conditions.append(
                     and_(
-                        TemplateModel.visibility == TemplateVisibility.private.value,
+                        TemplateModel.visibility == VISIBILITY_PRIVATE,
                         TemplateModel.m8f_tenant_id == tenant_id,
                     )
                 )
             else:
                 conditions.append(
                     and_(
-                        TemplateModel.visibility == TemplateVisibility.private.value,
+                        TemplateModel.visibility == VISIBILITY_PRIVATE,
                         TemplateModel.m8f_tenant_id == tenant_id,
                         TemplateModel.created_by == user.username
                     )
                 )
-        return query.filter(or_(*conditions))
+        return or_(*conditions)
+
+    @classmethod
+    def filter_query_by_visibility(cls, query, user: UserModel | None = None):
+        """Apply visibility filters for the current tenant/user."""
+        criterion = cls.visibility_criterion(user=user)
+        if criterion is None:
+            return query
+        return query.filter(criterion)
@@ -8,10 +8,10 @@ import re
 import string
 import zipfile
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterator
 
 from flask import g
-from sqlalchemy import or_
+from sqlalchemy import false, lambda_stmt, or_, select, true
 from sqlalchemy.exc import IntegrityError
 
 from spiffworkflow_backend.exceptions.api_error import ApiError
@@ -23,7 +23,7 @@ from spiffworkflow_backend.services.process_model_service import ProcessModelSer
 from spiffworkflow_backend.services.spec_file_service import SpecFileService
 
 from m8flow_backend.models.process_model_template import ProcessModelTemplateModel
-from m8flow_backend.models.template import TemplateModel, TemplateVisibility
+from m8flow_backend.models.template import TemplateModel, VISIBILITY_PRIVATE, VISIBILITY_PUBLIC
 from m8flow_backend.services.template_authorization_service import TemplateAuthorizationService
 from m8flow_backend.tenancy import is_super_admin_request
 from m8flow_backend.services.template_storage_service import (
@@ -174,7 +174,7 @@ class TemplateService:
                 )
 
         version = explicit_version or cls._next_version(template_key, tenant)
-        visibility = metadata.get("visibility", TemplateVisibility.private.value)
+        visibility = metadata.get("visibility", VISIBILITY_PRIVATE)
         tags = metadata.get("tags")
         category = metadata.get("category")
         description = metadata.get("description")
@@ -251,61 +251,65 @@ class TemplateService:
         page: int = 1,
         per_page: int = 10,
     ) -> tuple[list[TemplateModel], dict]:
-        query = TemplateModel.query
-        query = TemplateAuthorizationService.filter_query_by_visibility(query, user=user)
+        # Built as a lambda statement like get_template: each combination of filters
+        # compiles once and later calls only bind new parameter values.
+        stmt = lambda_stmt(lambda: select(TemplateModel))
+        visibility_filter = TemplateAuthorizationService.visibility_criterion(user=user)
+        if visibility_filter is not None:
+            stmt += lambda s: s.where(visibility_filter)
         if deleted_only:
-            query = query.filter(TemplateModel.is_deleted.is_(True))
+            stmt += lambda s: s.where(TemplateModel.is_deleted == true())
         elif not include_deleted:
-            query = query.filter(TemplateModel.is_deleted.is_(False))
+            stmt += lambda s: s.where(TemplateModel.is_deleted == false())
 
         is_super_admin = TemplateAuthorizationService._is_super_admin_request(user=user)
 
         # Non-super-admin tenant scoping: current tenant plus PUBLIC from any tenant.
         tenant = tenant_id or getattr(g, "m8flow_tenant_id", None)
         if tenant and not is_super_admin:
-            query = query.filter(
+            stmt += lambda s: s.where(
                 or_(
                     TemplateModel.m8f_tenant_id == tenant,
-                    TemplateModel.visibility == TemplateVisibility.public.value,
+                    TemplateModel.visibility == VISIBILITY_PUBLIC,
                 )
             )
 
         # Super-admin tenant filter: mirror regular tenant scoping (tenant-owned OR PUBLIC).
         if is_super_admin and filter_tenant_id:
-            query = query.filter(
+            stmt += lambda s: s.where(
                 or_(
                     TemplateModel.m8f_tenant_id == filter_tenant_id,
-                    TemplateModel.visibility == TemplateVisibility.public.value,
+                    TemplateModel.visibility == VISIBILITY_PUBLIC,
                 )
             )
 
         # Apply filters
         if category:
-            query = query.filter(TemplateModel.category == category)
-        
+            stmt += lambda s: s.where(TemplateModel.category == category)
+
         if owner:
-            query = query.filter(TemplateModel.created_by == owner)
-        
+            stmt += lambda s: s.where(TemplateModel.created_by == owner)
+
         if visibility:
-            query = query.filter(TemplateModel.visibility == visibility)
-        
+            stmt += lambda s: s.where(TemplateModel.visibility == visibility)
+
         if template_key:
-            query = query.filter(TemplateModel.template_key == template_key)
+            stmt += lambda s: s.where(TemplateModel.template_key == template_key)
 
         if published_only:
-            query = query.filter(TemplateModel.is_published.is_(True))
+            stmt += lambda s: s.where(TemplateModel.is_published.is_(True))
 
         if search:
             # Text search in name and description
             search_pattern = f"%{search}%"
-            query = query.filter(
+            stmt += lambda s: s.where(
                 or_(
                     TemplateModel.name.ilike(search_pattern),
                     TemplateModel.description.ilike(search_pattern)
                 )
             )
 
-        results: list[TemplateModel] = query.all()
+        results: list[TemplateModel] = list(db.session.scalars(stmt).all())
         
         # Filter by tags if provided (after query execution for JSON array compatibility)
         if tag:
@@ -363,25 +367,30 @@ class TemplateService:
         include_deleted: bool = False,
     ) -> TemplateModel | None:
         """Get template by key, scoped to tenant."""
-        query = TemplateModel.query.filter_by(template_key=template_key)
-        
+        # Lambda statements cache the constructed SELECT per criteria shape; closure values
+        # (key, tenant, version, visibility clause) are extracted as bound parameters.
+        stmt = lambda_stmt(lambda: select(TemplateModel).where(TemplateModel.template_key == template_key))
+
         # Filter by tenant to ensure tenant isolation
         tenant = tenant_id or getattr(g, "m8flow_tenant_id", None)
         if tenant:
-            query = query.filter(TemplateModel.m8f_tenant_id == tenant)
+            stmt += lambda s: s.where(TemplateModel.m8f_tenant_id == tenant)
 
         if not include_deleted:
             # Exclude soft-deleted templates by default
-            query = query.filter(TemplateModel.is_deleted.is_(False))
-        
+            stmt += lambda s: s.where(TemplateModel.is_deleted == false())
+
         if not suppress_visibility:
-            query = TemplateAuthorizationService.filter_query_by_visibility(query, user=user)
+            visibility = TemplateAuthorizationService.visibility_criterion(user=user)
+            if visibility is not None:
+                stmt += lambda s: s.where(visibility)
 
         if version:
-            return query.filter_by(version=version).first()
+            stmt += lambda s: s.where(TemplateModel.version == version).limit(1)
+            return db.session.scalars(stmt).first()
 
         # latest - already filtered by tenant above
-        rows = query.all()
+        rows = db.session.scalars(stmt).all()
         if not rows:
             return None
         return max(rows, key=lambda r: cls._version_key(r.version))
@@ -394,11 +403,8 @@ class TemplateService:
         include_deleted: bool = False,
     ) -> TemplateModel | None:
         """Get template by database ID with visibility checks."""
-        query = TemplateModel.query.filter_by(id=template_id)
-        if not include_deleted:
-            query = query.filter(TemplateModel.is_deleted.is_(False))
-        template = query.first()
-        if template is None:
+        template = db.session.get(TemplateModel, template_id)
+        if template is None or (template.is_deleted and not include_deleted):
             return None
         
         # Check visibility
@@ -474,14 +480,15 @@ class TemplateService:
 
         # Copy all files to new version
         new_files: list[dict] = []
+        storage = cls.storage
         for entry in (published_template.files or []):
             fname = entry.get("file_name")
             if not fname:
                 continue
             try:
-                content = cls.storage.get_file(tenant, key, published_template.version, fname)
+                content = storage.get_file(tenant, key, published_template.version, fname)
                 ft = entry.get("file_type", file_type_from_filename(fname))
-                cls.storage.store_file(tenant, key, next_version, fname, ft, content)
+                storage.store_file(tenant, key, next_version, fname, ft, content)
                 new_files.append({"file_type": ft, "file_name": fname})
             except ApiError as e:
                 logger.warning("Failed to copy file %s for new version %s: %s", fname, next_version, e)
@@ -693,12 +700,13 @@ class TemplateService:
             raise ApiError("forbidden", "You cannot delete this template", status_code=403)
 
         # Remove storage files for this specific version, best-effort.
+        storage = cls.storage
         for entry in template.files or []:
             file_name = entry.get("file_name")
             if not file_name:
                 continue
             try:
-                cls.storage.delete_file(
+                storage.delete_file(
                     template.m8f_tenant_id,
                     template.template_key,
                     template.version,
@@ -763,13 +771,34 @@ class TemplateService:
             file_name,
         )
 
+    @classmethod
+    def file_path(
+        cls,
+        template: TemplateModel,
+        file_name: str,
+    ) -> str:
+        """Filesystem path of one file by name, for send_file. Raises ApiError if not found."""
+        return cls.storage.file_path(
+            template.m8f_tenant_id,
+            template.template_key,
+            template.version,
+            file_name,
+        )
+
     @classmethod
     def get_first_bpmn_content(cls, template: TemplateModel) -> bytes | None:
         """Return content of first BPMN file, or None if none."""
+        first = template.first_bpmn_file_name
+        if first:
+            try:
+                return cls.get_file_content(template, first)
+            except ApiError:
+                pass
+        # Rows written before first_bpmn_file_name existed, or whose first BPMN is gone from storage.
         for entry in template.files or []:
             if entry.get("file_type") == "bpmn":
                 fname = entry.get("file_name")
-                if fname:
+                if fname and fname != first:
                     try:
                         return cls.get_file_content(template, fname)
                     except ApiError:
@@ -903,20 +932,43 @@ class TemplateService:
         user: UserModel | None = None,
     ) -> tuple[bytes, str]:
         """Return (zip bytes, suggested filename)."""
-        template = cls.get_template_by_id(template_id, user=user)
-        if template is None:
-            raise ApiError("not_found", "Template not found", status_code=404)
-        entries = template.files or []
-        if not entries:
-            raise ApiError("not_found", "Template has no files to export", status_code=404)
+        template = cls._get_exportable_template(template_id, user=user)
         zip_bytes = cls.storage.stream_zip(
             template.m8f_tenant_id,
             template.template_key,
             template.version,
-            entries,
+            template.files,
+        )
+        return zip_bytes, cls._export_filename(template)
+
+    @classmethod
+    def iter_export_template_zip(
+        cls,
+        template_id: int,
+        user: UserModel | None = None,
+    ) -> tuple[Iterator[bytes], str]:
+        """Return (zip chunk iterator, suggested filename). Lookup errors are raised before any chunk."""
+        template = cls._get_exportable_template(template_id, user=user)
+        chunks = cls.storage.iter_zip(
+            template.m8f_tenant_id,
+            template.template_key,
+            template.version,
+            template.files,
         )
-        filename = f"template-{template.template_key}-{template.version}.zip"
-        return zip_bytes, filename
+        return chunks, cls._export_filename(template)
+
+    @classmethod
+    def _get_exportable_template(cls, template_id: int, user: UserModel | None) -> TemplateModel:
+        template = cls.get_template_by_id(template_id, user=user)
+        if template is None:
+            raise ApiError("not_found", "Template not found", status_code=404)
+        if not template.files:
+            raise ApiError("not_found", "Template has no files to export", status_code=404)
+        return template
+
+    @staticmethod
+    def _export_filename(template: TemplateModel) -> str:
+        return f"template-{template.template_key}-{template.version}.zip"
 
     @classmethod
     def import_template_from_zip(
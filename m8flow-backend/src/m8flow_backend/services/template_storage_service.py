@@ -3,8 +3,10 @@ from __future__ import annotations
 import io
 import logging
 import os
+import re
 import zipfile
-from typing import Protocol
+from functools import lru_cache
+from typing import Iterator, Protocol
 
 from flask import current_app
 
@@ -20,9 +22,44 @@ FILE_EXT_TO_TYPE = {
 }
 
 
+# Templates reuse a handful of names (diagram.bpmn, form.json), so repeat lookups are dict hits.
+@lru_cache(maxsize=4096)
 def file_type_from_filename(filename: str) -> str:
-    ext = os.path.splitext(filename)[1].lower()
-    return FILE_EXT_TO_TYPE.get(ext, "other")
+    # Two C-level rpartition calls instead of os.path.splitext, with the same rules:
+    # only the last path component counts, and a name of leading dots (".bpmn") has no extension.
+    stem, dot, ext = filename.rpartition("/")[2].rpartition(".")
+    if not stem.lstrip("."):
+        return "other"
+    return FILE_EXT_TO_TYPE.get(dot + ext.lower(), "other")
+
+
+# Path-component sanitization in one pass: drop null bytes, map separators and
+# characters invalid on common filesystems to "-".
+_SANITIZE_TABLE = str.maketrans({"\x00": None, **dict.fromkeys('/\\:*?"<>|', "-")})
+# Names _sanitize would return unchanged: nothing to translate, no ". -" at either end, at most 255 chars.
+_SAFE_NAME_RE = re.compile(r"[A-Za-z0-9_](?:[A-Za-z0-9_.\-]{0,253}[A-Za-z0-9_])?")
+
+# Formats that are already compressed; deflating them again only costs CPU.
+_ZIP_STORED_EXTENSIONS = frozenset({".gif", ".gz", ".jpeg", ".jpg", ".pdf", ".png", ".zip"})
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable write target that collects what zipfile writes until the next drain()."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
 
 
 class TemplateStorageService(Protocol):
@@ -50,6 +87,16 @@ class TemplateStorageService(Protocol):
         """Retrieve file content by path."""
         ...
 
+    def file_path(
+        self,
+        tenant_id: str,
+        template_key: str,
+        version: str,
+        file_name: str,
+    ) -> str:
+        """Absolute filesystem path of a stored file, for send_file. Raises ApiError if missing."""
+        ...
+
     def list_files(
         self,
         tenant_id: str,
@@ -79,6 +126,16 @@ class TemplateStorageService(Protocol):
         """Build a zip of the given file entries (each has file_name, file_type). Returns zip bytes."""
         ...
 
+    def iter_zip(
+        self,
+        tenant_id: str,
+        template_key: str,
+        version: str,
+        file_entries: list[dict],
+    ) -> Iterator[bytes]:
+        """Like stream_zip, but yield the archive in chunks, holding one file in memory at a time."""
+        ...
+
 
 class NoopTemplateStorageService:
     """Placeholder storage."""
@@ -103,6 +160,15 @@ class NoopTemplateStorageService:
     ) -> bytes:
         raise NotImplementedError("Template storage is not configured.")
 
+    def file_path(
+        self,
+        tenant_id: str,
+        template_key: str,
+        version: str,
+        file_name: str,
+    ) -> str:
+        raise NotImplementedError("Template storage is not configured.")
+
     def list_files(
         self,
         tenant_id: str,
@@ -129,6 +195,15 @@ class NoopTemplateStorageService:
     ) -> bytes:
         raise NotImplementedError("Template storage is not configured.")
 
+    def iter_zip(
+        self,
+        tenant_id: str,
+        template_key: str,
+        version: str,
+        file_entries: list[dict],
+    ) -> Iterator[bytes]:
+        raise NotImplementedError("Template storage is not configured.")
+
 
 class FilesystemTemplateStorageService:
     """Stores template files on the local filesystem at {base_dir}/{tenant_id}/{template_key}/{version}/{file_name}."""
@@ -153,25 +228,24 @@ class FilesystemTemplateStorageService:
     @staticmethod
     def _sanitize(s: str) -> str:
         """Sanitize a path component: strip null bytes, replace invalid chars, enforce length."""
-        s = s.replace("\x00", "")
-        invalid = ["/", "\\", ":", "*", "?", '"', "<", ">", "|"]
-        for c in invalid:
-            s = s.replace(c, "-")
-        s = s.strip(". -")
+        if _SAFE_NAME_RE.fullmatch(s):
+            return s
+        s = s.translate(_SANITIZE_TABLE).strip(". -")
         if not s:
             raise ApiError("invalid_input", "Name is empty after sanitization", status_code=400)
         if len(s) > 255:
             s = s[:255]
         return s
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _version_dir_cached(base: str, tenant_id: str, template_key: str, version: str) -> str:
+        """Sanitized version directory, memoized per (base, tenant, key, version) so hot tenants skip re-sanitizing."""
+        sanitize = FilesystemTemplateStorageService._sanitize
+        return os.path.join(base, sanitize(tenant_id), sanitize(template_key), sanitize(version))
+
     def _version_dir(self, tenant_id: str, template_key: str, version: str) -> str:
-        base = self._get_base_dir()
-        return os.path.join(
-            base,
-            self._sanitize(tenant_id),
-            self._sanitize(template_key),
-            self._sanitize(version),
-        )
+        return self._version_dir_cached(self._get_base_dir(), tenant_id, template_key, version)
 
     def _file_path(
         self,
@@ -180,11 +254,33 @@ class FilesystemTemplateStorageService:
         version: str,
         file_name: str,
     ) -> str:
-        safe_name = self._sanitize(os.path.basename(file_name))
-        return os.path.join(
-            self._version_dir(tenant_id, template_key, version),
-            safe_name,
-        )
+        return self._path_in(self._version_dir(tenant_id, template_key, version), file_name)
+
+    def _path_in(self, vdir: str, file_name: str) -> str:
+        return os.path.join(vdir, self._sanitize(os.path.basename(file_name)))
+
+    @staticmethod
+    def _existing_file_path(path: str, file_name: str) -> str:
+        if not os.path.isfile(path):
+            raise ApiError(
+                "not_found",
+                f"File not found: {file_name}",
+                status_code=404,
+            )
+        return path
+
+    @classmethod
+    def _read_file(cls, path: str, file_name: str) -> bytes:
+        cls._existing_file_path(path, file_name)
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except (IOError, OSError) as e:
+            raise ApiError(
+                "storage_error",
+                f"Failed to read file: {str(e)}",
+                status_code=500,
+            )
 
     def store_file(
         self,
@@ -214,22 +310,16 @@ class FilesystemTemplateStorageService:
         version: str,
         file_name: str,
     ) -> bytes:
-        path = self._file_path(tenant_id, template_key, version, file_name)
-        if not os.path.isfile(path):
-            raise ApiError(
-                "not_found",
-                f"File not found: {file_name}",
-                status_code=404,
-            )
-        try:
-            with open(path, "rb") as f:
-                return f.read()
-        except (IOError, OSError) as e:
-            raise ApiError(
-                "storage_error",
-                f"Failed to read file: {str(e)}",
-                status_code=500,
-            )
+        return self._read_file(self._file_path(tenant_id, template_key, version, file_name), file_name)
+
+    def file_path(
+        self,
+        tenant_id: str,
+        template_key: str,
+        version: str,
+        file_name: str,
+    ) -> str:
+        return self._existing_file_path(self._file_path(tenant_id, template_key, version, file_name), file_name)
 
     def list_files(
         self,
@@ -238,17 +328,17 @@ class FilesystemTemplateStorageService:
         version: str,
     ) -> list[dict]:
         vdir = self._version_dir(tenant_id, template_key, version)
-        if not os.path.isdir(vdir):
+        # scandir's DirEntry caches the file type from the directory read, so no stat per entry.
+        # Stored names never start with "." (see _sanitize), so dotfiles are filesystem noise.
+        try:
+            with os.scandir(vdir) as it:
+                return [
+                    {"file_name": e.name, "file_type": file_type_from_filename(e.name)}
+                    for e in it
+                    if not e.name.startswith(".") and e.is_file()
+                ]
+        except (FileNotFoundError, NotADirectoryError):
             return []
-        result = []
-        for name in os.listdir(vdir):
-            path = os.path.join(vdir, name)
-            if os.path.isfile(path):
-                result.append({
-                    "file_name": name,
-                    "file_type": file_type_from_filename(name),
-                })
-        return result
 
     def delete_file(
         self,
@@ -258,15 +348,25 @@ class FilesystemTemplateStorageService:
         file_name: str,
     ) -> None:
         path = self._file_path(tenant_id, template_key, version, file_name)
-        if os.path.isfile(path):
-            try:
-                os.remove(path)
-            except (IOError, OSError) as e:
+        try:
+            os.unlink(path)
+        except (FileNotFoundError, IsADirectoryError):
+            # Nothing stored under that name; deleting it is a no-op.
+            pass
+        except PermissionError as e:
+            # macOS reports unlink() on a directory as EPERM rather than EISDIR.
+            if not os.path.isdir(path):
                 raise ApiError(
                     "storage_error",
                     f"Failed to delete file: {str(e)}",
                     status_code=500,
                 )
+        except (IOError, OSError) as e:
+            raise ApiError(
+                "storage_error",
+                f"Failed to delete file: {str(e)}",
+                status_code=500,
+            )
 
     def stream_zip(
         self,
@@ -275,25 +375,49 @@ class FilesystemTemplateStorageService:
         version: str,
         file_entries: list[dict],
     ) -> bytes:
-        buf = io.BytesIO()
+        return b"".join(self.iter_zip(tenant_id, template_key, version, file_entries))
+
+    def iter_zip(
+        self,
+        tenant_id: str,
+        template_key: str,
+        version: str,
+        file_entries: list[dict],
+    ) -> Iterator[bytes]:
+        # Resolve the directory now, while the app context is active; the chunks may be
+        # consumed by the WSGI server after the view has returned.
+        vdir = self._version_dir(tenant_id, template_key, version)
+        return self._zip_chunks(vdir, (tenant_id, template_key, version), file_entries)
+
+    def _zip_chunks(
+        self,
+        vdir: str,
+        location: tuple[str, str, str],
+        file_entries: list[dict],
+    ) -> Iterator[bytes]:
+        sink = _ChunkSink()
         skipped: list[str] = []
-        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        # Level 1 keeps most of the size win on BPMN/JSON text at a fraction of the default CPU cost.
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
             for entry in file_entries:
                 name = entry.get("file_name")
                 if not name:
                     continue
                 try:
-                    content = self.get_file(tenant_id, template_key, version, name)
-                    zf.writestr(name, content)
+                    content = self._read_file(self._path_in(vdir, name), name)
                 except ApiError:
-                    logger.warning(
-                        "Skipping missing file during zip export: %s/%s/%s/%s",
-                        tenant_id, template_key, version, name,
-                    )
+                    logger.warning("Skipping missing file during zip export: %s/%s/%s/%s", *location, name)
                     skipped.append(name)
+                    continue
+                if os.path.splitext(name)[1].lower() in _ZIP_STORED_EXTENSIONS:
+                    zf.writestr(name, content, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.writestr(name, content)
+                yield sink.drain()
         if skipped:
             logger.warning(
                 "Zip export for %s/%s/%s skipped %d file(s): %s",
-                tenant_id, template_key, version, len(skipped), ", ".join(skipped),
+                *location, len(skipped), ", ".join(skipped),
             )
-        return buf.getvalue()
+        # Closing the archive wrote the central directory.
+        yield sink.drain()
@@ -4,11 +4,14 @@ from __future__ import annotations
 import ast
 import base64
 import logging
+import threading
+import time
 from typing import Any
 from typing import Optional
 from urllib.parse import unquote
 
 from flask import g, request
+from sqlalchemy import event
 from sqlalchemy import or_
 
 from m8flow_backend.services.tenant_identity_helpers import authentication_identifier_from_payload
@@ -62,6 +65,77 @@ def _master_realm_identifier() -> str:
     return master_realm_name()
 
 
+# Tenant identifiers (id and slug) mapped to the canonical tenant id, so validating the resolved
+# tenant is a dict lookup instead of a SELECT per request. Mapper events drop the cache when this
+# process writes a tenant; the TTL bounds staleness from writes made by other processes. A miss
+# still goes to the database, so a tenant created elsewhere is accepted immediately.
+_TENANT_ID_CACHE_TTL_SECONDS = 30.0
+_TENANT_ID_CACHE: dict[str, str | None] | None = None
+_TENANT_ID_CACHE_EXPIRES_AT = 0.0
+_TENANT_ID_CACHE_GENERATION = 0
+_TENANT_ID_CACHE_LOCK = threading.Lock()
+
+
+def clear_tenant_cache() -> None:
+    """Forget the cached tenant identifiers; the next validation reloads them."""
+    global _TENANT_ID_CACHE, _TENANT_ID_CACHE_GENERATION
+    with _TENANT_ID_CACHE_LOCK:
+        _TENANT_ID_CACHE = None
+        # A load that started before this call must not store its (now stale) result.
+        _TENANT_ID_CACHE_GENERATION += 1
+
+
+def _invalidate_tenant_cache(_mapper: Any, _connection: Any, _target: Any) -> None:
+    clear_tenant_cache()
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(M8flowTenantModel, _event_name, _invalidate_tenant_cache)
+
+
+def _cached_tenant_ids(db: Any) -> dict[str, str | None]:
+    global _TENANT_ID_CACHE, _TENANT_ID_CACHE_EXPIRES_AT
+    with _TENANT_ID_CACHE_LOCK:
+        if _TENANT_ID_CACHE is not None and _TENANT_ID_CACHE_EXPIRES_AT > time.monotonic():
+            return _TENANT_ID_CACHE
+        generation = _TENANT_ID_CACHE_GENERATION
+
+    tenant_ids: dict[str, str | None] = {}
+    rows = db.session.query(M8flowTenantModel.id, M8flowTenantModel.slug).all()
+    for tenant_id, _slug in rows:
+        tenant_ids[tenant_id] = tenant_id
+    for tenant_id, slug in rows:
+        # An identifier that is one tenant's slug and another tenant's id is ambiguous;
+        # None makes the lookup fall back to the database query.
+        if slug and tenant_ids.setdefault(slug, tenant_id) != tenant_id:
+            tenant_ids[slug] = None
+
+    with _TENANT_ID_CACHE_LOCK:
+        if generation == _TENANT_ID_CACHE_GENERATION:
+            _TENANT_ID_CACHE = tenant_ids
+            _TENANT_ID_CACHE_EXPIRES_AT = time.monotonic() + _TENANT_ID_CACHE_TTL_SECONDS
+    return tenant_ids
+
+
+def _canonical_tenant_id(db: Any, tenant_id: str) -> str | None:
+    """Return the id of the tenant whose id or slug is ``tenant_id``, or None if there is none."""
+    canonical_tenant_id = _cached_tenant_ids(db).get(tenant_id)
+    if canonical_tenant_id is not None:
+        return canonical_tenant_id
+
+    tenant = (
+        db.session.query(M8flowTenantModel)
+        .filter(or_(M8flowTenantModel.id == tenant_id, M8flowTenantModel.slug == tenant_id))
+        .one_or_none()
+    )
+    if tenant is None:
+        return None
+    # Created since the cache was loaded (possibly by another process); reload on next use.
+    # Unknown identifiers do not clear the cache, so bogus tenant claims cannot force reloads.
+    clear_tenant_cache()
+    return tenant.id
+
+
 def _decoded_payload_from_bearer_token_without_verification(token: str | None = None) -> dict[str, Any] | None:
     """Decode the bearer token payload without signature verification for tenant routing."""
     bearer_token = token or _token_from_request()
@@ -236,11 +310,7 @@ def resolve_request_tenant() -> None:
     # Flask-SQLAlchemy may raise RuntimeError when model not bound; message check for backward compatibility.
     # InvalidRequestError used when applicable (SQLAlchemy mapping/registry errors).
     try:
-        tenant = (
-            db.session.query(M8flowTenantModel)
-            .filter(or_(M8flowTenantModel.id == tenant_id, M8flowTenantModel.slug == tenant_id))
-            .one_or_none()
-        )
+        canonical_tenant_id = _canonical_tenant_id(db, tenant_id)
     except Exception as exc:
         _exc_tuple = (InvalidRequestError, RuntimeError) if InvalidRequestError is not None else (RuntimeError,)
         if isinstance(exc, _exc_tuple):
@@ -252,14 +322,13 @@ def resolve_request_tenant() -> None:
                 status_code=503,
             ) from exc
         raise
-    if tenant is None:
+    if canonical_tenant_id is None:
         raise ApiError(
             error_code="invalid_tenant",
             message=f"Invalid tenant '{tenant_id}'.",
             status_code=401,
         )
 
-    canonical_tenant_id = tenant.id
     g.m8flow_tenant_id = canonical_tenant_id
     g._m8flow_ctx_token = set_context_tenant_id(canonical_tenant_id)
     _log_tenant_resolution(
@@ -242,14 +242,16 @@ def get_tenant_id(*, warn_on_default: bool = True) -> str:
     ``warn_on_default`` is retained for compatibility with older call sites but
     no implicit default-tenant fallback remains.
     """
+    # Called for every tenant-scoped query: read the ContextVar directly and touch the
+    # ``g`` proxy once.
+    ctx_tid = _CONTEXT_TENANT_ID.get()
     if has_request_context():
         tid = cast(Optional[str], getattr(g, "m8flow_tenant_id", None))
         if tid:
-            if get_context_tenant_id() != tid:
+            if ctx_tid != tid:
                 _CONTEXT_TENANT_ID.set(tid)
             return tid
 
-        ctx_tid = get_context_tenant_id()
         if ctx_tid:
             g.m8flow_tenant_id = ctx_tid
             return ctx_tid
@@ -257,7 +259,6 @@ def get_tenant_id(*, warn_on_default: bool = True) -> str:
         raise RuntimeError("Missing tenant id in request context.")
 
     # Non-request context
-    ctx_tid = get_context_tenant_id()
     if ctx_tid:
         return ctx_tid
 
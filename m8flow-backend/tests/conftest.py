@@ -22,6 +22,11 @@ for p in (repo_root, extension_src, backend_src):
 def _reset_tenant_context_between_tests():
     from m8flow_backend.tenancy import clear_tenant_context
     clear_tenant_context()
+    # Only reach for the middleware if a test already imported it; importing it here would pull
+    # in models before modules that patch them first.
+    middleware = sys.modules.get("m8flow_backend.services.tenant_context_middleware")
+    if middleware is not None:
+        middleware.clear_tenant_cache()
     yield
     clear_tenant_context()
 
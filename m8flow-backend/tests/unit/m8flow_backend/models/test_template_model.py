@@ -97,3 +97,22 @@ class TestTemplateModel:
             template.name = "Renamed Template"
             db.session.commit()
             assert template.updated_at_in_seconds >= before_update
+
+    def test_unique_constraint_serves_tenant_key_version_lookups(self):
+        constraint = next(
+            c for c in TemplateModel.__table__.constraints if c.name == "uq_template_key_version_tenant"
+        )
+        assert [column.name for column in constraint.columns] == ["m8f_tenant_id", "template_key", "version"]
+
+    def test_first_bpmn_file_name_follows_files(self):
+        template = TemplateModel(
+            files=[
+                {"file_type": "json", "file_name": "form.json"},
+                {"file_type": "bpmn", "file_name": "main.bpmn"},
+                {"file_type": "bpmn", "file_name": "sub.bpmn"},
+            ]
+        )
+        assert template.first_bpmn_file_name == "main.bpmn"
+
+        template.files = [{"file_type": "dmn", "file_name": "rules.dmn"}]
+        assert template.first_bpmn_file_name is None
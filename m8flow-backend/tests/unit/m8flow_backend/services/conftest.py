@@ -1,7 +1,14 @@
 # m8flow-backend/tests/unit/m8flow_backend/services/conftest.py
+import contextlib
+import functools
 import importlib
+import os
+import sqlite3
 import pytest
 from flask import Flask
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from m8flow_backend.services import file_system_service_patch as patch
 from m8flow_backend.services import tenant_scoping_patch
@@ -43,3 +50,150 @@ def app() -> Flask:
     app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
     app.config["TESTING"] = True
     return app
+
+
+# Named shared-cache in-memory database. The absolute-looking name keeps
+# Flask-SQLAlchemy from rewriting it relative to (and creating) app.instance_path.
+# In-memory databases never cross process boundaries; the worker suffix keeps each
+# pytest-xdist worker's database name distinct as well.
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+SQLITE_DATABASE_URI = f"sqlite:///file:/m8flow-unit-tests-{_XDIST_WORKER}?mode=memory&cache=shared&uri=true"
+
+SQLITE_APP_CONFIG = {
+    "TESTING": True,
+    "SQLALCHEMY_DATABASE_URI": SQLITE_DATABASE_URI,
+    "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+    "SPIFFWORKFLOW_BACKEND_DATABASE_TYPE": "sqlite",
+}
+
+# Kept out of SQLITE_APP_CONFIG because dict values cannot be part of the app cache key.
+# A single pooled connection keeps the schema alive for the whole session.
+SQLITE_ENGINE_OPTIONS = {
+    "poolclass": StaticPool,
+    "connect_args": {"uri": True, "check_same_thread": False},
+}
+
+
+def _configure_sqlite_engine(engine) -> None:
+    # pysqlite defers BEGIN until the first DML statement, which breaks SAVEPOINT
+    # semantics. Take over transaction control so nested transactions roll back cleanly.
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, _connection_record):
+        dbapi_connection.isolation_level = None
+        # Skip durability and locking work the test database never needs. The journal
+        # stays in MEMORY rather than OFF, which would make the per-test ROLLBACK undefined.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_snapshot() -> sqlite3.Connection:
+    """Run the metadata DDL once into a private in-memory database."""
+    from spiffworkflow_backend.models.db import db
+    import spiffworkflow_backend.load_database_models  # noqa: F401
+
+    snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+    db.metadata.create_all(create_engine("sqlite://", creator=lambda: snapshot, poolclass=StaticPool))
+    return snapshot
+
+
+def _init_sqlite_db(app: Flask) -> None:
+    """Bind ``db`` to ``app`` and clone the cached schema into its database."""
+    from spiffworkflow_backend.models.db import db
+
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = SQLITE_ENGINE_OPTIONS
+    db.init_app(app)
+    with app.app_context():
+        _configure_sqlite_engine(db.engine)
+        raw_connection = db.engine.raw_connection()
+        try:
+            _schema_snapshot().backup(raw_connection.driver_connection)
+        finally:
+            raw_connection.close()
+
+
+@functools.lru_cache(maxsize=None)
+def _build_sqlite_app(config_items: frozenset) -> Flask:
+    """Build one Flask app per unique config, cloning the cached schema instead of create_all."""
+    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
+    app.config.update(dict(config_items))
+    _init_sqlite_db(app)
+    return app
+
+
+@contextlib.contextmanager
+def _rolled_back_session(app: Flask, monkeypatch):
+    from spiffworkflow_backend.models.db import db
+
+    with app.app_context():
+        connection = db.engine.connect()
+        transaction = connection.begin()
+        session = scoped_session(sessionmaker(bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False))
+        monkeypatch.setattr(db, "session", session)
+        try:
+            yield session
+        finally:
+            session.remove()
+            transaction.rollback()
+            connection.close()
+
+
+@pytest.fixture(scope="session")
+def sqlite_app() -> Flask:
+    """Flask app backed by an in-memory SQLite database holding the full schema."""
+    return _build_sqlite_app(frozenset(SQLITE_APP_CONFIG.items()))
+
+
+@pytest.fixture()
+def db_session(sqlite_app: Flask, monkeypatch):
+    """Run each test inside an outer transaction that is rolled back on teardown.
+
+    Commits issued by the code under test only release a SAVEPOINT, so every test
+    starts from the empty schema built by ``sqlite_app``. Objects are not expired on
+    commit, so reading ``template.id`` and friends afterwards does not re-SELECT.
+    """
+    with _rolled_back_session(sqlite_app, monkeypatch) as session:
+        yield session
+
+
+# The middleware app gets its own database: it carries the auth config and routes the
+# tenant resolution code looks at, which the generic ``sqlite_app`` deliberately lacks.
+TENANT_MIDDLEWARE_APP_CONFIG = {
+    **SQLITE_APP_CONFIG,
+    "SQLALCHEMY_DATABASE_URI": (
+        f"sqlite:///file:/m8flow-unit-tests-middleware-{_XDIST_WORKER}?mode=memory&cache=shared&uri=true"
+    ),
+    "SPIFFWORKFLOW_BACKEND_URL": "http://localhost",
+    "SPIFFWORKFLOW_BACKEND_USE_AUTH_FOR_METRICS": False,
+    "SECRET_KEY": "test-secret",
+}
+
+
+@pytest.fixture(scope="session")
+def tenant_middleware_app() -> Flask:
+    """Flask app for tenant resolution tests, with routes so endpoints are not auth-exempt."""
+    from m8flow_backend.services.tenant_context_middleware import teardown_request_tenant_context
+
+    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
+    app.config.update(TENANT_MIDDLEWARE_APP_CONFIG)
+    # Ensure ContextVar is reset between requests (including test_client requests).
+    app.teardown_request(teardown_request_tenant_context)
+    app.add_url_rule("/test", "test_endpoint", lambda: "ok")
+    app.add_url_rule("/v1.0/permissions-check", "permissions_check_endpoint", lambda: "ok")
+    _init_sqlite_db(app)
+    return app
+
+
+@pytest.fixture()
+def tenant_middleware_db_session(tenant_middleware_app: Flask, monkeypatch):
+    """Same rollback-per-test session as ``db_session``, against ``tenant_middleware_app``."""
+    with _rolled_back_session(tenant_middleware_app, monkeypatch) as session:
+        yield session
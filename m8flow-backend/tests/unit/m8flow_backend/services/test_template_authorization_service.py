@@ -1,10 +1,21 @@
+from functools import cache
 from types import SimpleNamespace
+from unittest.mock import patch
 
 from flask import Flask, g
 
+from m8flow_backend.models.template import TemplateModel, VISIBILITY_PUBLIC
 from m8flow_backend.services.template_authorization_service import TemplateAuthorizationService
 
 
+@cache
+def _make_app() -> Flask:
+    # Flask(__name__) resolves import paths on every construction; these tests only need a request context.
+    app = Flask(__name__)  # NOSONAR - unit test with no HTTP/CSRF involved
+    app.config["TESTING"] = True
+    return app
+
+
 class _DummyTemplate:
     def __init__(self, *, tenant_id: str, created_by: str, public: bool, tenant_visible: bool, private: bool):
         self.m8f_tenant_id = tenant_id
@@ -33,7 +44,7 @@ class _DummyQuery:
 
 
 def test_can_view_allows_super_admin_private_cross_tenant() -> None:
-    app = Flask(__name__)  # NOSONAR - unit test with no HTTP/CSRF involved
+    app = _make_app()
     with app.app_context():
         with app.test_request_context("/"):
             g.m8flow_tenant_id = "tenant-a"
@@ -49,8 +60,45 @@ def test_can_view_allows_super_admin_private_cross_tenant() -> None:
             assert TemplateAuthorizationService.can_view(template, user=user) is True
 
 
+def test_can_view_public_template_skips_admin_permission_lookup() -> None:
+    app = _make_app()
+    with app.app_context():
+        with app.test_request_context("/"):
+            g.m8flow_tenant_id = "tenant-a"
+            user = SimpleNamespace(username="reader")
+            template = _DummyTemplate(
+                tenant_id="tenant-b",
+                created_by="owner-b",
+                public=True,
+                tenant_visible=False,
+                private=False,
+            )
+            with patch.object(TemplateAuthorizationService, "has_admin_permission") as has_admin_permission:
+                assert TemplateAuthorizationService.can_view(template, user=user) is True
+            has_admin_permission.assert_not_called()
+
+
+def test_can_view_private_template_falls_back_to_admin_permission() -> None:
+    app = _make_app()
+    with app.app_context():
+        with app.test_request_context("/"):
+            g.m8flow_tenant_id = "tenant-a"
+            user = SimpleNamespace(username="admin")
+            template = _DummyTemplate(
+                tenant_id="tenant-a",
+                created_by="owner-a",
+                public=False,
+                tenant_visible=False,
+                private=True,
+            )
+            with patch.object(TemplateAuthorizationService, "has_admin_permission", return_value=True):
+                assert TemplateAuthorizationService.can_view(template, user=user) is True
+            with patch.object(TemplateAuthorizationService, "has_admin_permission", return_value=False):
+                assert TemplateAuthorizationService.can_view(template, user=user) is False
+
+
 def test_filter_query_by_visibility_bypasses_filters_for_super_admin() -> None:
-    app = Flask(__name__)  # NOSONAR - unit test with no HTTP/CSRF involved
+    app = _make_app()
     with app.app_context():
         with app.test_request_context("/"):
             g._m8flow_super_admin_request = True
@@ -61,8 +109,26 @@ def test_filter_query_by_visibility_bypasses_filters_for_super_admin() -> None:
             assert query.filtered is False
 
 
+def test_visibility_criterion_is_none_for_super_admin() -> None:
+    app = _make_app()
+    with app.app_context():
+        with app.test_request_context("/"):
+            g._m8flow_super_admin_request = True
+            user = SimpleNamespace(username="super-admin")
+            assert TemplateAuthorizationService.visibility_criterion(user=user) is None
+
+
+def test_visibility_criterion_without_tenant_restricts_to_public() -> None:
+    app = _make_app()
+    with app.app_context():
+        with app.test_request_context("/"):
+            criterion = TemplateAuthorizationService.visibility_criterion(user=None)
+            assert criterion is not None
+            assert criterion.compare(TemplateModel.visibility == VISIBILITY_PUBLIC)
+
+
 def test_can_edit_denies_super_admin() -> None:
-    app = Flask(__name__)  # NOSONAR - unit test with no HTTP/CSRF involved
+    app = _make_app()
     with app.app_context():
         with app.test_request_context("/"):
             g._m8flow_super_admin_request = True
@@ -1,10 +1,17 @@
 # m8flow-backend/tests/unit/m8flow_backend/services/test_template_service.py
+import io
 import sys
+import zipfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 from flask import Flask
 from flask import g
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.orm import scoped_session
 
 extension_root = Path(__file__).resolve().parents[1]
 repo_root = extension_root.parents[1]
@@ -22,7 +29,8 @@ model_override_patch.apply()
 
 from m8flow_backend.models.process_model_template import ProcessModelTemplateModel  # noqa: E402
 from m8flow_backend.models.m8flow_tenant import M8flowTenantModel  # noqa: E402
-from m8flow_backend.models.template import TemplateModel, TemplateVisibility  # noqa: E402
+from m8flow_backend.models.template import TemplateModel, VISIBILITY_PRIVATE, VISIBILITY_TENANT, VISIBILITY_PUBLIC  # noqa: E402
+from m8flow_backend.routes.templates_controller import _safe_content_disposition  # noqa: E402
 from m8flow_backend.services.template_service import TemplateService  # noqa: E402
 from spiffworkflow_backend.exceptions.api_error import ApiError  # noqa: E402
 from spiffworkflow_backend.models.db import db  # noqa: E402
@@ -80,3274 +88,2194 @@ class MockTemplateStorageService:
     ) -> bytes:
         return b"PK\x03\x04"  # minimal zip bytes
 
+    def iter_zip(
+        self,
+        tenant_id: str,
+        template_key: str,
+        version: str,
+        file_entries: list,
+    ) -> Iterator[bytes]:
+        return iter([b"PK\x03\x04"])
 
-# ============================================================================
-# Version Management Tests
-# ============================================================================
 
+# The mock keeps no state, so one instance is shared by every test in this module.
+_MOCK_STORAGE = MockTemplateStorageService()
 
-def test_version_key() -> None:
-    """Test _version_key() static method for V-style versions (V1, V2, ...)."""
-    assert TemplateService._version_key("V1") == (1, 1)
-    assert TemplateService._version_key("V2") == (1, 2)
-    assert TemplateService._version_key("v10") == (1, 10)
 
+@pytest.fixture(autouse=True, scope="module")
+def _mock_template_storage():
+    """Keep TemplateService off the file system for every test in this module.
 
-def test_next_version_first_template() -> None:
-    """Test _next_version() returns 'V1' for first template."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        db.session.commit()
+    Tests that need a different storage still patch ``TemplateService.storage`` locally.
+    """
+    original = TemplateService.storage
+    TemplateService.storage = _MOCK_STORAGE
+    try:
+        yield
+    finally:
+        TemplateService.storage = original
 
-        version = TemplateService._next_version("test-template", "tenant-a")
-        assert version == "V1"
 
+# ============================================================================
+# Seed Fixtures
+# ============================================================================
+# Seeds are committed (not just flushed) so a service-level rollback after an
+# expected IntegrityError cannot discard them; the db_session outer transaction
+# still removes them after each test. tenant-a and the tester user, which nearly
+# every test needs and none mutates, are instead seeded once per module.
 
-def test_next_version_increments_patch() -> None:
-    """Test V-style version incrementing (V1 -> V2 -> V3)."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        # Create first template (V1)
-        template1 = TemplateModel(
-            template_key="test-template",
-            version="V1",
-            name="Test Template",
-            m8f_tenant_id="tenant-a",
-            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-            created_by="tester",
-            modified_by="tester",
-        )
-        db.session.add(template1)
-        db.session.commit()
+@contextmanager
+def _as_tenant(tenant_id: str):
+    """Switch g.m8flow_tenant_id inside an already-pushed request context."""
+    previous = getattr(g, "m8flow_tenant_id", None)
+    g.m8flow_tenant_id = tenant_id
+    try:
+        yield
+    finally:
+        g.m8flow_tenant_id = previous
 
-        # Get next version
-        next_version = TemplateService._next_version("test-template", "tenant-a")
-        assert next_version == "V2"
 
-        # Create another version
-        template2 = TemplateModel(
-            template_key="test-template",
-            version=next_version,
-            name="Test Template",
-            m8f_tenant_id="tenant-a",
-            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-            created_by="tester",
-            modified_by="tester",
-        )
-        db.session.add(template2)
-        db.session.commit()
+def _seed(obj):
+    db.session.add(obj)
+    db.session.commit()
+    return obj
 
-        # Get next version again
-        next_version2 = TemplateService._next_version("test-template", "tenant-a")
-        assert next_version2 == "V3"
 
+_BPMN_FILES = [{"file_type": "bpmn", "file_name": "test.bpmn"}]
 
-def test_next_version_handles_non_numeric() -> None:
-    """Non-numeric V suffix (e.g. V1-alpha) falls back to V1 for next version."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        # Create template with non-numeric V suffix (V1-alpha -> fallback to V1)
-        template = TemplateModel(
-            template_key="test-template",
-            version="V1-alpha",
-            name="Test Template",
-            m8f_tenant_id="tenant-a",
-            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-            created_by="tester",
-            modified_by="tester",
-        )
-        db.session.add(template)
-        db.session.commit()
+# Insert constructs are immutable; .values() returns a copy, so one instance serves every test.
+_INSERT_TEMPLATE = insert(TemplateModel)
+_INSERT_TEMPLATE_RETURNING_ID = _INSERT_TEMPLATE.returning(TemplateModel.id)
 
-        # Next version starts V-series at V1
-        next_version = TemplateService._next_version("test-template", "tenant-a")
-        assert next_version == "V1"
+_TEMPLATE_DEFAULTS = {
+    "version": "V1",
+    "name": "Test",
+    "m8f_tenant_id": "tenant-a",
+    "files": _BPMN_FILES,
+    "created_by": "tester",
+    "modified_by": "tester",
+}
 
 
-def test_next_version_tenant_scoped() -> None:
-    """Verify versions are scoped per tenant."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        db.session.add(M8flowTenantModel(id="tenant-b", name="Tenant B", slug="tenant-b", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def _make_template(**overrides) -> TemplateModel:
+    """Build a TemplateModel with the defaults most tests share; the files list is reused read-only."""
+    return TemplateModel(**{**_TEMPLATE_DEFAULTS, **overrides})
 
-        # Create template for tenant-a (V1)
-        template_a = TemplateModel(
-            template_key="shared-template",
-            version="V1",
-            name="Shared Template",
-            m8f_tenant_id="tenant-a",
-            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-            created_by="tester",
-            modified_by="tester",
-        )
-        db.session.add(template_a)
-        db.session.commit()
 
-        # Tenant-b should get V1 as first version (independent versioning)
-        version_b = TemplateService._next_version("shared-template", "tenant-b")
-        assert version_b == "V1"
+def _template_row(overrides: dict) -> dict:
+    # Core INSERT skips the ORM before_insert listeners, so audit timestamps are explicit.
+    return {**_TEMPLATE_DEFAULTS, "created_at_in_seconds": 1, "updated_at_in_seconds": 1, **overrides}
 
-        # Tenant-a should get V2
-        version_a = TemplateService._next_version("shared-template", "tenant-a")
-        assert version_a == "V2"
 
+def _insert_template(**overrides) -> int:
+    """Insert a template row through Core for tests that only need its id."""
+    template_id = db.session.execute(_INSERT_TEMPLATE_RETURNING_ID.values(**_template_row(overrides))).scalar_one()
+    db.session.commit()
+    return template_id
 
-# ============================================================================
-# Create Template Tests
-# ============================================================================
 
+def _insert_templates(*rows: dict) -> None:
+    """Insert several template rows with one executemany INSERT."""
+    db.session.execute(_INSERT_TEMPLATE, [_template_row(row) for row in rows])
+    db.session.commit()
 
-def test_create_template_with_bpmn_bytes() -> None:
-    """Create template with BPMN bytes and metadata."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                metadata = {
-                    "template_key": "test-template",
-                    "name": "Test Template",
-                    "description": "A test template",
-                    "category": "test",
-                    "tags": ["tag1", "tag2"],
-                    "visibility": TemplateVisibility.private.value,
-                }
-                bpmn_bytes = b"<bpmn>test content</bpmn>"
-
-                template = TemplateService.create_template(
-                    bpmn_bytes=bpmn_bytes,
-                    metadata=metadata,
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-
-                assert template.template_key == "test-template"
-                assert template.name == "Test Template"
-                assert template.description == "A test template"
-                assert template.category == "test"
-                assert template.tags == ["tag1", "tag2"]
-                assert template.visibility == TemplateVisibility.private.value
-                assert template.m8f_tenant_id == "tenant-a"
-                assert template.version == "V1"
-                assert template.files and len(template.files) == 1
-                assert template.files[0]["file_name"] == "diagram.bpmn"
-                assert template.created_by == "tester"
-                assert template.modified_by == "tester"
-
-
-def test_create_template_with_legacy_data_format() -> None:
-    """Legacy data dict format is no longer supported."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+@pytest.fixture(scope="module")
+def _tenant_a_and_tester(sqlite_app: Flask) -> int:
+    """Commit tenant-a and the tester user outside the per-test rollback; returns the user id."""
+    with sqlite_app.app_context():
+        tester = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
+        db.session.add_all([
+            M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"),
+            tester,
+        ])
         db.session.commit()
+        tester_id = tester.id
+        db.session.remove()
+    yield tester_id
+    with sqlite_app.app_context():
+        db.session.execute(delete(UserModel).where(UserModel.id == tester_id))
+        db.session.execute(delete(M8flowTenantModel).where(M8flowTenantModel.id == "tenant-a"))
+        db.session.commit()
+        db.session.remove()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            # Legacy data dict should not be accepted; metadata + BPMN bytes are required.
-            try:
-                TemplateService.create_template(
-                    metadata=None,
-                    bpmn_bytes=None,
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError for missing metadata/BPMN"
-            except ApiError as e:
-                assert e.error_code == "missing_fields"
+@pytest.fixture()
+def tenant_a(db_session: scoped_session, _tenant_a_and_tester: int) -> M8flowTenantModel:
+    return db_session.get(M8flowTenantModel, "tenant-a")
 
 
-def test_create_template_without_user() -> None:
-    """Should raise ApiError when user is None."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        db.session.commit()
+@pytest.fixture()
+def tenant_b(db_session: scoped_session) -> M8flowTenantModel:
+    return _seed(M8flowTenantModel(id="tenant-b", name="Tenant B", slug="tenant-b", created_by="test", modified_by="test"))
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
 
-            try:
-                TemplateService.create_template(
-                    metadata={"template_key": "test", "name": "Test"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=None,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "unauthorized"
-                assert e.status_code == 403
+@pytest.fixture()
+def user_tester(db_session: scoped_session, _tenant_a_and_tester: int) -> UserModel:
+    return db_session.get(UserModel, _tenant_a_and_tester)
 
 
-def test_create_template_without_tenant() -> None:
-    """Should raise ApiError when tenant is missing."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+@pytest.fixture()
+def user_owner(db_session: scoped_session) -> UserModel:
+    return _seed(UserModel(username="owner", email="owner@example.com", service="local", service_id="owner"))
 
-        with app.test_request_context("/"):
-            g.user = user
-            # No tenant set
 
-            try:
-                TemplateService.create_template(
-                    metadata={"template_key": "test", "name": "Test"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "tenant_required"
-                assert e.status_code == 400
+@pytest.fixture()
+def user_other(db_session: scoped_session) -> UserModel:
+    return _seed(UserModel(username="other", email="other@example.com", service="local", service_id="other"))
 
 
-def test_create_template_without_required_fields() -> None:
-    """Should raise ApiError for missing template_key/name."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+@pytest.fixture()
+def user_admin(db_session: scoped_session) -> UserModel:
+    return _seed(UserModel(username="admin", email="admin@example.com", service="local", service_id="admin"))
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            # Missing template_key
-            try:
-                TemplateService.create_template(
-                    metadata={"name": "Test"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "missing_fields"
-                assert e.status_code == 400
-
-            # Missing name
-            try:
-                TemplateService.create_template(
-                    metadata={"template_key": "test"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "missing_fields"
-                assert e.status_code == 400
-
-
-def test_create_template_without_bpmn_content() -> None:
-    """Should raise ApiError when BPMN content is missing."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+@pytest.fixture()
+def tenant_a_request(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel):
+    """Push one request context acting as ``user_tester`` in tenant-a for the whole test."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+        yield g
 
-            try:
-                TemplateService.create_template(
-                    metadata={"template_key": "test", "name": "Test"},
-                    bpmn_bytes=None,
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "missing_fields"
-                assert e.status_code == 400
 
+# ============================================================================
+# Version Management Tests
+# ============================================================================
 
-def test_create_template_duplicate_name_blocked() -> None:
-    """A second create with the same key (derived from name) in the same tenant is rejected."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                # First template should get V1
-                template1 = TemplateService.create_template(
-                    metadata={"template_key": "auto-version", "name": "Test"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert template1.version == "V1"
-
-                # Second create with same key (same name) is rejected, not silently versioned.
-                try:
-                    TemplateService.create_template(
-                        metadata={"template_key": "auto-version", "name": "Test"},
-                        bpmn_bytes=b"<bpmn>test</bpmn>",
-                        user=user,
-                        tenant_id="tenant-a",
-                    )
-                    assert False, "Should have raised ApiError for duplicate name"
-                except ApiError as e:
-                    assert e.error_code == "template_name_exists"
-                    assert e.status_code == 409
-
-
-def test_create_template_duplicate_name_allowed_after_soft_delete() -> None:
-    """A name freed by a soft-deleted template can be reused for a new create."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def test_version_key() -> None:
+    """Test _version_key() static method for V-style versions (V1, V2, ...)."""
+    assert TemplateService._version_key("V1") == (1, 1)
+    assert TemplateService._version_key("V2") == (1, 2)
+    assert TemplateService._version_key("v10") == (1, 10)
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            # Existing template with this key is soft-deleted, so the name is free.
-            deleted = TemplateModel(
-                template_key="reuse-me",
-                version="V1",
-                name="Reuse Me",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_deleted=True,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(deleted)
-            db.session.commit()
+def test_next_version_first_template(tenant_a: M8flowTenantModel) -> None:
+    """Test _next_version() returns 'V1' for first template."""
+    version = TemplateService._next_version("test-template", "tenant-a")
+    assert version == "V1"
 
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                template = TemplateService.create_template(
-                    metadata={"template_key": "reuse-me", "name": "Reuse Me"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert template.template_key == "reuse-me"
-                assert template.is_deleted is False
 
+def test_next_version_increments_patch(tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Test V-style version incrementing (V1 -> V2 -> V3)."""
+    # Create first template (V1)
+    template1 = TemplateModel(
+        template_key="test-template",
+        version="V1",
+        name="Test Template",
+        m8f_tenant_id="tenant-a",
+        files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+        created_by="tester",
+        modified_by="tester",
+    )
+    db.session.add(template1)
+    db.session.commit()
+
+    # Get next version
+    next_version = TemplateService._next_version("test-template", "tenant-a")
+    assert next_version == "V2"
+
+    # Create another version
+    template2 = TemplateModel(
+        template_key="test-template",
+        version=next_version,
+        name="Test Template",
+        m8f_tenant_id="tenant-a",
+        files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+        created_by="tester",
+        modified_by="tester",
+    )
+    db.session.add(template2)
+    db.session.commit()
 
-def test_create_template_explicit_version_bypasses_duplicate_block() -> None:
-    """An explicit version (programmatic X-Template-Version path) still versions an existing key."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+    # Get next version again
+    next_version2 = TemplateService._next_version("test-template", "tenant-a")
+    assert next_version2 == "V3"
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                template1 = TemplateService.create_template(
-                    metadata={"template_key": "explicit", "name": "Explicit"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert template1.version == "V1"
-
-                # Explicit version is allowed even though the key already exists.
-                template2 = TemplateService.create_template(
-                    metadata={"template_key": "explicit", "name": "Explicit", "version": "V2"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert template2.version == "V2"
-
-
-def test_create_template_invalid_name_chars_rejected() -> None:
-    """Create with disallowed characters in the name raises template_name_invalid_chars."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                try:
-                    TemplateService.create_template(
-                        metadata={"template_key": "bad", "name": "Bad@Name"},
-                        bpmn_bytes=b"<bpmn>test</bpmn>",
-                        user=user,
-                        tenant_id="tenant-a",
-                    )
-                    assert False, "Should have raised ApiError for invalid characters"
-                except ApiError as e:
-                    assert e.error_code == "template_name_invalid_chars"
-                    assert e.status_code == 400
-
-
-def test_create_template_name_too_long_rejected() -> None:
-    """Create with a name longer than 100 chars raises template_name_too_long."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def test_next_version_handles_non_numeric(tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Non-numeric V suffix (e.g. V1-alpha) falls back to V1 for next version."""
+    # Create template with non-numeric V suffix (V1-alpha -> fallback to V1)
+    template = TemplateModel(
+        template_key="test-template",
+        version="V1-alpha",
+        name="Test Template",
+        m8f_tenant_id="tenant-a",
+        files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+        created_by="tester",
+        modified_by="tester",
+    )
+    db.session.add(template)
+    db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                try:
-                    TemplateService.create_template(
-                        metadata={"template_key": "long", "name": "a" * 101},
-                        bpmn_bytes=b"<bpmn>test</bpmn>",
-                        user=user,
-                        tenant_id="tenant-a",
-                    )
-                    assert False, "Should have raised ApiError for too-long name"
-                except ApiError as e:
-                    assert e.error_code == "template_name_too_long"
-                    assert e.status_code == 400
-
-
-def test_create_template_valid_name_with_allowed_chars() -> None:
-    """Create succeeds with letters, numbers, spaces, hyphen and underscore."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+    # Next version starts V-series at V1
+    next_version = TemplateService._next_version("test-template", "tenant-a")
+    assert next_version == "V1"
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                template = TemplateService.create_template(
-                    metadata={"template_key": "ok-name", "name": "My Template_v2 - 2024"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert template.name == "My Template_v2 - 2024"
+def test_next_version_tenant_scoped(tenant_a: M8flowTenantModel, tenant_b: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Verify versions are scoped per tenant."""
+    # Create template for tenant-a (V1)
+    template_a = TemplateModel(
+        template_key="shared-template",
+        version="V1",
+        name="Shared Template",
+        m8f_tenant_id="tenant-a",
+        files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+        created_by="tester",
+        modified_by="tester",
+    )
+    db.session.add(template_a)
+    db.session.commit()
 
+    # Tenant-b should get V1 as first version (independent versioning)
+    version_b = TemplateService._next_version("shared-template", "tenant-b")
+    assert version_b == "V1"
 
-def test_update_template_invalid_name_rejected_and_valid_rename_succeeds() -> None:
-    """update_template rejects invalid name characters but allows a valid rename."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+    # Tenant-a should get V2
+    version_a = TemplateService._next_version("shared-template", "tenant-a")
+    assert version_a == "V2"
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            template = TemplateModel(
-                template_key="rename-me",
-                version="V1",
-                name="Original",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
+# ============================================================================
+# Create Template Tests
+# ============================================================================
 
-            # Invalid characters are rejected.
-            try:
-                TemplateService.update_template("rename-me", "V1", {"name": "Bad/Name"}, user=user)
-                assert False, "Should have raised ApiError for invalid characters"
-            except ApiError as e:
-                assert e.error_code == "template_name_invalid_chars"
-                assert e.status_code == 400
 
-            # A valid rename succeeds.
-            updated = TemplateService.update_template("rename-me", "V1", {"name": "New Name_2"}, user=user)
-            assert updated.name == "New Name_2"
+def test_create_template_with_bpmn_bytes(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Create template with BPMN bytes and metadata."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        metadata = {
+            "template_key": "test-template",
+            "name": "Test Template",
+            "description": "A test template",
+            "category": "test",
+            "tags": ["tag1", "tag2"],
+            "visibility": VISIBILITY_PRIVATE,
+        }
+        bpmn_bytes = b"<bpmn>test content</bpmn>"
+
+        template = TemplateService.create_template(
+            bpmn_bytes=bpmn_bytes,
+            metadata=metadata,
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
 
+        assert template.template_key == "test-template"
+        assert template.name == "Test Template"
+        assert template.description == "A test template"
+        assert template.category == "test"
+        assert template.tags == ["tag1", "tag2"]
+        assert template.visibility == VISIBILITY_PRIVATE
+        assert template.m8f_tenant_id == "tenant-a"
+        assert template.version == "V1"
+        assert template.files and len(template.files) == 1
+        assert template.files[0]["file_name"] == "diagram.bpmn"
+        assert template.created_by == "tester"
+        assert template.modified_by == "tester"
+
+
+def test_create_template_with_legacy_data_format(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Legacy data dict format is no longer supported."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        # Legacy data dict should not be accepted; metadata + BPMN bytes are required.
+        try:
+            TemplateService.create_template(
+                metadata=None,
+                bpmn_bytes=None,
+                user=user_tester,
+                tenant_id="tenant-a",
+            )
+            assert False, "Should have raised ApiError for missing metadata/BPMN"
+        except ApiError as e:
+            assert e.error_code == "missing_fields"
 
-def test_create_template_with_provided_version() -> None:
-    """Test explicit version assignment."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                metadata = {
-                    "template_key": "explicit-version",
-                    "name": "Test",
-                    "version": "V5",
-                }
-                template = TemplateService.create_template(
-                    metadata=metadata,
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert template.version == "V5"
-
-
-def test_create_template_tenant_isolation() -> None:
-    """Verify templates are scoped to correct tenant."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        db.session.add(M8flowTenantModel(id="tenant-b", name="Tenant B", slug="tenant-b", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def test_create_template_without_user(sqlite_app: Flask, tenant_a: M8flowTenantModel) -> None:
+    """Should raise ApiError when user is None."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+
+        try:
+            TemplateService.create_template(
+                metadata={"template_key": "test", "name": "Test"},
+                bpmn_bytes=b"<bpmn>test</bpmn>",
+                user=None,
+                tenant_id="tenant-a",
+            )
+            assert False, "Should have raised ApiError"
+        except ApiError as e:
+            assert e.error_code == "unauthorized"
+            assert e.status_code == 403
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                template_a = TemplateService.create_template(
-                    metadata={"template_key": "shared", "name": "Shared"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert template_a.m8f_tenant_id == "tenant-a"
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-b"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                template_b = TemplateService.create_template(
-                    metadata={"template_key": "shared", "name": "Shared"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-b",
-                )
-                assert template_b.m8f_tenant_id == "tenant-b"
-                assert template_b.template_key == "shared"
-                # Should be independent versioning (V1 for first in tenant-b)
-                assert template_b.version == "V1"
 
+def test_create_template_without_tenant(sqlite_app: Flask, user_tester: UserModel) -> None:
+    """Should raise ApiError when tenant is missing."""
+    with sqlite_app.test_request_context("/"):
+        g.user = user_tester
+        # No tenant set
 
-# ============================================================================
-# List Templates Tests
-# ============================================================================
+        try:
+            TemplateService.create_template(
+                metadata={"template_key": "test", "name": "Test"},
+                bpmn_bytes=b"<bpmn>test</bpmn>",
+                user=user_tester,
+            )
+            assert False, "Should have raised ApiError"
+        except ApiError as e:
+            assert e.error_code == "tenant_required"
+            assert e.status_code == 400
 
 
-def test_list_templates_latest_only() -> None:
-    """Test listing only latest versions."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def test_create_template_without_required_fields(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Should raise ApiError for missing template_key/name."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        # Missing template_key
+        try:
+            TemplateService.create_template(
+                metadata={"name": "Test"},
+                bpmn_bytes=b"<bpmn>test</bpmn>",
+                user=user_tester,
+                tenant_id="tenant-a",
+            )
+            assert False, "Should have raised ApiError"
+        except ApiError as e:
+            assert e.error_code == "missing_fields"
+            assert e.status_code == 400
+
+        # Missing name
+        try:
+            TemplateService.create_template(
+                metadata={"template_key": "test"},
+                bpmn_bytes=b"<bpmn>test</bpmn>",
+                user=user_tester,
+                tenant_id="tenant-a",
+            )
+            assert False, "Should have raised ApiError"
+        except ApiError as e:
+            assert e.error_code == "missing_fields"
+            assert e.status_code == 400
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
 
-            # Create multiple versions (V-style)
-            template1 = TemplateModel(
-                template_key="multi-version",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            template2 = TemplateModel(
-                template_key="multi-version",
-                version="V2",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
+def test_create_template_without_bpmn_content(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Should raise ApiError when BPMN content is missing."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        try:
+            TemplateService.create_template(
+                metadata={"template_key": "test", "name": "Test"},
+                bpmn_bytes=None,
+                user=user_tester,
+                tenant_id="tenant-a",
             )
-            template3 = TemplateModel(
-                template_key="multi-version",
-                version="V3",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
+            assert False, "Should have raised ApiError"
+        except ApiError as e:
+            assert e.error_code == "missing_fields"
+            assert e.status_code == 400
+
+
+def test_create_template_duplicate_name_blocked(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """A second create with the same key (derived from name) in the same tenant is rejected."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        # First template should get V1
+        template1 = TemplateService.create_template(
+            metadata={"template_key": "auto-version", "name": "Test"},
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+        assert template1.version == "V1"
+
+        # Second create with same key (same name) is rejected, not silently versioned.
+        try:
+            TemplateService.create_template(
+                metadata={"template_key": "auto-version", "name": "Test"},
+                bpmn_bytes=b"<bpmn>test</bpmn>",
+                user=user_tester,
+                tenant_id="tenant-a",
             )
-            db.session.add_all([template1, template2, template3])
-            db.session.commit()
+            assert False, "Should have raised ApiError for duplicate name"
+        except ApiError as e:
+            assert e.error_code == "template_name_exists"
+            assert e.status_code == 409
 
-            results, pagination = TemplateService.list_templates(user=user, tenant_id="tenant-a", latest_only=True)
-            assert len(results) == 1
-            assert results[0].version == "V3"
 
+def test_create_template_duplicate_name_allowed_after_soft_delete(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """A name freed by a soft-deleted template can be reused for a new create."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
 
-def test_list_templates_all_versions() -> None:
-    """Test listing all versions when latest_only=False."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        # Existing template with this key is soft-deleted, so the name is free.
+        deleted = TemplateModel(
+            template_key="reuse-me",
+            version="V1",
+            name="Reuse Me",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            is_deleted=True,
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add(deleted)
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
+        template = TemplateService.create_template(
+            metadata={"template_key": "reuse-me", "name": "Reuse Me"},
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+        assert template.template_key == "reuse-me"
+        assert template.is_deleted is False
 
-            # Create multiple versions (V-style)
-            template1 = TemplateModel(
-                template_key="all-versions",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            template2 = TemplateModel(
-                template_key="all-versions",
-                version="V2",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add_all([template1, template2])
-            db.session.commit()
 
-            results, pagination = TemplateService.list_templates(user=user, tenant_id="tenant-a", latest_only=False)
-            assert len(results) == 2
+def test_create_template_explicit_version_bypasses_duplicate_block(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """An explicit version (programmatic X-Template-Version path) still versions an existing key."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template1 = TemplateService.create_template(
+            metadata={"template_key": "explicit", "name": "Explicit"},
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+        assert template1.version == "V1"
+
+        # Explicit version is allowed even though the key already exists.
+        template2 = TemplateService.create_template(
+            metadata={"template_key": "explicit", "name": "Explicit", "version": "V2"},
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+        assert template2.version == "V2"
 
 
-def test_list_templates_filter_by_category() -> None:
-    """Test category filtering."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def test_create_template_invalid_name_chars_rejected(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Create with disallowed characters in the name raises template_name_invalid_chars."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        try:
+            TemplateService.create_template(
+                metadata={"template_key": "bad", "name": "Bad@Name"},
+                bpmn_bytes=b"<bpmn>test</bpmn>",
+                user=user_tester,
+                tenant_id="tenant-a",
+            )
+            assert False, "Should have raised ApiError for invalid characters"
+        except ApiError as e:
+            assert e.error_code == "template_name_invalid_chars"
+            assert e.status_code == 400
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
 
-            template1 = TemplateModel(
-                template_key="cat1-template",
-                version="V1",
-                name="Category 1",
-                category="category1",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            template2 = TemplateModel(
-                template_key="cat2-template",
-                version="V1",
-                name="Category 2",
-                category="category2",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
+def test_create_template_name_too_long_rejected(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Create with a name longer than 100 chars raises template_name_too_long."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        try:
+            TemplateService.create_template(
+                metadata={"template_key": "long", "name": "a" * 101},
+                bpmn_bytes=b"<bpmn>test</bpmn>",
+                user=user_tester,
+                tenant_id="tenant-a",
             )
-            db.session.add_all([template1, template2])
-            db.session.commit()
+            assert False, "Should have raised ApiError for too-long name"
+        except ApiError as e:
+            assert e.error_code == "template_name_too_long"
+            assert e.status_code == 400
 
-            results, pagination = TemplateService.list_templates(user=user, tenant_id="tenant-a", category="category1")
-            assert len(results) == 1
-            assert results[0].category == "category1"
 
+def test_create_template_valid_name_with_allowed_chars(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Create succeeds with letters, numbers, spaces, hyphen and underscore."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template = TemplateService.create_template(
+            metadata={"template_key": "ok-name", "name": "My Template_v2 - 2024"},
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+        assert template.name == "My Template_v2 - 2024"
 
-def test_list_templates_filter_by_tag() -> None:
-    """Test tag filtering (JSON array)."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+
+def test_update_template_invalid_name_rejected_and_valid_rename_succeeds(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """update_template rejects invalid name characters but allows a valid rename."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template = TemplateModel(
+            template_key="rename-me",
+            version="V1",
+            name="Original",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            is_published=False,
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add(template)
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
+        # Invalid characters are rejected.
+        try:
+            TemplateService.update_template("rename-me", "V1", {"name": "Bad/Name"}, user=user_tester)
+            assert False, "Should have raised ApiError for invalid characters"
+        except ApiError as e:
+            assert e.error_code == "template_name_invalid_chars"
+            assert e.status_code == 400
 
-            template1 = TemplateModel(
-                template_key="tag1-template",
-                version="V1",
-                name="Tag 1",
-                tags=["tag1", "tag2"],
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            template2 = TemplateModel(
-                template_key="tag3-template",
-                version="V1",
-                name="Tag 3",
-                tags=["tag3"],
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add_all([template1, template2])
-            db.session.commit()
+        # A valid rename succeeds.
+        updated = TemplateService.update_template("rename-me", "V1", {"name": "New Name_2"}, user=user_tester)
+        assert updated.name == "New Name_2"
 
-            results, pagination = TemplateService.list_templates(user=user, tenant_id="tenant-a", tag="tag1")
-            assert len(results) == 1
-            assert "tag1" in results[0].tags
 
+def test_create_template_with_provided_version(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Test explicit version assignment."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        metadata = {
+            "template_key": "explicit-version",
+            "name": "Test",
+            "version": "V5",
+        }
+        template = TemplateService.create_template(
+            metadata=metadata,
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+        assert template.version == "V5"
 
-def test_list_templates_filter_by_owner() -> None:
-    """Test owner filtering."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user1 = UserModel(username="owner1", email="owner1@example.com", service="local", service_id="owner1")
-        user2 = UserModel(username="owner2", email="owner2@example.com", service="local", service_id="owner2")
-        db.session.add_all([user1, user2])
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
+def test_create_template_tenant_isolation(sqlite_app: Flask, tenant_a: M8flowTenantModel, tenant_b: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Verify templates are scoped to correct tenant."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template_a = TemplateService.create_template(
+            metadata={"template_key": "shared", "name": "Shared"},
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+        assert template_a.m8f_tenant_id == "tenant-a"
 
-            template1 = TemplateModel(
-                template_key="owner1-template",
-                version="V1",
-                name="Owner 1",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="owner1",
-                modified_by="owner1",
-            )
-            template2 = TemplateModel(
-                template_key="owner2-template",
-                version="V1",
-                name="Owner 2",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="owner2",
-                modified_by="owner2",
-            )
-            db.session.add_all([template1, template2])
-            db.session.commit()
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-b"
+        g.user = user_tester
 
-            results, pagination = TemplateService.list_templates(user=user1, tenant_id="tenant-a", owner="owner1")
-            assert len(results) == 1
-            assert results[0].created_by == "owner1"
+        template_b = TemplateService.create_template(
+            metadata={"template_key": "shared", "name": "Shared"},
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-b",
+        )
+        assert template_b.m8f_tenant_id == "tenant-b"
+        assert template_b.template_key == "shared"
+        # Should be independent versioning (V1 for first in tenant-b)
+        assert template_b.version == "V1"
 
 
-def test_list_templates_filter_by_visibility() -> None:
-    """Test visibility filtering."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+# ============================================================================
+# List Templates Tests
+# ============================================================================
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
 
-            template1 = TemplateModel(
-                template_key="public-template",
-                version="V1",
-                name="Public",
-                visibility=TemplateVisibility.public.value,
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            template2 = TemplateModel(
-                template_key="private-template",
-                version="V1",
-                name="Private",
-                visibility=TemplateVisibility.private.value,
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add_all([template1, template2])
-            db.session.commit()
-
-            results, pagination = TemplateService.list_templates(
-                user=user, tenant_id="tenant-a", visibility=TemplateVisibility.public.value
-            )
-            assert len(results) == 1
-            assert results[0].visibility == TemplateVisibility.public.value
-
-
-def test_list_templates_search() -> None:
-    """Test text search in name/description."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-
-            template1 = TemplateModel(
-                template_key="search-template",
-                version="V1",
-                name="Searchable Template",
-                description="This is searchable",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            template2 = TemplateModel(
-                template_key="other-template",
-                version="V1",
-                name="Other Template",
-                description="Unrelated content",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add_all([template1, template2])
-            db.session.commit()
-
-            results, pagination = TemplateService.list_templates(user=user, tenant_id="tenant-a", search="searchable")
-            assert len(results) == 1
-            assert "searchable" in results[0].name.lower() or "searchable" in results[0].description.lower()
-
-
-def test_list_templates_tenant_isolation() -> None:
-    """Verify tenant scoping."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        db.session.add(M8flowTenantModel(id="tenant-b", name="Tenant B", slug="tenant-b", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-
-            template_a = TemplateModel(
-                template_key="shared",
-                version="V1",
-                name="Tenant A Template",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template_a)
-            db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-b"
-
-            template_b = TemplateModel(
-                template_key="shared",
-                version="V1",
-                name="Tenant B Template",
-                m8f_tenant_id="tenant-b",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template_b)
-            db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            results, pagination = TemplateService.list_templates(user=user, tenant_id="tenant-a")
-            assert len(results) == 1
-            assert results[0].m8f_tenant_id == "tenant-a"
-
-
-def test_list_templates_super_admin_filter_includes_cross_tenant_public() -> None:
-    """Super-admin tenant filter mirrors regular tenant scoping: tenant-owned OR PUBLIC."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add_all([
-            M8flowTenantModel(id="m8flow", name="M8Flow", slug="m8flow", created_by="test", modified_by="test"),
-            M8flowTenantModel(id="tenant1", name="Tenant 1", slug="tenant1", created_by="test", modified_by="test"),
-            M8flowTenantModel(id="tenant2", name="Tenant 2", slug="tenant2", created_by="test", modified_by="test"),
-        ])
-        user = UserModel(username="super-admin", email="super@example.com", service="local", service_id="super-admin")
-        db.session.add(user)
-        db.session.add_all([
-            TemplateModel(
-                template_key="default-sample",
-                version="V1",
-                name="Default Sample",
-                m8f_tenant_id="m8flow",
-                visibility=TemplateVisibility.public.value,
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="system",
-                modified_by="system",
-            ),
-            TemplateModel(
-                template_key="tenant2-private",
-                version="V1",
-                name="Tenant 2 Private",
-                m8f_tenant_id="tenant2",
-                visibility=TemplateVisibility.private.value,
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="owner2",
-                modified_by="owner2",
-            ),
-            TemplateModel(
-                template_key="tenant1-tenant",
-                version="V1",
-                name="Tenant 1 Scoped",
-                m8f_tenant_id="tenant1",
-                visibility=TemplateVisibility.tenant.value,
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="owner1",
-                modified_by="owner1",
-            ),
-        ])
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g._m8flow_super_admin_request = True
-            results, _ = TemplateService.list_templates(
-                user=user,
-                filter_tenant_id="tenant2",
-            )
-
-        keys = {t.template_key for t in results}
-        assert keys == {"default-sample", "tenant2-private"}
-        assert "tenant1-tenant" not in keys
-
-
-def test_list_templates_super_admin_without_filter_sees_all_tenants() -> None:
-    """Regression: super-admin with no filter_tenant_id keeps broad cross-tenant visibility.
-
-    The tenant-owned-OR-PUBLIC narrowing only applies when filter_tenant_id is set; without
-    it, the super-admin must still see every template regardless of tenant or visibility.
-    """
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add_all([
-            M8flowTenantModel(id="m8flow", name="M8Flow", slug="m8flow", created_by="test", modified_by="test"),
-            M8flowTenantModel(id="tenant1", name="Tenant 1", slug="tenant1", created_by="test", modified_by="test"),
-            M8flowTenantModel(id="tenant2", name="Tenant 2", slug="tenant2", created_by="test", modified_by="test"),
-        ])
-        user = UserModel(username="super-admin", email="super@example.com", service="local", service_id="super-admin")
-        db.session.add(user)
-        db.session.add_all([
-            TemplateModel(
-                template_key="default-sample",
-                version="V1",
-                name="Default Sample",
-                m8f_tenant_id="m8flow",
-                visibility=TemplateVisibility.public.value,
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="system",
-                modified_by="system",
-            ),
-            TemplateModel(
-                template_key="tenant2-private",
-                version="V1",
-                name="Tenant 2 Private",
-                m8f_tenant_id="tenant2",
-                visibility=TemplateVisibility.private.value,
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="owner2",
-                modified_by="owner2",
-            ),
-            TemplateModel(
-                template_key="tenant1-tenant",
-                version="V1",
-                name="Tenant 1 Scoped",
-                m8f_tenant_id="tenant1",
-                visibility=TemplateVisibility.tenant.value,
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="owner1",
-                modified_by="owner1",
-            ),
-        ])
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g._m8flow_super_admin_request = True
-            results, _ = TemplateService.list_templates(user=user)
-
-        keys = {t.template_key for t in results}
-        assert keys == {"default-sample", "tenant2-private", "tenant1-tenant"}
-
-
-# ============================================================================
-# Get Template Tests
-# ============================================================================
-
-
-def test_get_template_by_key_and_version() -> None:
-    """Get specific version."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-
-            template = TemplateModel(
-                template_key="specific-version",
-                version="V2",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-
-            result = TemplateService.get_template(
-                template_key="specific-version", version="V2", user=user, tenant_id="tenant-a"
-            )
-            assert result is not None
-            assert result.version == "V2"
-
-
-def test_get_template_latest() -> None:
-    """Get latest version when version=None."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-
-            template1 = TemplateModel(
-                template_key="latest-test",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            template2 = TemplateModel(
-                template_key="latest-test",
-                version="V3",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            template3 = TemplateModel(
-                template_key="latest-test",
-                version="V2",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add_all([template1, template2, template3])
-            db.session.commit()
-
-            result = TemplateService.get_template(
-                template_key="latest-test", latest=True, user=user, tenant_id="tenant-a"
-            )
-            assert result is not None
-            assert result.version == "V3"
-
-
-def test_get_template_not_found() -> None:
-    """Return None for non-existent template."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-
-            result = TemplateService.get_template(
-                template_key="nonexistent", user=user, tenant_id="tenant-a"
-            )
-            assert result is None
-
-
-def test_get_template_tenant_isolation() -> None:
-    """Verify tenant scoping."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        db.session.add(M8flowTenantModel(id="tenant-b", name="Tenant B", slug="tenant-b", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-
-            template_a = TemplateModel(
-                template_key="shared",
-                version="V1",
-                name="Tenant A",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template_a)
-            db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-b"
-
-            template_b = TemplateModel(
-                template_key="shared",
-                version="V1",
-                name="Tenant B",
-                m8f_tenant_id="tenant-b",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template_b)
-            db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            result = TemplateService.get_template(template_key="shared", user=user, tenant_id="tenant-a")
-            assert result is not None
-            assert result.m8f_tenant_id == "tenant-a"
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-b"
-            result = TemplateService.get_template(template_key="shared", user=user, tenant_id="tenant-b")
-            assert result is not None
-            assert result.m8f_tenant_id == "tenant-b"
-
-
-def test_get_template_by_id() -> None:
-    """Get template by database ID."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
+def test_list_templates_latest_only(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Test listing only latest versions."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
 
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        # Create multiple versions (V-style)
+        template1 = TemplateModel(
+            template_key="multi-version",
+            version="V1",
+            name="Test",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        template2 = TemplateModel(
+            template_key="multi-version",
+            version="V2",
+            name="Test",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        template3 = TemplateModel(
+            template_key="multi-version",
+            version="V3",
+            name="Test",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add_all([template1, template2, template3])
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-
-            template = TemplateModel(
-                template_key="by-id",
-                version="V1",
-                name="Test",
-                visibility=TemplateVisibility.public.value,
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
-
-            result = TemplateService.get_template_by_id(template_id, user=user)
-            assert result is not None
-            assert result.id == template_id
-
+        results, pagination = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a", latest_only=True)
+        assert len(results) == 1
+        assert results[0].version == "V3"
 
-def test_get_template_by_id_visibility_check() -> None:
-    """Verify visibility enforcement."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user1 = UserModel(username="owner", email="owner@example.com", service="local", service_id="owner")
-        user2 = UserModel(username="other", email="other@example.com", service="local", service_id="other")
-        db.session.add_all([user1, user2])
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
+def test_list_templates_all_versions(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Test listing all versions when latest_only=False."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
 
-            template = TemplateModel(
-                template_key="private",
-                version="V1",
-                name="Private Template",
-                visibility=TemplateVisibility.private.value,
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="owner",
-                modified_by="owner",
-            )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
-
-            # Owner can view
-            result1 = TemplateService.get_template_by_id(template_id, user=user1)
-            assert result1 is not None
-
-            # Other user cannot view private template
-            result2 = TemplateService.get_template_by_id(template_id, user=user2)
-            assert result2 is None
-
-
-def test_get_template_suppress_visibility() -> None:
-    """Test suppress_visibility flag."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        # Create multiple versions (V-style)
+        template1 = TemplateModel(
+            template_key="all-versions",
+            version="V1",
+            name="Test",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        template2 = TemplateModel(
+            template_key="all-versions",
+            version="V2",
+            name="Test",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add_all([template1, template2])
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
+        results, pagination = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a", latest_only=False)
+        assert len(results) == 2
 
-            template = TemplateModel(
-                template_key="suppress-test",
-                version="V1",
-                name="Test",
-                visibility=TemplateVisibility.private.value,
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
 
-            # With suppress_visibility=True, should bypass visibility check
-            result = TemplateService.get_template(
-                template_key="suppress-test",
-                user=user,
-                tenant_id="tenant-a",
-                suppress_visibility=True,
-            )
-            assert result is not None
-
-
-# ============================================================================
-# Update Template Tests
-# ============================================================================
-
-
-def test_update_template_by_key_version() -> None:
-    """Update unpublished template."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
+def test_list_templates_filter_by_category(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Test category filtering."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
 
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        template1 = TemplateModel(
+            template_key="cat1-template",
+            version="V1",
+            name="Category 1",
+            category="category1",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        template2 = TemplateModel(
+            template_key="cat2-template",
+            version="V1",
+            name="Category 2",
+            category="category2",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add_all([template1, template2])
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            template = TemplateModel(
-                template_key="update-test",
-                version="V1",
-                name="Original Name",
-                description="Original Description",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
+        results, pagination = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a", category="category1")
+        assert len(results) == 1
+        assert results[0].category == "category1"
 
-            updates = {"name": "Updated Name", "description": "Updated Description"}
-            updated = TemplateService.update_template("update-test", "V1", updates, user=user)
-
-            assert updated.name == "Updated Name"
-            assert updated.description == "Updated Description"
 
+def test_list_templates_filter_by_tag(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Test tag filtering (JSON array)."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
 
-def test_update_template_published_immutable() -> None:
-    """Should raise ApiError for published templates."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        template1 = TemplateModel(
+            template_key="tag1-template",
+            version="V1",
+            name="Tag 1",
+            tags=["tag1", "tag2"],
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        template2 = TemplateModel(
+            template_key="tag3-template",
+            version="V1",
+            name="Tag 3",
+            tags=["tag3"],
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add_all([template1, template2])
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            template = TemplateModel(
-                template_key="published",
-                version="V1",
-                name="Published Template",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=True,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
+        results, pagination = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a", tag="tag1")
+        assert len(results) == 1
+        assert "tag1" in results[0].tags
 
-            try:
-                TemplateService.update_template("published", "V1", {"name": "Updated"}, user=user)
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "immutable"
-                assert e.status_code == 400
 
+def test_list_templates_filter_by_owner(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_owner1: UserModel, user_owner2: UserModel) -> None:
+    """Test owner filtering."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
 
-def test_update_template_unauthorized() -> None:
-    """Should raise ApiError for unauthorized users."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        owner = UserModel(username="owner", email="owner@example.com", service="local", service_id="owner")
-        other = UserModel(username="other", email="other@example.com", service="local", service_id="other")
-        db.session.add_all([owner, other])
+        template1 = TemplateModel(
+            template_key="owner1-template",
+            version="V1",
+            name="Owner 1",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="owner1",
+            modified_by="owner1",
+        )
+        template2 = TemplateModel(
+            template_key="owner2-template",
+            version="V1",
+            name="Owner 2",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="owner2",
+            modified_by="owner2",
+        )
+        db.session.add_all([template1, template2])
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = owner
-
-            template = TemplateModel(
-                template_key="unauthorized",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=False,
-                visibility=TemplateVisibility.public.value,
-                created_by="owner",
-                modified_by="owner",
-            )
-            db.session.add(template)
-            db.session.commit()
+        results, pagination = TemplateService.list_templates(user=user_owner1, tenant_id="tenant-a", owner="owner1")
+        assert len(results) == 1
+        assert results[0].created_by == "owner1"
 
-            # Other user can see (public) but cannot edit
-            try:
-                TemplateService.update_template("unauthorized", "V1", {"name": "Updated"}, user=other)
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "forbidden"
-                assert e.status_code == 403
 
+def test_list_templates_filter_by_visibility(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Test visibility filtering."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
 
-def test_update_template_not_found() -> None:
-    """Should raise ApiError for non-existent template."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        template1 = TemplateModel(
+            template_key="public-template",
+            version="V1",
+            name="Public",
+            visibility=VISIBILITY_PUBLIC,
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        template2 = TemplateModel(
+            template_key="private-template",
+            version="V1",
+            name="Private",
+            visibility=VISIBILITY_PRIVATE,
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add_all([template1, template2])
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+        results, pagination = TemplateService.list_templates(
+            user=user_tester, tenant_id="tenant-a", visibility=VISIBILITY_PUBLIC
+        )
+        assert len(results) == 1
+        assert results[0].visibility == VISIBILITY_PUBLIC
 
-            try:
-                TemplateService.update_template("nonexistent", "V1", {"name": "Updated"}, user=user)
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "not_found"
-                assert e.status_code == 404
 
+def test_list_templates_search(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Test text search in name/description."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
 
-def test_update_template_by_id_unpublished() -> None:
-    """Update unpublished template in place."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        template1 = TemplateModel(
+            template_key="search-template",
+            version="V1",
+            name="Searchable Template",
+            description="This is searchable",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        template2 = TemplateModel(
+            template_key="other-template",
+            version="V1",
+            name="Other Template",
+            description="Unrelated content",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add_all([template1, template2])
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+        results, pagination = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a", search="searchable")
+        assert len(results) == 1
+        assert "searchable" in results[0].name.lower() or "searchable" in results[0].description.lower()
 
-            template = TemplateModel(
-                template_key="update-by-id",
-                version="V1",
-                name="Original",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
-
-            updates = {"name": "Updated"}
-            updated = TemplateService.update_template_by_id(template_id, updates, user=user)
-
-            assert updated.id == template_id  # Same record
-            assert updated.name == "Updated"
-            assert updated.version == "V1"  # Same version
 
+def test_list_templates_tenant_isolation(sqlite_app: Flask, tenant_a: M8flowTenantModel, tenant_b: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Verify tenant scoping."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
 
-def test_update_template_by_id_publish_sets_status() -> None:
-    """Publishing via is_published=True sets status to 'published'."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        template_a = TemplateModel(
+            template_key="shared",
+            version="V1",
+            name="Tenant A Template",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add(template_a)
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            template = TemplateModel(
-                template_key="publish-test",
-                version="V1",
-                name="Draft Template",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=False,
-                status="draft",
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
-
-            updates = {"is_published": True}
-            updated = TemplateService.update_template_by_id(template_id, updates, user=user)
-
-            assert updated.id == template_id
-            assert updated.is_published is True
-            assert updated.status == "published"
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-b"
 
-
-def test_update_template_by_id_published_creates_new_version() -> None:
-    """Published templates create new version."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        template_b = TemplateModel(
+            template_key="shared",
+            version="V1",
+            name="Tenant B Template",
+            m8f_tenant_id="tenant-b",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add(template_b)
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            template = TemplateModel(
-                template_key="published-update",
-                version="V1",
-                name="Published",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=True,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
-
-            updates = {"name": "New Version"}
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                updated = TemplateService.update_template_by_id(template_id, updates, user=user)
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        results, pagination = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a")
+        assert len(results) == 1
+        assert results[0].m8f_tenant_id == "tenant-a"
 
-            assert updated.id != template_id  # New record
-            assert updated.name == "New Version"
-            assert updated.version == "V2"  # New version (V1 -> next V2)
-            assert updated.is_published is False  # New versions start unpublished
 
+def test_list_templates_super_admin_filter_includes_cross_tenant_public(sqlite_app: Flask, db_session: scoped_session) -> None:
+    """Super-admin tenant filter mirrors regular tenant scoping: tenant-owned OR PUBLIC."""
+    db.session.add_all([
+        M8flowTenantModel(id="m8flow", name="M8Flow", slug="m8flow", created_by="test", modified_by="test"),
+        M8flowTenantModel(id="tenant1", name="Tenant 1", slug="tenant1", created_by="test", modified_by="test"),
+        M8flowTenantModel(id="tenant2", name="Tenant 2", slug="tenant2", created_by="test", modified_by="test"),
+    ])
+    user = UserModel(username="super-admin", email="super@example.com", service="local", service_id="super-admin")
+    db.session.add(user)
+    db.session.add_all([
+        TemplateModel(
+            template_key="default-sample",
+            version="V1",
+            name="Default Sample",
+            m8f_tenant_id="m8flow",
+            visibility=VISIBILITY_PUBLIC,
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="system",
+            modified_by="system",
+        ),
+        TemplateModel(
+            template_key="tenant2-private",
+            version="V1",
+            name="Tenant 2 Private",
+            m8f_tenant_id="tenant2",
+            visibility=VISIBILITY_PRIVATE,
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="owner2",
+            modified_by="owner2",
+        ),
+        TemplateModel(
+            template_key="tenant1-tenant",
+            version="V1",
+            name="Tenant 1 Scoped",
+            m8f_tenant_id="tenant1",
+            visibility=VISIBILITY_TENANT,
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="owner1",
+            modified_by="owner1",
+        ),
+    ])
+    db.session.commit()
+
+    with sqlite_app.test_request_context("/"):
+        g._m8flow_super_admin_request = True
+        results, _ = TemplateService.list_templates(
+            user=user,
+            filter_tenant_id="tenant2",
+        )
 
-def test_update_template_with_bpmn_bytes() -> None:
-    """Update BPMN content."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+    keys = {t.template_key for t in results}
+    assert keys == {"default-sample", "tenant2-private"}
+    assert "tenant1-tenant" not in keys
 
-            template = TemplateModel(
-                template_key="bpmn-update",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "old.bpmn"}],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                new_bpmn = b"<bpmn>new content</bpmn>"
-                updated = TemplateService.update_template_by_id(template_id, {}, bpmn_bytes=new_bpmn, user=user)
-
-                assert updated.files and len(updated.files) >= 1
-                assert any(e.get("file_type") == "bpmn" for e in updated.files)
-
-
-def test_update_template_allowed_fields() -> None:
-    """Test updating various fields."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+def test_list_templates_super_admin_without_filter_sees_all_tenants(sqlite_app: Flask, db_session: scoped_session) -> None:
+    """Regression: super-admin with no filter_tenant_id keeps broad cross-tenant visibility.
 
-            template = TemplateModel(
-                template_key="fields-update",
-                version="V1",
-                name="Original",
-                description="Original Desc",
-                category="cat1",
-                tags=["tag1"],
-                visibility=TemplateVisibility.private.value,
-                status="draft",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
+    The tenant-owned-OR-PUBLIC narrowing only applies when filter_tenant_id is set; without
+    it, the super-admin must still see every template regardless of tenant or visibility.
+    """
+    db.session.add_all([
+        M8flowTenantModel(id="m8flow", name="M8Flow", slug="m8flow", created_by="test", modified_by="test"),
+        M8flowTenantModel(id="tenant1", name="Tenant 1", slug="tenant1", created_by="test", modified_by="test"),
+        M8flowTenantModel(id="tenant2", name="Tenant 2", slug="tenant2", created_by="test", modified_by="test"),
+    ])
+    user = UserModel(username="super-admin", email="super@example.com", service="local", service_id="super-admin")
+    db.session.add(user)
+    db.session.add_all([
+        TemplateModel(
+            template_key="default-sample",
+            version="V1",
+            name="Default Sample",
+            m8f_tenant_id="m8flow",
+            visibility=VISIBILITY_PUBLIC,
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="system",
+            modified_by="system",
+        ),
+        TemplateModel(
+            template_key="tenant2-private",
+            version="V1",
+            name="Tenant 2 Private",
+            m8f_tenant_id="tenant2",
+            visibility=VISIBILITY_PRIVATE,
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="owner2",
+            modified_by="owner2",
+        ),
+        TemplateModel(
+            template_key="tenant1-tenant",
+            version="V1",
+            name="Tenant 1 Scoped",
+            m8f_tenant_id="tenant1",
+            visibility=VISIBILITY_TENANT,
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            created_by="owner1",
+            modified_by="owner1",
+        ),
+    ])
+    db.session.commit()
 
-            updates = {
-                "name": "Updated",
-                "description": "Updated Desc",
-                "category": "cat2",
-                "tags": ["tag2"],
-                "visibility": TemplateVisibility.public.value,
-                "status": "active",
-            }
-            updated = TemplateService.update_template("fields-update", "V1", updates, user=user)
+    with sqlite_app.test_request_context("/"):
+        g._m8flow_super_admin_request = True
+        results, _ = TemplateService.list_templates(user=user)
 
-            assert updated.name == "Updated"
-            assert updated.description == "Updated Desc"
-            assert updated.category == "cat2"
-            assert updated.tags == ["tag2"]
-            assert updated.visibility == TemplateVisibility.public.value
-            assert updated.status == "active"
+        keys = {t.template_key for t in results}
+        assert keys == {"default-sample", "tenant2-private", "tenant1-tenant"}
 
 
 # ============================================================================
-# Delete Template Tests
+# Get Template Tests
 # ============================================================================
 
 
-def test_delete_template_by_id_hard_deletes_draft_and_provenance() -> None:
-    """Draft templates are hard-deleted and linked provenance rows are removed."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def _lookup_by_id(user: UserModel) -> TemplateModel | None:
+    template_id = db.session.scalars(select(TemplateModel.id).where(TemplateModel.template_key == "lookup")).one()
+    return TemplateService.get_template_by_id(template_id, user=user)
+
+
+@pytest.mark.parametrize(
+    ("versions", "visibility", "lookup", "expected_version"),
+    [
+        pytest.param(
+            ("V2",),
+            VISIBILITY_PRIVATE,
+            lambda user: TemplateService.get_template(template_key="lookup", version="V2", user=user, tenant_id="tenant-a"),
+            "V2",
+            id="key_and_version",
+        ),
+        pytest.param(
+            ("V1", "V3", "V2"),
+            VISIBILITY_PRIVATE,
+            lambda user: TemplateService.get_template(template_key="lookup", latest=True, user=user, tenant_id="tenant-a"),
+            "V3",
+            id="latest",
+        ),
+        pytest.param(
+            (),
+            VISIBILITY_PRIVATE,
+            lambda user: TemplateService.get_template(template_key="lookup", user=user, tenant_id="tenant-a"),
+            None,
+            id="not_found",
+        ),
+        pytest.param(
+            ("V1",),
+            VISIBILITY_PUBLIC,
+            _lookup_by_id,
+            "V1",
+            id="by_id",
+        ),
+        pytest.param(
+            ("V1",),
+            VISIBILITY_PRIVATE,
+            lambda user: TemplateService.get_template(
+                template_key="lookup", user=user, tenant_id="tenant-a", suppress_visibility=True
+            ),
+            "V1",
+            id="suppress_visibility",
+        ),
+    ],
+)
+def test_get_template_lookup(
+    sqlite_app: Flask,
+    tenant_a: M8flowTenantModel,
+    user_tester: UserModel,
+    versions: tuple[str, ...],
+    visibility: str,
+    lookup,
+    expected_version: str | None,
+) -> None:
+    """Get a template by key/version, latest version, or database ID."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+
+        if versions:
+            _insert_templates(
+                *({"template_key": "lookup", "version": version, "visibility": visibility} for version in versions)
+            )
+
+        result = lookup(user_tester)
+        if expected_version is None:
+            assert result is None
+        else:
+            assert result is not None
+            assert result.version == expected_version
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            template = TemplateModel(
-                template_key="delete-by-id",
-                version="V1",
-                name="To Delete",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
-
-            provenance = ProcessModelTemplateModel(
-                process_model_identifier="group/model-a",
-                source_template_id=template_id,
-                source_template_key=template.template_key,
-                source_template_version=template.version,
-                source_template_name=template.name,
-                m8f_tenant_id="tenant-a",
-                created_by="tester",
-            )
-            db.session.add(provenance)
-            db.session.commit()
-
-            TemplateService.delete_template_by_id(template_id, user=user)
-
-            deleted = TemplateModel.query.filter_by(id=template_id).first()
-            assert deleted is None
-            assert (
-                ProcessModelTemplateModel.query.filter_by(
-                    source_template_id=template_id
-                ).count()
-                == 0
+def test_get_template_tenant_isolation(sqlite_app: Flask, tenant_a: M8flowTenantModel, tenant_b: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Verify tenant scoping."""
+    with sqlite_app.test_request_context("/"):
+        with _as_tenant("tenant-a"):
+            template_a = _make_template(
+                template_key="shared",
+                name="Tenant A",
             )
+            db.session.add(template_a)
+            db.session.flush()
 
-            # Service-level accessors should no longer see the template
-            assert TemplateService.get_template_by_id(template_id, user=user) is None
-            assert (
-                TemplateService.get_template(
-                    template_key="delete-by-id",
-                    version="V1",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                is None
+        with _as_tenant("tenant-b"):
+            template_b = _make_template(
+                template_key="shared",
+                name="Tenant B",
+                m8f_tenant_id="tenant-b",
             )
+            db.session.add(template_b)
+            db.session.flush()
 
-            results, pagination = TemplateService.list_templates(user=user, tenant_id="tenant-a", latest_only=False)
-            assert all(t.id != template_id for t in results)
+        with _as_tenant("tenant-a"):
+            result = TemplateService.get_template(template_key="shared", user=user_tester, tenant_id="tenant-a")
+            assert result is not None
+            assert result.m8f_tenant_id == "tenant-a"
 
+        with _as_tenant("tenant-b"):
+            result = TemplateService.get_template(template_key="shared", user=user_tester, tenant_id="tenant-b")
+            assert result is not None
+            assert result.m8f_tenant_id == "tenant-b"
 
-def test_soft_deleted_templates_are_excluded_from_queries() -> None:
-    """Ensure soft-deleted templates are excluded by default and query flags work."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+def test_get_template_by_id_returns_other_tenants_public_template(sqlite_app: Flask, tenant_a: M8flowTenantModel, tenant_b: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Visibility is decided by can_view, so a PUBLIC template stays readable from another tenant."""
+    with sqlite_app.test_request_context("/"):
+        with _as_tenant("tenant-a"):
+            template = _make_template(template_key="identity-map", visibility=VISIBILITY_PUBLIC)
+            db.session.add(template)
+            db.session.flush()
 
-            # Create active and soft-deleted templates
-            active = TemplateModel(
-                template_key="active-template",
-                version="V1",
-                name="Active",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            deleted = TemplateModel(
-                template_key="deleted-template",
-                version="V1",
-                name="Deleted",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=False,
-                is_deleted=True,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add_all([active, deleted])
-            db.session.commit()
-
-            # list_templates should only return the active template
-            results, pagination = TemplateService.list_templates(user=user, tenant_id="tenant-a", latest_only=False)
-            keys = {t.template_key for t in results}
-            assert "active-template" in keys
-            assert "deleted-template" not in keys
-
-            # deleted_only should return only soft-deleted templates
-            deleted_results, _ = TemplateService.list_templates(
-                user=user,
-                tenant_id="tenant-a",
-                latest_only=False,
-                deleted_only=True,
-            )
-            deleted_keys = {t.template_key for t in deleted_results}
-            assert "deleted-template" in deleted_keys
-            assert "active-template" not in deleted_keys
+        with _as_tenant("tenant-b"):
+            assert TemplateService.get_template_by_id(template.id, user=user_tester) is template
 
-            # include_deleted should return both
-            all_results, _ = TemplateService.list_templates(
-                user=user,
-                tenant_id="tenant-a",
-                latest_only=False,
-                include_deleted=True,
-            )
-            all_keys = {t.template_key for t in all_results}
-            assert "active-template" in all_keys
-            assert "deleted-template" in all_keys
-
-            # get_template should not return the deleted template
-            assert (
-                TemplateService.get_template(
-                    template_key="deleted-template",
-                    version="V1",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                is None
-            )
 
-            # get_template_by_id should also exclude the deleted template
-            assert TemplateService.get_template_by_id(deleted.id, user=user) is None
+def test_get_template_by_id_visibility_check(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_owner: UserModel, user_other: UserModel) -> None:
+    """Verify visibility enforcement."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+
+        template_id = _insert_template(
+            template_key="private",
+            name="Private Template",
+            visibility=VISIBILITY_PRIVATE,
+            created_by="owner",
+            modified_by="owner",
+        )
 
+        # Owner can view
+        result1 = TemplateService.get_template_by_id(template_id, user=user_owner)
+        assert result1 is not None
 
-def test_delete_template_published_soft_delete_for_tenant_admin() -> None:
-    """Published templates are soft-deleted and renamed by tenant-admin."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+        # Other user cannot view private template
+        result2 = TemplateService.get_template_by_id(template_id, user=user_other)
+        assert result2 is None
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            template = TemplateModel(
-                template_key="published-delete",
-                version="V1",
-                name="Published",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=True,
-                created_by="tester",
-                modified_by="tester",
+# ============================================================================
+# Update Template Tests
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    ("original", "updates"),
+    [
+        pytest.param(
+            {"name": "Original Name", "description": "Original Description"},
+            {"name": "Updated Name", "description": "Updated Description"},
+            id="name_and_description",
+        ),
+        pytest.param(
+            {
+                "name": "Original",
+                "description": "Original Desc",
+                "category": "cat1",
+                "tags": ["tag1"],
+                "visibility": VISIBILITY_PRIVATE,
+                "status": "draft",
+            },
+            {
+                "name": "Updated",
+                "description": "Updated Desc",
+                "category": "cat2",
+                "tags": ["tag2"],
+                "visibility": VISIBILITY_PUBLIC,
+                "status": "active",
+            },
+            id="allowed_fields",
+        ),
+    ],
+)
+def test_update_template_fields(
+    sqlite_app: Flask,
+    tenant_a: M8flowTenantModel,
+    user_tester: UserModel,
+    original: dict,
+    updates: dict,
+) -> None:
+    """Update allowed fields of an unpublished template in place."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        _seed(
+            _make_template(
+                template_key="update-test",
+                is_published=False,
+                **original,
             )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
+        )
 
-            with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
-                TemplateService.delete_template_by_id(template_id, user=user)
+        updated = TemplateService.update_template("update-test", "V1", updates, user=user_tester)
 
-            deleted = TemplateModel.query.filter_by(id=template_id).first()
-            assert deleted is not None
-            assert deleted.is_deleted is True
-            assert deleted.name.startswith("Published_deleted_")
-            suffix = deleted.name.split("_deleted_")[-1]
-            assert len(suffix) == 14
-            assert suffix.isdigit()
-
-
-def test_delete_template_published_requires_tenant_admin() -> None:
-    """Published template delete should fail for non-tenant-admin users."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+        for field, value in updates.items():
+            assert getattr(updated, field) == value
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            template = TemplateModel(
-                template_key="published-delete-forbidden",
-                version="V1",
-                name="Published",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=True,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
+def test_update_template_published_immutable(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Should raise ApiError for published templates."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template = _make_template(
+            template_key="published",
+            name="Published Template",
+            is_published=True,
+        )
+        db.session.add(template)
+        db.session.commit()
 
-            with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=False):
-                try:
-                    TemplateService.delete_template_by_id(template.id, user=user)
-                    assert False, "Should have raised ApiError"
-                except ApiError as e:
-                    assert e.error_code == "forbidden"
-                    assert e.status_code == 403
+        with pytest.raises(ApiError) as exc_info:
+            TemplateService.update_template("published", "V1", {"name": "Updated"}, user=user_tester)
+        assert exc_info.value.error_code == "immutable"
+        assert exc_info.value.status_code == 400
 
 
-def test_delete_template_published_allows_tenant_admin_for_non_owner_private() -> None:
-    """Tenant-admin can soft-delete a published private template they do not own."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        owner = UserModel(username="owner", email="owner@example.com", service="local", service_id="owner")
-        admin = UserModel(username="admin", email="admin@example.com", service="local", service_id="admin")
-        db.session.add_all([owner, admin])
+def test_update_template_unauthorized(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_owner: UserModel, user_other: UserModel) -> None:
+    """Should raise ApiError for unauthorized users."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_owner
+
+        template = _make_template(
+            template_key="unauthorized",
+            is_published=False,
+            visibility=VISIBILITY_PUBLIC,
+            created_by="owner",
+            modified_by="owner",
+        )
+        db.session.add(template)
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = admin
+        # Other user can see (public) but cannot edit
+        with pytest.raises(ApiError) as exc_info:
+            TemplateService.update_template("unauthorized", "V1", {"name": "Updated"}, user=user_other)
+        assert exc_info.value.error_code == "forbidden"
+        assert exc_info.value.status_code == 403
 
-            template = TemplateModel(
-                template_key="published-private-admin-delete",
-                version="V1",
-                name="Published Private",
-                m8f_tenant_id="tenant-a",
-                visibility=TemplateVisibility.private.value,
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=True,
-                created_by="owner",
-                modified_by="owner",
-            )
-            db.session.add(template)
-            db.session.commit()
 
-            with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
-                TemplateService.delete_template_by_id(template.id, user=admin)
+def test_update_template_not_found(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Should raise ApiError for non-existent template."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
 
-            deleted = TemplateModel.query.filter_by(id=template.id).first()
-            assert deleted is not None
-            assert deleted.is_deleted is True
-            assert deleted.name.startswith("Published Private_deleted_")
+        with pytest.raises(ApiError) as exc_info:
+            TemplateService.update_template("nonexistent", "V1", {"name": "Updated"}, user=user_tester)
+        assert exc_info.value.error_code == "not_found"
+        assert exc_info.value.status_code == 404
 
 
-def test_delete_template_unauthorized() -> None:
-    """Should raise ApiError for unauthorized users."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        owner = UserModel(username="owner", email="owner@example.com", service="local", service_id="owner")
-        other = UserModel(username="other", email="other@example.com", service="local", service_id="other")
-        db.session.add_all([owner, other])
-        db.session.commit()
+def test_update_template_by_id_unpublished(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Update unpublished template in place."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template_id = _insert_template(
+            template_key="update-by-id",
+            name="Original",
+            is_published=False,
+        )
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = owner
+        updates = {"name": "Updated"}
+        updated = TemplateService.update_template_by_id(template_id, updates, user=user_tester)
 
-            template = TemplateModel(
-                template_key="unauthorized-delete",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=False,
-                visibility=TemplateVisibility.public.value,
-                created_by="owner",
-                modified_by="owner",
-            )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
+        assert updated.id == template_id  # Same record
+        assert updated.name == "Updated"
+        assert updated.version == "V1"  # Same version
 
-            # Other user can see (public) but cannot delete
-            try:
-                TemplateService.delete_template_by_id(template_id, user=other)
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "forbidden"
-                assert e.status_code == 403
 
+def test_update_template_by_id_publish_sets_status(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Publishing via is_published=True sets status to 'published'."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template_id = _insert_template(
+            template_key="publish-test",
+            name="Draft Template",
+            is_published=False,
+            status="draft",
+        )
 
-def test_delete_draft_template_allows_tenant_admin() -> None:
-    """Tenant-admin can hard-delete draft templates not owned by them."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        owner = UserModel(username="owner", email="owner@example.com", service="local", service_id="owner")
-        admin = UserModel(username="admin", email="admin@example.com", service="local", service_id="admin")
-        db.session.add_all([owner, admin])
-        db.session.commit()
+        updates = {"is_published": True}
+        updated = TemplateService.update_template_by_id(template_id, updates, user=user_tester)
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = admin
+        assert updated.id == template_id
+        assert updated.is_published is True
+        assert updated.status == "published"
 
-            template = TemplateModel(
-                template_key="tenant-admin-delete",
-                version="V1",
-                name="Draft",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=False,
-                created_by="owner",
-                modified_by="owner",
-            )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
 
-            with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
-                TemplateService.delete_template_by_id(template_id, user=admin)
+def test_update_template_by_id_published_creates_new_version(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Published templates create new version."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template_id = _insert_template(
+            template_key="published-update",
+            name="Published",
+            is_published=True,
+        )
 
-            assert TemplateModel.query.filter_by(id=template_id).first() is None
+        updates = {"name": "New Version"}
+        updated = TemplateService.update_template_by_id(template_id, updates, user=user_tester)
 
+        assert updated.id != template_id  # New record
+        assert updated.name == "New Version"
+        assert updated.version == "V2"  # New version (V1 -> next V2)
+        assert updated.is_published is False  # New versions start unpublished
 
-def test_restore_template_by_id_tenant_admin() -> None:
-    """Tenant-admin can restore a soft-deleted template and recover base name."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+def test_update_template_with_bpmn_bytes(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Update BPMN content."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template_id = _insert_template(
+            template_key="bpmn-update",
+            files=[{"file_type": "bpmn", "file_name": "old.bpmn"}],
+            is_published=False,
+        )
 
-            deleted_template = TemplateModel(
-                template_key="restore-me",
-                version="V1",
-                name="Restore Name_deleted_20260224123456",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=True,
-                is_deleted=True,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(deleted_template)
-            db.session.commit()
+        new_bpmn = b"<bpmn>new content</bpmn>"
+        updated = TemplateService.update_template_by_id(template_id, {}, bpmn_bytes=new_bpmn, user=user_tester)
+
+        assert updated.files and len(updated.files) >= 1
+        assert any(e.get("file_type") == "bpmn" for e in updated.files)
 
-            with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
-                restored = TemplateService.restore_template_by_id(deleted_template.id, user=user)
 
-            assert restored.is_deleted is False
-            assert restored.name == "Restore Name"
+# ============================================================================
+# Delete Template Tests
+# ============================================================================
 
 
-def test_restore_template_requires_tenant_admin() -> None:
-    """Restore should fail for non-tenant-admin users."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def test_delete_template_by_id_hard_deletes_draft_and_provenance(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Draft templates are hard-deleted and linked provenance rows are removed."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template_id = _insert_template(
+            template_key="delete-by-id",
+            name="To Delete",
+            is_published=False,
+        )
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+        provenance = ProcessModelTemplateModel(
+            process_model_identifier="group/model-a",
+            source_template_id=template_id,
+            source_template_key="delete-by-id",
+            source_template_version="V1",
+            source_template_name="To Delete",
+            m8f_tenant_id="tenant-a",
+            created_by="tester",
+        )
+        db.session.add(provenance)
+        db.session.flush()
+
+        TemplateService.delete_template_by_id(template_id, user=user_tester)
+
+        deleted = db.session.get(TemplateModel, template_id)
+        assert deleted is None
+        assert (
+            ProcessModelTemplateModel.query.filter_by(
+                source_template_id=template_id
+            ).count()
+            == 0
+        )
 
-            deleted_template = TemplateModel(
-                template_key="restore-forbidden",
+        # Service-level accessors should no longer see the template
+        assert TemplateService.get_template_by_id(template_id, user=user_tester) is None
+        assert (
+            TemplateService.get_template(
+                template_key="delete-by-id",
                 version="V1",
-                name="Restore Name_deleted_20260224123456",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=True,
-                is_deleted=True,
-                created_by="tester",
-                modified_by="tester",
+                user=user_tester,
+                tenant_id="tenant-a",
             )
-            db.session.add(deleted_template)
-            db.session.commit()
-
-            with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=False):
-                try:
-                    TemplateService.restore_template_by_id(deleted_template.id, user=user)
-                    assert False, "Should have raised ApiError"
-                except ApiError as e:
-                    assert e.error_code == "forbidden"
-                    assert e.status_code == 403
+            is None
+        )
 
+        results, pagination = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a", latest_only=False)
+        assert all(t.id != template_id for t in results)
 
-def test_restore_template_invalid_state() -> None:
-    """Restore should fail when template is not deleted."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+def test_soft_deleted_templates_are_excluded_from_queries(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Ensure soft-deleted templates are excluded by default and query flags work."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        # Create active and soft-deleted templates
+        _insert_templates(
+            {"template_key": "active-template", "name": "Active", "is_published": False},
+            {"template_key": "deleted-template", "name": "Deleted", "is_published": False, "is_deleted": True},
+        )
+        deleted_id = db.session.scalars(
+            select(TemplateModel.id).where(TemplateModel.template_key == "deleted-template")
+        ).one()
+
+        # list_templates should only return the active template
+        results, pagination = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a", latest_only=False)
+        assert any(t.template_key == "active-template" for t in results)
+        assert not any(t.template_key == "deleted-template" for t in results)
+
+        # deleted_only should return only soft-deleted templates
+        deleted_results, _ = TemplateService.list_templates(
+            user=user_tester,
+            tenant_id="tenant-a",
+            latest_only=False,
+            deleted_only=True,
+        )
+        assert any(t.template_key == "deleted-template" for t in deleted_results)
+        assert not any(t.template_key == "active-template" for t in deleted_results)
+
+        # include_deleted should return both
+        all_results, _ = TemplateService.list_templates(
+            user=user_tester,
+            tenant_id="tenant-a",
+            latest_only=False,
+            include_deleted=True,
+        )
+        assert any(t.template_key == "active-template" for t in all_results)
+        assert any(t.template_key == "deleted-template" for t in all_results)
 
-            active_template = TemplateModel(
-                template_key="restore-invalid",
+        # get_template should not return the deleted template
+        assert (
+            TemplateService.get_template(
+                template_key="deleted-template",
                 version="V1",
-                name="Active Template",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=True,
-                is_deleted=False,
-                created_by="tester",
-                modified_by="tester",
+                user=user_tester,
+                tenant_id="tenant-a",
             )
-            db.session.add(active_template)
-            db.session.commit()
-
-            with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
-                try:
-                    TemplateService.restore_template_by_id(active_template.id, user=user)
-                    assert False, "Should have raised ApiError"
-                except ApiError as e:
-                    assert e.error_code == "invalid_state"
-                    assert e.status_code == 400
+            is None
+        )
 
+        # get_template_by_id should also exclude the deleted template
+        assert TemplateService.get_template_by_id(deleted_id, user=user_tester) is None
 
-def test_restore_template_by_id_allows_tenant_admin_for_non_owner_private() -> None:
-    """Tenant-admin can restore a private soft-deleted template created by another user."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        owner = UserModel(username="owner", email="owner@example.com", service="local", service_id="owner")
-        admin = UserModel(username="admin", email="admin@example.com", service="local", service_id="admin")
-        db.session.add_all([owner, admin])
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = admin
+def test_delete_template_published_soft_delete_for_tenant_admin(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Published templates are soft-deleted and renamed by tenant-admin."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template_id = _insert_template(
+            template_key="published-delete",
+            name="Published",
+            is_published=True,
+        )
 
-            deleted_template = TemplateModel(
-                template_key="restore-private-admin",
-                version="V1",
-                name="Restore Private_deleted_20260224123456",
-                m8f_tenant_id="tenant-a",
-                visibility=TemplateVisibility.private.value,
-                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                is_published=True,
-                is_deleted=True,
-                created_by="owner",
-                modified_by="owner",
-            )
-            db.session.add(deleted_template)
-            db.session.commit()
+        with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
+            TemplateService.delete_template_by_id(template_id, user=user_tester)
+
+        deleted = db.session.get(TemplateModel, template_id)
+        assert deleted is not None
+        assert deleted.is_deleted is True
+        assert deleted.name.startswith("Published_deleted_")
+        suffix = deleted.name.split("_deleted_")[-1]
+        assert len(suffix) == 14
+        assert suffix.isdigit()
+
+
+@pytest.mark.parametrize(
+    ("template_fields", "actor", "expected_code", "expected_status"),
+    [
+        pytest.param(
+            {"is_published": True},
+            "user_tester",
+            "forbidden",
+            403,
+            id="published_requires_tenant_admin",
+        ),
+        pytest.param(
+            # Other user can see (public) but cannot delete
+            {"is_published": False, "visibility": VISIBILITY_PUBLIC, "created_by": "owner", "modified_by": "owner"},
+            "user_other",
+            "forbidden",
+            403,
+            id="unauthorized",
+        ),
+        pytest.param(None, "user_tester", "not_found", 404, id="not_found"),
+    ],
+)
+def test_delete_template_failures(
+    sqlite_app: Flask,
+    tenant_a: M8flowTenantModel,
+    request: pytest.FixtureRequest,
+    template_fields: dict | None,
+    actor: str,
+    expected_code: str,
+    expected_status: int,
+) -> None:
+    """Non-admin deletes of published or foreign templates, and unknown ids, are rejected."""
+    user = request.getfixturevalue(actor)
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user
+
+        template_id = 9999 if template_fields is None else _insert_template(template_key="delete-failure", **template_fields)
+
+        with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=False):
+            with pytest.raises(ApiError) as exc_info:
+                TemplateService.delete_template_by_id(template_id, user=user)
+        assert exc_info.value.error_code == expected_code
+        assert exc_info.value.status_code == expected_status
 
-            with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
-                restored = TemplateService.restore_template_by_id(deleted_template.id, user=admin)
 
-            assert restored.is_deleted is False
-            assert restored.name == "Restore Private"
+def test_delete_template_published_allows_tenant_admin_for_non_owner_private(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_owner: UserModel, user_admin: UserModel) -> None:
+    """Tenant-admin can soft-delete a published private template they do not own."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_admin
+
+        template_id = _insert_template(
+            template_key="published-private-admin-delete",
+            name="Published Private",
+            visibility=VISIBILITY_PRIVATE,
+            is_published=True,
+            created_by="owner",
+            modified_by="owner",
+        )
 
+        with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
+            TemplateService.delete_template_by_id(template_id, user=user_admin)
 
-def test_delete_template_not_found() -> None:
-    """Should raise ApiError for non-existent template."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+        deleted = db.session.get(TemplateModel, template_id)
+        assert deleted is not None
+        assert deleted.is_deleted is True
+        assert deleted.name.startswith("Published Private_deleted_")
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            template_id = 9999  # Non-existent ID
+def test_delete_draft_template_allows_tenant_admin(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_owner: UserModel, user_admin: UserModel) -> None:
+    """Tenant-admin can hard-delete draft templates not owned by them."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_admin
+
+        template_id = _insert_template(
+            template_key="tenant-admin-delete",
+            name="Draft",
+            is_published=False,
+            created_by="owner",
+            modified_by="owner",
+        )
 
-            try:
-                TemplateService.delete_template_by_id(template_id, user=user)
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "not_found"
-                assert e.status_code == 404
+        with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
+            TemplateService.delete_template_by_id(template_id, user=user_admin)
 
+        assert db.session.get(TemplateModel, template_id) is None
 
-# ============================================================================
-# Integration/Edge Cases
-# ============================================================================
 
+def test_restore_template_by_id_tenant_admin(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Tenant-admin can restore a soft-deleted template and recover base name."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
 
-def test_template_tenant_isolation_across_tenants() -> None:
-    """Verify complete tenant isolation."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        db.session.add(M8flowTenantModel(id="tenant-b", name="Tenant B", slug="tenant-b", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        deleted_template = TemplateModel(
+            template_key="restore-me",
+            version="V1",
+            name="Restore Name_deleted_20260224123456",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            is_published=True,
+            is_deleted=True,
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add(deleted_template)
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                TemplateService.create_template(
-                    metadata={"template_key": "isolated", "name": "Tenant A"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-b"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                TemplateService.create_template(
-                    metadata={"template_key": "isolated", "name": "Tenant B"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-b",
-                )
+        with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
+            restored = TemplateService.restore_template_by_id(deleted_template.id, user=user_tester)
 
-        # Verify isolation
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            results_a, _ = TemplateService.list_templates(user=user, tenant_id="tenant-a")
-            assert len(results_a) == 1
-            assert results_a[0].m8f_tenant_id == "tenant-a"
+        assert restored.is_deleted is False
+        assert restored.name == "Restore Name"
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-b"
-            results_b, _ = TemplateService.list_templates(user=user, tenant_id="tenant-b")
-            assert len(results_b) == 1
-            assert results_b[0].m8f_tenant_id == "tenant-b"
 
+def test_restore_template_requires_tenant_admin(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Restore should fail for non-tenant-admin users."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
 
-def test_template_versioning_multiple_tenants() -> None:
-    """Same template_key can have different versions per tenant."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        db.session.add(M8flowTenantModel(id="tenant-b", name="Tenant B", slug="tenant-b", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        deleted_template = TemplateModel(
+            template_key="restore-forbidden",
+            version="V1",
+            name="Restore Name_deleted_20260224123456",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            is_published=True,
+            is_deleted=True,
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add(deleted_template)
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                # Create first version for tenant-a via the service (V1).
-                TemplateService.create_template(
-                    metadata={"template_key": "shared", "name": "Shared"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-            # A second version is added the way the edit/publish cycle does (direct row),
-            # not via create (which now rejects a duplicate name in the same tenant).
-            db.session.add(
-                TemplateModel(
-                    template_key="shared",
-                    version="V2",
-                    name="Shared",
-                    m8f_tenant_id="tenant-a",
-                    files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                    created_by="tester",
-                    modified_by="tester",
-                )
-            )
-            db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-b"
-            g.user = user
+        with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=False):
+            with pytest.raises(ApiError) as exc_info:
+                TemplateService.restore_template_by_id(deleted_template.id, user=user_tester)
+            assert exc_info.value.error_code == "forbidden"
+            assert exc_info.value.status_code == 403
 
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                # Create version for tenant-b (should be V1, independent)
-                template_b = TemplateService.create_template(
-                    metadata={"template_key": "shared", "name": "Shared"},
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-b",
-                )
-                assert template_b.version == "V1"  # Independent versioning
 
+def test_restore_template_invalid_state(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Restore should fail when template is not deleted."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
 
-def test_template_visibility_public_tenant_private() -> None:
-    """Test all visibility levels."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
+        active_template = TemplateModel(
+            template_key="restore-invalid",
+            version="V1",
+            name="Active Template",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            is_published=True,
+            is_deleted=False,
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add(active_template)
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                # Create templates with different visibility
-                public_template = TemplateService.create_template(
-                    metadata={
-                        "template_key": "public",
-                        "name": "Public",
-                        "visibility": TemplateVisibility.public.value,
-                    },
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                tenant_template = TemplateService.create_template(
-                    metadata={
-                        "template_key": "tenant",
-                        "name": "Tenant",
-                        "visibility": TemplateVisibility.tenant.value,
-                    },
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                private_template = TemplateService.create_template(
-                    metadata={
-                        "template_key": "private",
-                        "name": "Private",
-                        "visibility": TemplateVisibility.private.value,
-                    },
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-
-                assert public_template.visibility == TemplateVisibility.public.value
-                assert tenant_template.visibility == TemplateVisibility.tenant.value
-                assert private_template.visibility == TemplateVisibility.private.value
-
-
-def test_template_tags_json_handling() -> None:
-    """Test JSON tag storage and filtering."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+        with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
+            with pytest.raises(ApiError) as exc_info:
+                TemplateService.restore_template_by_id(active_template.id, user=user_tester)
+            assert exc_info.value.error_code == "invalid_state"
+            assert exc_info.value.status_code == 400
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                template = TemplateService.create_template(
-                    metadata={
-                        "template_key": "tags-test",
-                        "name": "Tags Test",
-                        "tags": ["tag1", "tag2", "tag3"],
-                    },
-                    bpmn_bytes=b"<bpmn>test</bpmn>",
-                    user=user,
-                    tenant_id="tenant-a",
-                )
+def test_restore_template_by_id_allows_tenant_admin_for_non_owner_private(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_owner: UserModel, user_admin: UserModel) -> None:
+    """Tenant-admin can restore a private soft-deleted template created by another user."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_admin
 
-                assert template.tags == ["tag1", "tag2", "tag3"]
-                assert isinstance(template.tags, list)
+        deleted_template = TemplateModel(
+            template_key="restore-private-admin",
+            version="V1",
+            name="Restore Private_deleted_20260224123456",
+            m8f_tenant_id="tenant-a",
+            visibility=VISIBILITY_PRIVATE,
+            files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+            is_published=True,
+            is_deleted=True,
+            created_by="owner",
+            modified_by="owner",
+        )
+        db.session.add(deleted_template)
+        db.session.commit()
 
-                # Test filtering by tag
-                results, _ = TemplateService.list_templates(user=user, tenant_id="tenant-a", tag="tag1")
-                assert len(results) == 1
-                assert "tag1" in results[0].tags
+        with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=True):
+            restored = TemplateService.restore_template_by_id(deleted_template.id, user=user_admin)
 
-                # Test filtering by multiple tags
-                results, _ = TemplateService.list_templates(user=user, tenant_id="tenant-a", tag="tag1,tag2")
-                assert len(results) == 1
+        assert restored.is_deleted is False
+        assert restored.name == "Restore Private"
 
 
 # ============================================================================
-# Create Template with Multiple Files Tests
+# Integration/Edge Cases
 # ============================================================================
 
 
-def test_create_template_with_multiple_files() -> None:
-    """Create template with BPMN + JSON files."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def test_template_tenant_isolation_across_tenants(sqlite_app: Flask, tenant_a: M8flowTenantModel, tenant_b: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Verify complete tenant isolation."""
+    with sqlite_app.test_request_context("/"):
+        g.user = user_tester
+
+        g.m8flow_tenant_id = "tenant-a"
+        TemplateService.create_template(
+            metadata={"template_key": "isolated", "name": "Tenant A"},
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                files = [
-                    ("diagram.bpmn", b"<bpmn>content</bpmn>"),
-                    ("form.json", b'{"field": "value"}'),
-                ]
-                metadata = {
-                    "template_key": "multi-file",
-                    "name": "Multi-File Template",
-                }
-                template = TemplateService.create_template_with_files(
-                    metadata=metadata,
-                    files=files,
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-
-                assert template.template_key == "multi-file"
-                assert len(template.files) == 2
-                file_names = [f["file_name"] for f in template.files]
-                assert "diagram.bpmn" in file_names
-                assert "form.json" in file_names
-                file_types = {f["file_name"]: f["file_type"] for f in template.files}
-                assert file_types["diagram.bpmn"] == "bpmn"
-                assert file_types["form.json"] == "json"
-
-
-def test_create_template_with_files_requires_bpmn() -> None:
-    """Should raise ApiError when no BPMN file is included."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+        g.m8flow_tenant_id = "tenant-b"
+        TemplateService.create_template(
+            metadata={"template_key": "isolated", "name": "Tenant B"},
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-b",
+        )
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                files = [
-                    ("form.json", b'{"field": "value"}'),
-                    ("readme.md", b"# Readme"),
-                ]
-                metadata = {
-                    "template_key": "no-bpmn",
-                    "name": "No BPMN Template",
-                }
-                try:
-                    TemplateService.create_template_with_files(
-                        metadata=metadata,
-                        files=files,
-                        user=user,
-                        tenant_id="tenant-a",
-                    )
-                    assert False, "Should have raised ApiError"
-                except ApiError as e:
-                    assert e.error_code == "missing_fields"
-                    assert e.status_code == 400
-
-
-def test_create_template_with_files_requires_user() -> None:
-    """Should raise ApiError when user is None."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
+        # Verify isolation
+        g.m8flow_tenant_id = "tenant-a"
+        results_a, _ = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a")
+        assert len(results_a) == 1
+        assert results_a[0].m8f_tenant_id == "tenant-a"
+
+        g.m8flow_tenant_id = "tenant-b"
+        results_b, _ = TemplateService.list_templates(user=user_tester, tenant_id="tenant-b")
+        assert len(results_b) == 1
+        assert results_b[0].m8f_tenant_id == "tenant-b"
+
+
+def test_template_versioning_multiple_tenants(sqlite_app: Flask, tenant_a: M8flowTenantModel, tenant_b: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Same template_key can have different versions per tenant."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        # Create first version for tenant-a via the service (V1).
+        TemplateService.create_template(
+            metadata={"template_key": "shared", "name": "Shared"},
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+        # A second version is added the way the edit/publish cycle does (direct row),
+        # not via create (which now rejects a duplicate name in the same tenant).
+        db.session.add(
+            TemplateModel(
+                template_key="shared",
+                version="V2",
+                name="Shared",
+                m8f_tenant_id="tenant-a",
+                files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
+                created_by="tester",
+                modified_by="tester",
+            )
+        )
         db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-b"
+        g.user = user_tester
 
-            try:
-                TemplateService.create_template_with_files(
-                    metadata={"template_key": "test", "name": "Test"},
-                    files=[("diagram.bpmn", b"<bpmn/>")],
-                    user=None,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "unauthorized"
+        # Create version for tenant-b (should be V1, independent)
+        template_b = TemplateService.create_template(
+            metadata={"template_key": "shared", "name": "Shared"},
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-b",
+        )
+        assert template_b.version == "V1"  # Independent versioning
 
 
-def test_create_template_with_files_requires_metadata() -> None:
-    """Should raise ApiError when metadata is missing."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def test_template_visibility_public_tenant_private(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Test all visibility levels."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        # Create templates with different visibility
+        public_template = TemplateService.create_template(
+            metadata={
+                "template_key": "public",
+                "name": "Public",
+                "visibility": VISIBILITY_PUBLIC,
+            },
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+        tenant_template = TemplateService.create_template(
+            metadata={
+                "template_key": "tenant",
+                "name": "Tenant",
+                "visibility": VISIBILITY_TENANT,
+            },
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+        private_template = TemplateService.create_template(
+            metadata={
+                "template_key": "private",
+                "name": "Private",
+                "visibility": VISIBILITY_PRIVATE,
+            },
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+        assert public_template.visibility == VISIBILITY_PUBLIC
+        assert tenant_template.visibility == VISIBILITY_TENANT
+        assert private_template.visibility == VISIBILITY_PRIVATE
 
-            try:
-                TemplateService.create_template_with_files(
-                    metadata=None,
-                    files=[("diagram.bpmn", b"<bpmn/>")],
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "missing_fields"
 
+def test_template_tags_json_handling(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Test JSON tag storage and filtering."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        template = TemplateService.create_template(
+            metadata={
+                "template_key": "tags-test",
+                "name": "Tags Test",
+                "tags": ["tag1", "tag2", "tag3"],
+            },
+            bpmn_bytes=b"<bpmn>test</bpmn>",
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
 
-# ============================================================================
-# Update File Content Tests
-# ============================================================================
+        assert template.tags == ["tag1", "tag2", "tag3"]
+        assert isinstance(template.tags, list)
 
+        # Test filtering by tag
+        results, _ = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a", tag="tag1")
+        assert len(results) == 1
+        assert "tag1" in results[0].tags
 
-def test_update_file_content_unpublished() -> None:
-    """Update file content for an unpublished template."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+        # Test filtering by multiple tags
+        results, _ = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a", tag="tag1,tag2")
+        assert len(results) == 1
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            template = TemplateModel(
-                template_key="file-update",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[
-                    {"file_type": "bpmn", "file_name": "diagram.bpmn"},
-                    {"file_type": "json", "file_name": "form.json"},
-                ],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
+def test_list_templates_reads_tags_and_files_in_one_query(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """tags and files are JSON columns on the template row, so listing never lazy-loads them."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
 
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                # Should not raise - updates file content
-                TemplateService.update_file_content(
-                    template, "form.json", b'{"updated": true}', user=user
-                )
+        _insert_templates(
+            *({"template_key": f"json-{n}", "tags": [f"tag{n}"]} for n in range(3))
+        )
 
+        template_selects: list[str] = []
 
-def test_update_file_content_published_creates_draft_version() -> None:
-    """Updating file on published template should create a new draft version."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+        def _record(_conn, _cursor, statement, _parameters, _context, _executemany):
+            if "m8flow_templates" in statement:
+                template_selects.append(statement)
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+        event.listen(db.engine, "before_cursor_execute", _record)
+        try:
+            with patch("m8flow_backend.services.template_service.TemplateAuthorizationService.has_admin_permission", return_value=False):
+                results, _ = TemplateService.list_templates(user=user_tester, tenant_id="tenant-a")
+            assert {t.tags[0] for t in results} == {"tag0", "tag1", "tag2"}
+            assert all(t.files == _BPMN_FILES for t in results)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _record)
 
-            template = TemplateModel(
-                template_key="published-file",
-                version="V1",
-                name="Published",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "diagram.bpmn"}],
-                is_published=True,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
+        assert len(template_selects) == 1
 
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                # Should create a new draft version instead of raising
-                result = TemplateService.update_file_content(
-                    template, "diagram.bpmn", b"<bpmn>new</bpmn>", user=user
-                )
+# ============================================================================
+# Create Template with Multiple Files Tests
+# ============================================================================
 
-                # Result should be a new draft version
-                assert result is not None
-                assert result.id != template.id
-                assert result.version == "V2"
-                assert result.is_published is False
-                assert result.template_key == "published-file"
 
+def test_create_template_with_multiple_files(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Create template with BPMN + JSON files."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        files = [
+            ("diagram.bpmn", b"<bpmn>content</bpmn>"),
+            ("form.json", b'{"field": "value"}'),
+        ]
+        metadata = {
+            "template_key": "multi-file",
+            "name": "Multi-File Template",
+        }
+        template = TemplateService.create_template_with_files(
+            metadata=metadata,
+            files=files,
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
 
-def test_update_file_content_file_not_found() -> None:
-    """Should raise ApiError when file is not in template files list."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+        assert template.template_key == "multi-file"
+        assert len(template.files) == 2
+        file_names = [f["file_name"] for f in template.files]
+        assert "diagram.bpmn" in file_names
+        assert "form.json" in file_names
+        file_types = {f["file_name"]: f["file_type"] for f in template.files}
+        assert file_types["diagram.bpmn"] == "bpmn"
+        assert file_types["form.json"] == "json"
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            template = TemplateModel(
-                template_key="missing-file",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "diagram.bpmn"}],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
+def test_create_template_with_files_requires_bpmn(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Should raise ApiError when no BPMN file is included."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        files = [
+            ("form.json", b'{"field": "value"}'),
+            ("readme.md", b"# Readme"),
+        ]
+        metadata = {
+            "template_key": "no-bpmn",
+            "name": "No BPMN Template",
+        }
+        with pytest.raises(ApiError) as exc_info:
+            TemplateService.create_template_with_files(
+                metadata=metadata,
+                files=files,
+                user=user_tester,
+                tenant_id="tenant-a",
             )
-            db.session.add(template)
-            db.session.commit()
+        assert exc_info.value.error_code == "missing_fields"
+        assert exc_info.value.status_code == 400
 
-            try:
-                TemplateService.update_file_content(
-                    template, "nonexistent.json", b"content", user=user
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "not_found"
-                assert e.status_code == 404
 
+def test_create_template_with_files_requires_user(sqlite_app: Flask, tenant_a: M8flowTenantModel) -> None:
+    """Should raise ApiError when user is None."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+
+        with pytest.raises(ApiError) as exc_info:
+            TemplateService.create_template_with_files(
+                metadata={"template_key": "test", "name": "Test"},
+                files=[("diagram.bpmn", b"<bpmn/>")],
+                user=None,
+                tenant_id="tenant-a",
+            )
+        assert exc_info.value.error_code == "unauthorized"
 
-def test_update_file_content_published_reuses_existing_draft() -> None:
-    """When a draft version exists, subsequent edits should update that draft instead of creating a new one."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            # Create published V1
-            published_template = TemplateModel(
-                template_key="reuse-draft",
-                version="V1",
-                name="Published",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "diagram.bpmn"}],
-                is_published=True,
-                created_by="tester",
-                modified_by="tester",
+def test_create_template_with_files_requires_metadata(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Should raise ApiError when metadata is missing."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
+
+        with pytest.raises(ApiError) as exc_info:
+            TemplateService.create_template_with_files(
+                metadata=None,
+                files=[("diagram.bpmn", b"<bpmn/>")],
+                user=user_tester,
+                tenant_id="tenant-a",
             )
-            db.session.add(published_template)
-            db.session.commit()
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                # First edit creates V2 draft
-                result1 = TemplateService.update_file_content(
-                    published_template, "diagram.bpmn", b"<bpmn>edit1</bpmn>", user=user
-                )
-                assert result1.version == "V2"
-                assert result1.is_published is False
-                v2_id = result1.id
-
-                # Second edit should reuse V2 draft, not create V3
-                result2 = TemplateService.update_file_content(
-                    published_template, "diagram.bpmn", b"<bpmn>edit2</bpmn>", user=user
-                )
-                assert result2.id == v2_id
-                assert result2.version == "V2"
-                assert result2.is_published is False
-
-                # Verify no V3 was created
-                v3 = TemplateModel.query.filter_by(
-                    template_key="reuse-draft",
-                    version="V3",
-                    m8f_tenant_id="tenant-a",
-                ).first()
-                assert v3 is None
+        assert exc_info.value.error_code == "missing_fields"
 
 
 # ============================================================================
-# Delete File from Template Tests
+# Update File Content Tests
 # ============================================================================
 
 
-def test_delete_file_from_template_removes_entry() -> None:
-    """Delete a file from template removes it from files list."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def test_update_file_content_unpublished(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Update file content for an unpublished template."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+        template = TemplateModel(
+            template_key="file-update",
+            version="V1",
+            name="Test",
+            m8f_tenant_id="tenant-a",
+            files=[
+                {"file_type": "bpmn", "file_name": "diagram.bpmn"},
+                {"file_type": "json", "file_name": "form.json"},
+            ],
+            is_published=False,
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add(template)
+        db.session.flush()
 
-            template = TemplateModel(
-                template_key="delete-file",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[
-                    {"file_type": "bpmn", "file_name": "diagram.bpmn"},
-                    {"file_type": "json", "file_name": "form.json"},
-                ],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
+        # Should not raise - updates file content
+        TemplateService.update_file_content(
+            template, "form.json", b'{"updated": true}', user=user_tester
+        )
 
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                TemplateService.delete_file_from_template(template, "form.json", user=user)
 
-            assert len(template.files) == 1
-            assert template.files[0]["file_name"] == "diagram.bpmn"
+def test_update_file_content_published_creates_draft_version(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Updating file on published template should create a new draft version."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
 
+        template = TemplateModel(
+            template_key="published-file",
+            version="V1",
+            name="Published",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "diagram.bpmn"}],
+            is_published=True,
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add(template)
+        db.session.flush()
 
-def test_delete_file_rejects_last_file() -> None:
-    """Cannot delete the last file from a template."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
+        # Should create a new draft version instead of raising
+        result = TemplateService.update_file_content(
+            template, "diagram.bpmn", b"<bpmn>new</bpmn>", user=user_tester
+        )
 
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+        # Result should be a new draft version
+        assert result is not None
+        assert result.id != template.id
+        assert result.version == "V2"
+        assert result.is_published is False
+        assert result.template_key == "published-file"
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
 
-            template = TemplateModel(
-                template_key="last-file",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "diagram.bpmn"}],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-
-            try:
-                TemplateService.delete_file_from_template(template, "diagram.bpmn", user=user)
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "forbidden"
-                assert e.status_code == 403
-
-
-def test_delete_file_rejects_only_bpmn() -> None:
-    """Cannot delete the only BPMN file (even if other file types remain)."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+def test_update_file_content_file_not_found(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """Should raise ApiError when file is not in template files list."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+        template = TemplateModel(
+            template_key="missing-file",
+            version="V1",
+            name="Test",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "diagram.bpmn"}],
+            is_published=False,
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add(template)
+        db.session.flush()
 
-            template = TemplateModel(
-                template_key="only-bpmn",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[
-                    {"file_type": "bpmn", "file_name": "diagram.bpmn"},
-                    {"file_type": "json", "file_name": "form.json"},
-                ],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
+        with pytest.raises(ApiError) as exc_info:
+            TemplateService.update_file_content(
+                template, "nonexistent.json", b"content", user=user_tester
             )
-            db.session.add(template)
-            db.session.commit()
+        assert exc_info.value.error_code == "not_found"
+        assert exc_info.value.status_code == 404
 
-            try:
-                TemplateService.delete_file_from_template(template, "diagram.bpmn", user=user)
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "forbidden"
-                assert e.status_code == 403
 
+def test_update_file_content_published_reuses_existing_draft(sqlite_app: Flask, tenant_a: M8flowTenantModel, user_tester: UserModel) -> None:
+    """When a draft version exists, subsequent edits should update that draft instead of creating a new one."""
+    with sqlite_app.test_request_context("/"):
+        g.m8flow_tenant_id = "tenant-a"
+        g.user = user_tester
 
-def test_delete_file_from_published_creates_draft() -> None:
-    """Deleting file from published template should create a new draft version."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+        # Create published V1
+        published_template = TemplateModel(
+            template_key="reuse-draft",
+            version="V1",
+            name="Published",
+            m8f_tenant_id="tenant-a",
+            files=[{"file_type": "bpmn", "file_name": "diagram.bpmn"}],
+            is_published=True,
+            created_by="tester",
+            modified_by="tester",
+        )
+        db.session.add(published_template)
+        db.session.flush()
 
-            template = TemplateModel(
-                template_key="published-del-file",
-                version="V1",
-                name="Published",
-                m8f_tenant_id="tenant-a",
-                files=[
-                    {"file_type": "bpmn", "file_name": "diagram.bpmn"},
-                    {"file_type": "json", "file_name": "form.json"},
-                ],
-                is_published=True,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
+        # First edit creates V2 draft
+        result1 = TemplateService.update_file_content(
+            published_template, "diagram.bpmn", b"<bpmn>edit1</bpmn>", user=user_tester
+        )
+        assert result1.version == "V2"
+        assert result1.is_published is False
+        v2_id = result1.id
 
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                # Should create a new draft version instead of raising
-                result = TemplateService.delete_file_from_template(template, "form.json", user=user)
+        # Second edit should reuse V2 draft, not create V3
+        result2 = TemplateService.update_file_content(
+            published_template, "diagram.bpmn", b"<bpmn>edit2</bpmn>", user=user_tester
+        )
+        assert result2.id == v2_id
+        assert result2.version == "V2"
+        assert result2.is_published is False
+
+        # Verify no V3 was created
+        v3 = TemplateModel.query.filter_by(
+            template_key="reuse-draft",
+            version="V3",
+            m8f_tenant_id="tenant-a",
+        ).first()
+        assert v3 is None
 
-                # Result should be a new draft version
-                assert result is not None
-                assert result.id != template.id
-                assert result.version == "V2"
-                assert result.is_published is False
-                assert result.template_key == "published-del-file"
-                # The file should be deleted from the new version
-                assert len(result.files) == 1
-                assert result.files[0]["file_name"] == "diagram.bpmn"
 
-                # Original published template should be unchanged
-                db.session.refresh(template)
-                assert len(template.files) == 2
-                assert template.is_published is True
+# ============================================================================
+# Delete File from Template Tests
+# ============================================================================
 
 
-def test_delete_file_not_found() -> None:
-    """Should raise ApiError when file is not in template files list."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+@pytest.mark.parametrize(
+    ("files", "file_name", "expected_code", "expected_status"),
+    [
+        pytest.param(
+            [{"file_type": "bpmn", "file_name": "diagram.bpmn"}, {"file_type": "json", "file_name": "form.json"}],
+            "form.json",
+            None,
+            None,
+            id="removes_entry",
+        ),
+        pytest.param(
+            [{"file_type": "bpmn", "file_name": "diagram.bpmn"}],
+            "diagram.bpmn",
+            "forbidden",
+            403,
+            id="rejects_last_file",
+        ),
+        pytest.param(
+            # The only BPMN file cannot go, even if other file types remain
+            [{"file_type": "bpmn", "file_name": "diagram.bpmn"}, {"file_type": "json", "file_name": "form.json"}],
+            "diagram.bpmn",
+            "forbidden",
+            403,
+            id="rejects_only_bpmn",
+        ),
+        pytest.param(
+            [{"file_type": "bpmn", "file_name": "diagram.bpmn"}],
+            "nonexistent.json",
+            "not_found",
+            404,
+            id="not_found",
+        ),
+    ],
+)
+def test_delete_file_from_draft_template(
+    tenant_a_request,
+    user_tester: UserModel,
+    files: list[dict],
+    file_name: str,
+    expected_code: str | None,
+    expected_status: int | None,
+) -> None:
+    """Deleting a file drops its entry; the last file, the only BPMN and unknown files are rejected."""
+    template = _make_template(template_key="delete-file", files=files, is_published=False)
+    db.session.add(template)
+    db.session.flush()
+
+    if expected_code is None:
+        TemplateService.delete_file_from_template(template, file_name, user=user_tester)
+        assert [f["file_name"] for f in template.files] == ["diagram.bpmn"]
+    else:
+        with pytest.raises(ApiError) as exc_info:
+            TemplateService.delete_file_from_template(template, file_name, user=user_tester)
+        assert exc_info.value.error_code == expected_code
+        assert exc_info.value.status_code == expected_status
+
+
+def test_delete_file_from_published_creates_draft(tenant_a_request, user_tester: UserModel) -> None:
+    """Deleting file from published template should create a new draft version."""
+    template = TemplateModel(
+        template_key="published-del-file",
+        version="V1",
+        name="Published",
+        m8f_tenant_id="tenant-a",
+        files=[
+            {"file_type": "bpmn", "file_name": "diagram.bpmn"},
+            {"file_type": "json", "file_name": "form.json"},
+        ],
+        is_published=True,
+        created_by="tester",
+        modified_by="tester",
+    )
+    db.session.add(template)
+    db.session.flush()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+    # Should create a new draft version instead of raising
+    result = TemplateService.delete_file_from_template(template, "form.json", user=user_tester)
 
-            template = TemplateModel(
-                template_key="del-not-found",
-                version="V1",
-                name="Test",
-                m8f_tenant_id="tenant-a",
-                files=[{"file_type": "bpmn", "file_name": "diagram.bpmn"}],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
+    # Result should be a new draft version
+    assert result is not None
+    assert result.id != template.id
+    assert result.version == "V2"
+    assert result.is_published is False
+    assert result.template_key == "published-del-file"
+    # The file should be deleted from the new version
+    assert len(result.files) == 1
+    assert result.files[0]["file_name"] == "diagram.bpmn"
 
-            try:
-                TemplateService.delete_file_from_template(template, "nonexistent.json", user=user)
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "not_found"
-                assert e.status_code == 404
+    # Original published template should be unchanged
+    db.session.refresh(template)
+    assert len(template.files) == 2
+    assert template.is_published is True
 
 
 # ============================================================================
@@ -3355,115 +2283,70 @@ def test_delete_file_not_found() -> None:
 # ============================================================================
 
 
-def test_export_template_zip() -> None:
+def test_export_template_zip(tenant_a_request, user_tester: UserModel) -> None:
     """Export template as zip returns zip bytes and filename."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+    template = TemplateModel(
+        template_key="export-test",
+        version="V1",
+        name="Export Test",
+        m8f_tenant_id="tenant-a",
+        files=[
+            {"file_type": "bpmn", "file_name": "diagram.bpmn"},
+            {"file_type": "json", "file_name": "form.json"},
+        ],
+        is_published=False,
+        created_by="tester",
+        modified_by="tester",
+    )
+    db.session.add(template)
+    db.session.flush()
+    template_id = template.id
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
+    zip_bytes, filename = TemplateService.export_template_zip(template_id, user=user_tester)
 
-            template = TemplateModel(
-                template_key="export-test",
-                version="V1",
-                name="Export Test",
-                m8f_tenant_id="tenant-a",
-                files=[
-                    {"file_type": "bpmn", "file_name": "diagram.bpmn"},
-                    {"file_type": "json", "file_name": "form.json"},
-                ],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
+    assert isinstance(zip_bytes, bytes)
+    assert len(zip_bytes) > 0
+    assert "export-test" in filename
+    assert filename.endswith(".zip")
 
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                zip_bytes, filename = TemplateService.export_template_zip(template_id, user=user)
 
-            assert isinstance(zip_bytes, bytes)
-            assert len(zip_bytes) > 0
-            assert "export-test" in filename
-            assert filename.endswith(".zip")
+def test_iter_export_template_zip(tenant_a_request, user_tester: UserModel) -> None:
+    """Streaming export yields the storage chunks under the same filename as the bytes export."""
+    template_id = _insert_template(template_key="export-stream", is_published=False)
 
+    chunks, filename = TemplateService.iter_export_template_zip(template_id, user=user_tester)
 
-def test_export_template_zip_not_found() -> None:
-    """Should raise ApiError for non-existent template."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+    assert b"".join(chunks) == b"PK\x03\x04"
+    assert filename == "template-export-stream-V1.zip"
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
 
-            try:
-                TemplateService.export_template_zip(9999, user=user)
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "not_found"
-                assert e.status_code == 404
+def test_export_template_zip_not_found(tenant_a_request, user_tester: UserModel) -> None:
+    """Should raise ApiError for non-existent template."""
+    with pytest.raises(ApiError) as exc_info:
+        TemplateService.export_template_zip(9999, user=user_tester)
+    assert exc_info.value.error_code == "not_found"
+    assert exc_info.value.status_code == 404
 
 
-def test_export_template_zip_no_files() -> None:
+def test_export_template_zip_no_files(tenant_a_request, user_tester: UserModel) -> None:
     """Should raise ApiError when template has no files."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            template = TemplateModel(
-                template_key="no-files",
-                version="V1",
-                name="No Files",
-                m8f_tenant_id="tenant-a",
-                files=[],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-            template_id = template.id
+    template = TemplateModel(
+        template_key="no-files",
+        version="V1",
+        name="No Files",
+        m8f_tenant_id="tenant-a",
+        files=[],
+        is_published=False,
+        created_by="tester",
+        modified_by="tester",
+    )
+    db.session.add(template)
+    db.session.flush()
+    template_id = template.id
 
-            try:
-                TemplateService.export_template_zip(template_id, user=user)
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "not_found"
+    with pytest.raises(ApiError) as exc_info:
+        TemplateService.export_template_zip(template_id, user=user_tester)
+    assert exc_info.value.error_code == "not_found"
 
 
 # ============================================================================
@@ -3473,212 +2356,117 @@ def test_export_template_zip_no_files() -> None:
 
 def _create_zip_bytes(files: dict[str, bytes]) -> bytes:
     """Helper to create zip bytes from a dict of {filename: content}."""
-    import io as _io
-    import zipfile as _zipfile
-    buf = _io.BytesIO()
-    with _zipfile.ZipFile(buf, "w", _zipfile.ZIP_DEFLATED) as zf:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
         for name, content in files.items():
             zf.writestr(name, content)
     return buf.getvalue()
 
 
-def test_import_template_from_zip_valid() -> None:
+# Archives are immutable bytes; build them once instead of re-zipping in every test.
+_ZIP_VALID = _create_zip_bytes({
+    "diagram.bpmn": b"<bpmn>content</bpmn>",
+    "form.json": b'{"field": "value"}',
+})
+_ZIP_NO_BPMN = _create_zip_bytes({
+    "form.json": b'{"field": "value"}',
+    "readme.md": b"# Readme",
+})
+_ZIP_BPMN_ONLY = _create_zip_bytes({"diagram.bpmn": b"<bpmn/>"})
+
+
+def test_import_template_from_zip_valid(tenant_a_request, user_tester: UserModel) -> None:
     """Import a valid zip with BPMN and JSON files."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+    metadata = {
+        "template_key": "imported",
+        "name": "Imported Template",
+    }
+
+    template = TemplateService.import_template_from_zip(
+        zip_bytes=_ZIP_VALID,
+        metadata=metadata,
+        user=user_tester,
+        tenant_id="tenant-a",
+    )
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            zip_bytes = _create_zip_bytes({
-                "diagram.bpmn": b"<bpmn>content</bpmn>",
-                "form.json": b'{"field": "value"}',
-            })
-            metadata = {
-                "template_key": "imported",
-                "name": "Imported Template",
-            }
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                template = TemplateService.import_template_from_zip(
-                    zip_bytes=zip_bytes,
-                    metadata=metadata,
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-
-            assert template.template_key == "imported"
-            assert len(template.files) == 2
-            file_names = sorted(f["file_name"] for f in template.files)
-            assert file_names == ["diagram.bpmn", "form.json"]
-
-
-def test_import_template_from_zip_no_bpmn() -> None:
-    """Should raise ApiError when zip contains no BPMN file."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+    assert template.template_key == "imported"
+    assert len(template.files) == 2
+    file_names = sorted(f["file_name"] for f in template.files)
+    assert file_names == ["diagram.bpmn", "form.json"]
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            zip_bytes = _create_zip_bytes({
-                "form.json": b'{"field": "value"}',
-                "readme.md": b"# Readme",
-            })
-            metadata = {
-                "template_key": "no-bpmn-zip",
-                "name": "No BPMN",
-            }
-
-            try:
-                TemplateService.import_template_from_zip(
-                    zip_bytes=zip_bytes,
-                    metadata=metadata,
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "missing_fields"
-                assert e.status_code == 400
-
-
-def test_import_template_from_zip_requires_user() -> None:
-    """Should raise ApiError when user is None."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
+def test_import_template_from_zip_no_bpmn(tenant_a_request, user_tester: UserModel) -> None:
+    """Should raise ApiError when zip contains no BPMN file."""
+    metadata = {
+        "template_key": "no-bpmn-zip",
+        "name": "No BPMN",
+    }
+
+    with pytest.raises(ApiError) as exc_info:
+        TemplateService.import_template_from_zip(
+            zip_bytes=_ZIP_NO_BPMN,
+            metadata=metadata,
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+    assert exc_info.value.error_code == "missing_fields"
+    assert exc_info.value.status_code == 400
+
 
-            zip_bytes = _create_zip_bytes({"diagram.bpmn": b"<bpmn/>"})
-            try:
-                TemplateService.import_template_from_zip(
-                    zip_bytes=zip_bytes,
-                    metadata={"template_key": "test", "name": "Test"},
-                    user=None,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "unauthorized"
+def test_import_template_from_zip_requires_user(tenant_a_request) -> None:
+    """Should raise ApiError when user is None."""
+    tenant_a_request.user = None
+    with pytest.raises(ApiError) as exc_info:
+        TemplateService.import_template_from_zip(
+            zip_bytes=_ZIP_BPMN_ONLY,
+            metadata={"template_key": "test", "name": "Test"},
+            user=None,
+            tenant_id="tenant-a",
+        )
+    assert exc_info.value.error_code == "unauthorized"
 
 
-def test_import_template_from_zip_oversized_rejected() -> None:
+def test_import_template_from_zip_oversized_rejected(tenant_a_request, user_tester: UserModel) -> None:
     """Should raise ApiError when zip exceeds maximum size."""
-    from m8flow_backend.services.template_service import MAX_ZIP_SIZE
-
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
+    metadata = {
+        "template_key": "oversized",
+        "name": "Oversized",
+    }
+
+    # Shrink the limit below a real archive rather than allocating MAX_ZIP_SIZE + 1 bytes
+    with patch("m8flow_backend.services.template_service.MAX_ZIP_SIZE", len(_ZIP_BPMN_ONLY) - 1):
+        with pytest.raises(ApiError) as exc_info:
+            TemplateService.import_template_from_zip(
+                zip_bytes=_ZIP_BPMN_ONLY,
+                metadata=metadata,
+                user=user_tester,
+                tenant_id="tenant-a",
+            )
+    assert exc_info.value.error_code == "payload_too_large"
+    assert exc_info.value.status_code == 400
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            # Create oversized zip bytes (bigger than MAX_ZIP_SIZE)
-            oversized_bytes = b"x" * (MAX_ZIP_SIZE + 1)
-            metadata = {
-                "template_key": "oversized",
-                "name": "Oversized",
-            }
-
-            try:
-                TemplateService.import_template_from_zip(
-                    zip_bytes=oversized_bytes,
-                    metadata=metadata,
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "payload_too_large"
-                assert e.status_code == 400
-
-
-def test_import_template_from_zip_missing_fields() -> None:
-    """Should raise ApiError when required metadata fields are missing."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
 
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            zip_bytes = _create_zip_bytes({"diagram.bpmn": b"<bpmn/>"})
-
-            # Missing template_key
-            try:
-                TemplateService.import_template_from_zip(
-                    zip_bytes=zip_bytes,
-                    metadata={"name": "Test"},
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "missing_fields"
-
-            # Missing name
-            try:
-                TemplateService.import_template_from_zip(
-                    zip_bytes=zip_bytes,
-                    metadata={"template_key": "test"},
-                    user=user,
-                    tenant_id="tenant-a",
-                )
-                assert False, "Should have raised ApiError"
-            except ApiError as e:
-                assert e.error_code == "missing_fields"
+def test_import_template_from_zip_missing_fields(tenant_a_request, user_tester: UserModel) -> None:
+    """Should raise ApiError when required metadata fields are missing."""
+    # Missing template_key
+    with pytest.raises(ApiError) as exc_info:
+        TemplateService.import_template_from_zip(
+            zip_bytes=_ZIP_BPMN_ONLY,
+            metadata={"name": "Test"},
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+    assert exc_info.value.error_code == "missing_fields"
+
+    # Missing name
+    with pytest.raises(ApiError) as exc_info:
+        TemplateService.import_template_from_zip(
+            zip_bytes=_ZIP_BPMN_ONLY,
+            metadata={"template_key": "test"},
+            user=user_tester,
+            tenant_id="tenant-a",
+        )
+    assert exc_info.value.error_code == "missing_fields"
 
 
 # ============================================================================
@@ -3686,179 +2474,40 @@ def test_import_template_from_zip_missing_fields() -> None:
 # ============================================================================
 
 
-def test_list_templates_pagination_returns_correct_structure() -> None:
-    """list_templates returns (items, pagination) tuple with correct metadata."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-
-            # Create 5 templates
-            for i in range(5):
-                db.session.add(TemplateModel(
-                    template_key=f"page-test-{i}",
-                    version="V1",
-                    name=f"Template {i}",
-                    m8f_tenant_id="tenant-a",
-                    files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                    created_by="tester",
-                    modified_by="tester",
-                ))
-            db.session.commit()
-
-            # Page 1, 2 per page
-            items, pagination = TemplateService.list_templates(
-                user=user, tenant_id="tenant-a", latest_only=False, page=1, per_page=2
-            )
-            assert len(items) == 2
-            assert pagination["total"] == 5
-            assert pagination["count"] == 2
-            assert pagination["pages"] == 3
-
-            # Page 2
-            items2, pagination2 = TemplateService.list_templates(
-                user=user, tenant_id="tenant-a", latest_only=False, page=2, per_page=2
-            )
-            assert len(items2) == 2
-            assert pagination2["total"] == 5
-            assert pagination2["count"] == 2
-
-            # Page 3 (last page, partial)
-            items3, pagination3 = TemplateService.list_templates(
-                user=user, tenant_id="tenant-a", latest_only=False, page=3, per_page=2
-            )
-            assert len(items3) == 1
-            assert pagination3["total"] == 5
-            assert pagination3["count"] == 1
-
-
-def test_list_templates_pagination_clamps_page() -> None:
-    """Page value is clamped to valid range."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-
-            # Create 3 templates
-            for i in range(3):
-                db.session.add(TemplateModel(
-                    template_key=f"clamp-test-{i}",
-                    version="V1",
-                    name=f"Template {i}",
-                    m8f_tenant_id="tenant-a",
-                    files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                    created_by="tester",
-                    modified_by="tester",
-                ))
-            db.session.commit()
-
-            # Page beyond max should be clamped
-            items, pagination = TemplateService.list_templates(
-                user=user, tenant_id="tenant-a", latest_only=False, page=999, per_page=10
-            )
-            assert len(items) == 3  # All items on page 1 (clamped)
-            assert pagination["pages"] == 1
-
-            # Page 0 or negative should be clamped to 1
-            items_neg, pagination_neg = TemplateService.list_templates(
-                user=user, tenant_id="tenant-a", latest_only=False, page=0, per_page=2
-            )
-            assert len(items_neg) == 2
-            assert pagination_neg["total"] == 3
-
-
-def test_list_templates_pagination_per_page_clamped() -> None:
-    """per_page is clamped to 1..100."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-
-            for i in range(3):
-                db.session.add(TemplateModel(
-                    template_key=f"perpage-test-{i}",
-                    version="V1",
-                    name=f"Template {i}",
-                    m8f_tenant_id="tenant-a",
-                    files=[{"file_type": "bpmn", "file_name": "test.bpmn"}],
-                    created_by="tester",
-                    modified_by="tester",
-                ))
-            db.session.commit()
-
-            # per_page=0 should be clamped to 1
-            items, pagination = TemplateService.list_templates(
-                user=user, tenant_id="tenant-a", latest_only=False, page=1, per_page=0
-            )
-            assert len(items) == 1
-            assert pagination["pages"] == 3
-
-            # per_page=200 should be clamped to 100
-            items2, pagination2 = TemplateService.list_templates(
-                user=user, tenant_id="tenant-a", latest_only=False, page=1, per_page=200
-            )
-            assert len(items2) == 3  # All 3 fit within 100
-            assert pagination2["pages"] == 1
-
-
-def test_list_templates_pagination_empty_results() -> None:
-    """Pagination with no results."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-
-            items, pagination = TemplateService.list_templates(
-                user=user, tenant_id="tenant-a", latest_only=False, page=1, per_page=10
-            )
-            assert len(items) == 0
-            assert pagination["total"] == 0
-            assert pagination["count"] == 0
-            assert pagination["pages"] == 1
+@pytest.mark.parametrize(
+    ("seeded", "page", "per_page", "expected_count", "expected_total", "expected_pages"),
+    [
+        pytest.param(5, 1, 2, 2, 5, 3, id="first_page"),
+        pytest.param(5, 2, 2, 2, 5, 3, id="middle_page"),
+        pytest.param(5, 3, 2, 1, 5, 3, id="last_partial_page"),
+        pytest.param(3, 999, 10, 3, 3, 1, id="page_clamped_to_last"),
+        pytest.param(3, 0, 2, 2, 3, 2, id="page_clamped_to_first"),
+        pytest.param(3, 1, 0, 1, 3, 3, id="per_page_clamped_to_min"),
+        pytest.param(3, 1, 200, 3, 3, 1, id="per_page_clamped_to_max"),
+        pytest.param(0, 1, 10, 0, 0, 1, id="empty_results"),
+    ],
+)
+def test_list_templates_pagination(
+    tenant_a_request,
+    user_tester: UserModel,
+    seeded: int,
+    page: int,
+    per_page: int,
+    expected_count: int,
+    expected_total: int,
+    expected_pages: int,
+) -> None:
+    """list_templates returns (items, pagination) with page clamped to range and per_page to 1..100."""
+    if seeded:
+        _insert_templates(*({"template_key": f"page-test-{i}", "name": f"Template {i}"} for i in range(seeded)))
+
+    items, pagination = TemplateService.list_templates(
+        user=user_tester, tenant_id="tenant-a", latest_only=False, page=page, per_page=per_page
+    )
+    assert len(items) == expected_count
+    assert pagination["count"] == expected_count
+    assert pagination["total"] == expected_total
+    assert pagination["pages"] == expected_pages
 
 
 # ============================================================================
@@ -3868,18 +2517,15 @@ def test_list_templates_pagination_empty_results() -> None:
 
 def test_safe_content_disposition_simple_filename() -> None:
     """Simple filename is properly encoded."""
-    from m8flow_backend.routes.templates_controller import _safe_content_disposition
-
     result = _safe_content_disposition("diagram.bpmn")
     assert "Content-Disposition" in result
     assert "diagram.bpmn" in result["Content-Disposition"]
     assert result["Content-Disposition"].startswith("attachment;")
+    assert result["Content-Disposition"] == 'attachment; filename="diagram.bpmn"'
 
 
 def test_safe_content_disposition_special_chars() -> None:
     """Special characters are percent-encoded per RFC 5987."""
-    from m8flow_backend.routes.templates_controller import _safe_content_disposition
-
     result = _safe_content_disposition("my template (1).bpmn")
     header = result["Content-Disposition"]
     assert "filename*=UTF-8''" in header
@@ -3890,8 +2536,6 @@ def test_safe_content_disposition_special_chars() -> None:
 
 def test_safe_content_disposition_unicode() -> None:
     """Unicode filename is properly percent-encoded."""
-    from m8flow_backend.routes.templates_controller import _safe_content_disposition
-
     result = _safe_content_disposition("diagrama_\u00e9.bpmn")
     header = result["Content-Disposition"]
     assert "filename*=UTF-8''" in header
@@ -3904,182 +2548,67 @@ def test_safe_content_disposition_unicode() -> None:
 # ============================================================================
 
 
-def test_get_first_bpmn_content_returns_first_bpmn() -> None:
-    """get_first_bpmn_content returns the content of the first BPMN file in list order."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            # Files list has primary.bpmn FIRST, then secondary.bpmn
-            template = TemplateModel(
-                template_key="primary-first",
-                version="V1",
-                name="Primary First",
-                m8f_tenant_id="tenant-a",
-                files=[
-                    {"file_type": "bpmn", "file_name": "primary.bpmn"},
-                    {"file_type": "json", "file_name": "form.json"},
-                    {"file_type": "bpmn", "file_name": "secondary.bpmn"},
-                ],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-
-            class OrderAwareMockStorage:
-                """Returns different content for each BPMN file to verify ordering."""
-                def store_file(self, *a, **kw): pass
-                def get_file(self, tenant_id, template_key, version, file_name):
-                    if file_name == "primary.bpmn":
-                        return b"<bpmn>PRIMARY CONTENT</bpmn>"
-                    if file_name == "secondary.bpmn":
-                        return b"<bpmn>SECONDARY CONTENT</bpmn>"
-                    return b""
-                def list_files(self, *a, **kw): return []
-                def delete_file(self, *a, **kw): pass
-                def stream_zip(self, *a, **kw): return b""
-
-            with patch.object(TemplateService, "storage", OrderAwareMockStorage()):
-                content = TemplateService.get_first_bpmn_content(template)
-
-            assert content is not None
-            assert b"PRIMARY CONTENT" in content
-            assert b"SECONDARY" not in content
-
-
-def test_get_first_bpmn_content_skips_non_bpmn() -> None:
-    """get_first_bpmn_content skips non-BPMN files and returns the first BPMN."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            # JSON file first, then BPMN
-            template = TemplateModel(
-                template_key="json-first",
-                version="V1",
-                name="JSON First",
-                m8f_tenant_id="tenant-a",
-                files=[
-                    {"file_type": "json", "file_name": "form.json"},
-                    {"file_type": "bpmn", "file_name": "diagram.bpmn"},
-                ],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                content = TemplateService.get_first_bpmn_content(template)
-
-            assert content is not None
-
-
-def test_get_first_bpmn_content_no_bpmn_returns_none() -> None:
-    """get_first_bpmn_content returns None when no BPMN files exist."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            template = TemplateModel(
-                template_key="no-bpmn",
-                version="V1",
-                name="No BPMN",
-                m8f_tenant_id="tenant-a",
-                files=[
-                    {"file_type": "json", "file_name": "form.json"},
-                ],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                content = TemplateService.get_first_bpmn_content(template)
-
-            assert content is None
-
-
-def test_get_first_bpmn_content_empty_files() -> None:
-    """get_first_bpmn_content returns None when files list is empty."""
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    db.init_app(app)
-
-    with app.app_context():
-        db.create_all()
-        db.session.add(M8flowTenantModel(id="tenant-a", name="Tenant A", slug="tenant-a", created_by="test", modified_by="test"))
-        user = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
-        db.session.add(user)
-        db.session.commit()
-
-        with app.test_request_context("/"):
-            g.m8flow_tenant_id = "tenant-a"
-            g.user = user
-
-            template = TemplateModel(
-                template_key="empty-files",
-                version="V1",
-                name="Empty Files",
-                m8f_tenant_id="tenant-a",
-                files=[],
-                is_published=False,
-                created_by="tester",
-                modified_by="tester",
-            )
-            db.session.add(template)
-            db.session.commit()
-
-            with patch.object(TemplateService, "storage", MockTemplateStorageService()):
-                content = TemplateService.get_first_bpmn_content(template)
+class _ContentByNameStorage(MockTemplateStorageService):
+    """Returns distinct content per file name so tests can tell which BPMN was read."""
+
+    def get_file(self, tenant_id, template_key, version, file_name):
+        return f"<bpmn>{file_name}</bpmn>".encode()
+
+
+_BPMN = {"file_type": "bpmn"}
+_FORM_JSON = {"file_type": "json", "file_name": "form.json"}
+
+
+@pytest.mark.parametrize(
+    ("files", "expected_first", "expected_content"),
+    [
+        pytest.param(
+            [{**_BPMN, "file_name": "primary.bpmn"}, _FORM_JSON, {**_BPMN, "file_name": "secondary.bpmn"}],
+            "primary.bpmn",
+            b"<bpmn>primary.bpmn</bpmn>",
+            id="returns_first_bpmn",
+        ),
+        pytest.param(
+            [_FORM_JSON, {**_BPMN, "file_name": "diagram.bpmn"}],
+            "diagram.bpmn",
+            b"<bpmn>diagram.bpmn</bpmn>",
+            id="skips_non_bpmn",
+        ),
+        pytest.param([_FORM_JSON], None, None, id="no_bpmn"),
+        pytest.param([], None, None, id="empty_files"),
+    ],
+)
+def test_get_first_bpmn_content(
+    tenant_a_request,
+    files: list[dict],
+    expected_first: str | None,
+    expected_content: bytes | None,
+) -> None:
+    """get_first_bpmn_content reads the first BPMN in list order, or returns None without one."""
+    template = _make_template(template_key="first-bpmn", files=files, is_published=False)
+    db.session.add(template)
+    db.session.flush()
+
+    with patch.object(TemplateService, "storage", _ContentByNameStorage()):
+        content = TemplateService.get_first_bpmn_content(template)
+
+    assert template.first_bpmn_file_name == expected_first
+    assert content == expected_content
+
+
+def test_get_first_bpmn_content_legacy_row_scans_files(tenant_a_request) -> None:
+    """Rows without first_bpmn_file_name (inserted before the column existed) fall back to scanning files."""
+    template_id = _insert_template(
+        template_key="legacy-row",
+        files=[
+            {"file_type": "json", "file_name": "form.json"},
+            {"file_type": "bpmn", "file_name": "diagram.bpmn"},
+        ],
+    )
+    template = db.session.get(TemplateModel, template_id)
+    assert template.first_bpmn_file_name is None
 
-            assert content is None
+    assert TemplateService.get_first_bpmn_content(template) == b"<bpmn>mock content</bpmn>"
 
 
 # ---------------------------------------------------------------------------
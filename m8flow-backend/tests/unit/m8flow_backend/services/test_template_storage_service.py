@@ -1,8 +1,6 @@
 # m8flow-backend/tests/unit/m8flow_backend/services/test_template_storage_service.py
 import io
 import os
-import shutil
-import tempfile
 import zipfile
 
 import pytest
@@ -57,6 +55,13 @@ class TestFileTypeFromFilename:
     def test_dotfile(self) -> None:
         assert file_type_from_filename(".gitignore") == "other"
 
+    def test_dotfile_named_like_extension(self) -> None:
+        assert file_type_from_filename(".bpmn") == "other"
+        assert file_type_from_filename("templates/.bpmn") == "other"
+
+    def test_dot_in_directory_only(self) -> None:
+        assert file_type_from_filename("v1.bpmn/README") == "other"
+
     def test_multiple_dots(self) -> None:
         assert file_type_from_filename("my.diagram.bpmn") == "bpmn"
 
@@ -129,14 +134,12 @@ class TestSanitize:
 
 
 @pytest.fixture()
-def storage_app():
+def storage_app(tmp_path):
     """Create a Flask app with a temp directory for storage tests."""
     app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    tmpdir = tempfile.mkdtemp(prefix="test_storage_")
     app.config["TESTING"] = True
-    app.config["M8FLOW_TEMPLATES_STORAGE_DIR"] = tmpdir
-    yield app, tmpdir
-    shutil.rmtree(tmpdir, ignore_errors=True)
+    app.config["M8FLOW_TEMPLATES_STORAGE_DIR"] = str(tmp_path)
+    return app, str(tmp_path)
 
 
 class TestFilesystemStorageService:
@@ -164,6 +167,19 @@ class TestFilesystemStorageService:
                 svc.get_file("tenant-a", "nonexistent", "V1", "missing.bpmn")
             assert exc_info.value.status_code == 404
 
+    def test_file_path_points_at_stored_file(self, storage_app: tuple) -> None:
+        """file_path returns the path of the stored file and 404s for missing ones."""
+        app, _ = storage_app
+        svc = FilesystemTemplateStorageService()
+
+        with app.app_context():
+            svc.store_file("tenant-a", "tpl", "V1", "diagram.bpmn", "bpmn", b"<bpmn/>")
+            with open(svc.file_path("tenant-a", "tpl", "V1", "diagram.bpmn"), "rb") as fh:
+                assert fh.read() == b"<bpmn/>"
+            with pytest.raises(ApiError) as exc_info:
+                svc.file_path("tenant-a", "tpl", "V1", "missing.bpmn")
+            assert exc_info.value.status_code == 404
+
     def test_list_files_returns_correct_list(self, storage_app: tuple) -> None:
         """list_files returns correct file list for a version directory."""
         app, _ = storage_app
@@ -193,6 +209,22 @@ class TestFilesystemStorageService:
 
         assert files == []
 
+    def test_list_files_skips_dotfiles_and_directories(self, storage_app: tuple) -> None:
+        """list_files only reports regular, non-hidden files."""
+        app, tmpdir = storage_app
+        svc = FilesystemTemplateStorageService()
+
+        with app.app_context():
+            svc.store_file("tenant-a", "tpl", "V1", "diagram.bpmn", "bpmn", b"bpmn content")
+            vdir = os.path.join(tmpdir, "tenant-a", "tpl", "V1")
+            os.mkdir(os.path.join(vdir, "nested"))
+            with open(os.path.join(vdir, ".DS_Store"), "wb") as f:
+                f.write(b"noise")
+
+            files = svc.list_files("tenant-a", "tpl", "V1")
+
+        assert files == [{"file_name": "diagram.bpmn", "file_type": "bpmn"}]
+
     def test_delete_file_removes_from_storage(self, storage_app: tuple) -> None:
         """delete_file removes the file from storage."""
         app, _ = storage_app
@@ -218,6 +250,20 @@ class TestFilesystemStorageService:
             # Should not raise
             svc.delete_file("tenant-a", "tpl", "V1", "nonexistent.bpmn")
 
+    def test_delete_file_on_directory_is_silent(self, storage_app: tuple) -> None:
+        """delete_file leaves a same-named directory alone and does not raise."""
+        app, tmpdir = storage_app
+        svc = FilesystemTemplateStorageService()
+
+        with app.app_context():
+            svc.store_file("tenant-a", "tpl", "V1", "diagram.bpmn", "bpmn", b"bpmn content")
+            nested = os.path.join(tmpdir, "tenant-a", "tpl", "V1", "nested")
+            os.mkdir(nested)
+
+            svc.delete_file("tenant-a", "tpl", "V1", "nested")
+
+        assert os.path.isdir(nested)
+
     def test_stream_zip_creates_valid_zip(self, storage_app: tuple) -> None:
         """stream_zip creates a valid zip with the expected files."""
         app, _ = storage_app
@@ -271,6 +317,56 @@ class TestFilesystemStorageService:
         with zipfile.ZipFile(io.BytesIO(zip_bytes), "r") as zf:
             assert len(zf.namelist()) == 0
 
+    def test_iter_zip_yields_one_chunk_per_file(self, storage_app: tuple) -> None:
+        """iter_zip yields a chunk per stored file plus the central directory, and can be consumed later."""
+        app, _ = storage_app
+        svc = FilesystemTemplateStorageService()
+
+        with app.app_context():
+            svc.store_file("tenant-a", "tpl", "V1", "diagram.bpmn", "bpmn", b"bpmn data")
+            svc.store_file("tenant-a", "tpl", "V1", "form.json", "json", b'{"k":"v"}')
+
+            chunks = svc.iter_zip(
+                "tenant-a",
+                "tpl",
+                "V1",
+                [
+                    {"file_name": "diagram.bpmn", "file_type": "bpmn"},
+                    {"file_name": "missing.json", "file_type": "json"},
+                    {"file_name": "form.json", "file_type": "json"},
+                ],
+            )
+
+        # Consumed outside the app context, as a WSGI server would after the view returns.
+        parts = list(chunks)
+        assert len(parts) == 3
+        with zipfile.ZipFile(io.BytesIO(b"".join(parts)), "r") as zf:
+            assert zf.namelist() == ["diagram.bpmn", "form.json"]
+            assert zf.read("form.json") == b'{"k":"v"}'
+
+    def test_stream_zip_stores_already_compressed_entries(self, storage_app: tuple) -> None:
+        """stream_zip deflates text entries and stores already-compressed ones as-is."""
+        app, _ = storage_app
+        svc = FilesystemTemplateStorageService()
+
+        with app.app_context():
+            svc.store_file("tenant-a", "tpl", "V1", "diagram.bpmn", "bpmn", b"bpmn data")
+            svc.store_file("tenant-a", "tpl", "V1", "logo.PNG", "other", b"\x89PNG data")
+            svc.store_file("tenant-a", "tpl", "V1", "png", "other", b"no extension")
+
+            file_entries = [
+                {"file_name": "diagram.bpmn", "file_type": "bpmn"},
+                {"file_name": "logo.PNG", "file_type": "other"},
+                {"file_name": "png", "file_type": "other"},
+            ]
+            zip_bytes = svc.stream_zip("tenant-a", "tpl", "V1", file_entries)
+
+        with zipfile.ZipFile(io.BytesIO(zip_bytes), "r") as zf:
+            assert zf.getinfo("diagram.bpmn").compress_type == zipfile.ZIP_DEFLATED
+            assert zf.getinfo("logo.PNG").compress_type == zipfile.ZIP_STORED
+            assert zf.read("logo.PNG") == b"\x89PNG data"
+            assert zf.getinfo("png").compress_type == zipfile.ZIP_DEFLATED
+
     def test_store_file_creates_directories(self, storage_app: tuple) -> None:
         """store_file creates nested directories if they don't exist."""
         app, tmpdir = storage_app
@@ -314,6 +410,11 @@ class TestNoopStorageService:
         with pytest.raises(NotImplementedError):
             svc.get_file("t", "k", "v", "f")
 
+    def test_file_path_raises(self) -> None:
+        svc = NoopTemplateStorageService()
+        with pytest.raises(NotImplementedError):
+            svc.file_path("t", "k", "v", "f")
+
     def test_list_files_raises(self) -> None:
         svc = NoopTemplateStorageService()
         with pytest.raises(NotImplementedError):
@@ -328,3 +429,8 @@ class TestNoopStorageService:
         svc = NoopTemplateStorageService()
         with pytest.raises(NotImplementedError):
             svc.stream_zip("t", "k", "v", [])
+
+    def test_iter_zip_raises(self) -> None:
+        svc = NoopTemplateStorageService()
+        with pytest.raises(NotImplementedError):
+            svc.iter_zip("t", "k", "v", [])
@@ -6,6 +6,8 @@ from types import SimpleNamespace
 
 import pytest
 from flask import Flask, g
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import scoped_session
 
 from spiffworkflow_backend.exceptions.api_error import ApiError
 from spiffworkflow_backend.models.db import db
@@ -14,70 +16,101 @@ from m8flow_backend.services.tenant_identity_helpers import current_tenant_ident
 from m8flow_backend.services.tenant_context_middleware import (
     _is_tenant_context_exempt_request,
     resolve_request_tenant,
-    teardown_request_tenant_context,
 )
 
+_SEEDED_TENANTS = (
+    ("tenant-a", "Tenant A", "tenant-a"),
+    ("tenant-b", "Tenant B", "tenant-b"),
+    ("tenant-it-id", "Tenant IT", "it"),
+)
+_SEEDED_TENANT_IDS = tuple(tenant_id for tenant_id, _, _ in _SEEDED_TENANTS)
+_ORG_TENANT_ID = "bb768eda-e8cb-4452-9a49-acd2115db07c"
 
-def _make_app() -> Flask:
-    app = Flask(__name__)  # NOSONAR - unit test with in-memory DB, no HTTP/CSRF involved
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SQLALCHEMY_EXPIRE_ON_COMMIT"] = False
-    app.config["SPIFFWORKFLOW_BACKEND_DATABASE_TYPE"] = "sqlite"
-    app.config["SPIFFWORKFLOW_BACKEND_URL"] = "http://localhost"
-    app.config["SPIFFWORKFLOW_BACKEND_USE_AUTH_FOR_METRICS"] = False
-    app.config["SECRET_KEY"] = "test-secret"
 
-    db.init_app(app)
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
 
-    from m8flow_backend.canonical_db import set_canonical_db
-    set_canonical_db(db)
+
+def _seed_tenants() -> None:
+    from m8flow_backend.models.m8flow_tenant import M8flowTenantModel
+
+    now = int(datetime.now(timezone.utc).timestamp())
+    # Core executemany: the ORM listeners that stamp timestamps do not run, so pass them here.
+    db.session.execute(
+        insert(M8flowTenantModel),
+        [
+            {
+                "id": tenant_id,
+                "name": name,
+                "slug": slug,
+                "created_by": "test",
+                "modified_by": "test",
+                "created_at_in_seconds": now,
+                "updated_at_in_seconds": now,
+            }
+            for tenant_id, name, slug in _SEEDED_TENANTS
+        ],
+    )
+    db.session.commit()
 
 
+@pytest.fixture(scope="module")
+def _seeded_tenants_and_tester(tenant_middleware_app: Flask) -> int:
+    """Commit the shared tenants and the tester user once, outside the per-test rollback."""
+    from m8flow_backend.models.m8flow_tenant import M8flowTenantModel
+    from spiffworkflow_backend.models.user import UserModel
+
+    with tenant_middleware_app.app_context():
+        _seed_tenants()
+        tester = UserModel(username="tester", email="tester@example.com", service="local", service_id="tester")
+        db.session.add(tester)
+        db.session.commit()
+        tester_id = tester.id
+        db.session.remove()
+    yield tester_id
+    with tenant_middleware_app.app_context():
+        db.session.execute(delete(UserModel).where(UserModel.id == tester_id))
+        db.session.execute(delete(M8flowTenantModel).where(M8flowTenantModel.id.in_(_SEEDED_TENANT_IDS)))
+        db.session.commit()
+        db.session.remove()
+
+
+@pytest.fixture()
+def app(tenant_middleware_app: Flask, tenant_middleware_db_session: scoped_session, _seeded_tenants_and_tester: int) -> Flask:
+    """The shared middleware app with its app context pushed and changes rolled back after the test."""
+    from m8flow_backend.canonical_db import set_canonical_db
+    from m8flow_backend.startup.guard import BootPhase, set_phase
+
+    set_canonical_db(db)
     # satisfy railguard for unit tests
-    from m8flow_backend.startup.guard import set_phase, BootPhase
     set_phase(BootPhase.APP_CREATED)
-    
-    # Ensure ContextVar is reset between requests (including test_client requests).
-    app.teardown_request(teardown_request_tenant_context)
+    return tenant_middleware_app
 
-    # A simple endpoint so test_request_context has a route.
-    app.add_url_rule("/test", "test_endpoint", lambda: "ok")
-    app.add_url_rule("/v1.0/permissions-check", "permissions_check_endpoint", lambda: "ok")
-    return app
 
-def _seed_tenants() -> None:
+@pytest.fixture(scope="module")
+def tokens(tenant_middleware_app: Flask, _seeded_tenants_and_tester: int) -> dict[str, str]:
+    """The tester's bearer tokens keyed by ``m8flow_tenant_id`` claim, signed once per module."""
+    from spiffworkflow_backend.models.user import UserModel
+
+    with tenant_middleware_app.app_context():
+        tester = db.session.get(UserModel, _seeded_tenants_and_tester)
+        signed = {
+            tenant_id: tester.encode_auth_token({"m8flow_tenant_id": tenant_id})
+            for tenant_id in ("tenant-a", "tenant-b", "tenant-missing", _ORG_TENANT_ID)
+        }
+        db.session.remove()
+    return signed
+
+
+def _add_tenant(tenant_id: str, name: str, slug: str) -> None:
     from m8flow_backend.models.m8flow_tenant import M8flowTenantModel
 
     now = int(datetime.now(timezone.utc).timestamp())
-
-    db.session.add(
-        M8flowTenantModel(
-            id="tenant-a",
-            name="Tenant A",
-            slug="tenant-a",
-            created_by="test",
-            modified_by="test",
-            created_at_in_seconds=now,
-            updated_at_in_seconds=now,
-        )
-    )
-    db.session.add(
-        M8flowTenantModel(
-            id="tenant-b",
-            name="Tenant B",
-            slug="tenant-b",
-            created_by="test",
-            modified_by="test",
-            created_at_in_seconds=now,
-            updated_at_in_seconds=now,
-        )
-    )
-    db.session.add(
-        M8flowTenantModel(
-            id="tenant-it-id",
-            name="Tenant IT",
-            slug="it",
+    db.session.execute(
+        insert(M8flowTenantModel).values(
+            id=tenant_id,
+            name=name,
+            slug=slug,
             created_by="test",
             modified_by="test",
             created_at_in_seconds=now,
@@ -87,219 +120,156 @@ def _seed_tenants() -> None:
     db.session.commit()
 
 
-def test_resolves_tenant_from_jwt_claim() -> None:
-    from spiffworkflow_backend.models.user import UserModel
-
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-
-        user = UserModel(
-            username="tester",
-            email="tester@example.com",
-            service="local",
-            service_id="tester",
-        )
-        db.session.add(user)
-        db.session.flush()
+def test_resolves_tenant_from_jwt_claim(app: Flask, tokens: dict[str, str]) -> None:
+    token = tokens["tenant-b"]
 
-        token = user.encode_auth_token({"m8flow_tenant_id": "tenant-b"})
-        db.session.commit()
-
-        with app.test_request_context("/test", headers={"Authorization": f"Bearer {token}"}):
-            resolve_request_tenant()
-            assert g.m8flow_tenant_id == "tenant-b"
+    with app.test_request_context("/test", headers=_auth(token)):
+        resolve_request_tenant()
+        assert g.m8flow_tenant_id == "tenant-b"
 
 
-def test_missing_tenant_raises_by_default() -> None:
+def test_missing_tenant_raises_by_default(app: Flask) -> None:
     from unittest.mock import patch
-    
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-
-        with app.test_request_context("/test"):
-            # Mock should_disable_auth_for_request to return True so that
-            # the fallback to _authentication_identifier() is skipped
-            with patch(
-                "m8flow_backend.services.tenant_context_middleware.AuthorizationService"
-            ) as mock_auth:
-                mock_auth.should_disable_auth_for_request.return_value = True
-                with pytest.raises(ApiError) as exc:
-                    resolve_request_tenant()
-                assert exc.value.error_code == "tenant_required"
-
-
-def test_missing_tenant_still_raises_on_protected_request() -> None:
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
 
-        with app.test_request_context("/test"):
+    with app.test_request_context("/test"):
+        # Mock should_disable_auth_for_request to return True so that
+        # the fallback to _authentication_identifier() is skipped
+        with patch(
+            "m8flow_backend.services.tenant_context_middleware.AuthorizationService"
+        ) as mock_auth:
+            mock_auth.should_disable_auth_for_request.return_value = True
             with pytest.raises(ApiError) as exc:
                 resolve_request_tenant()
             assert exc.value.error_code == "tenant_required"
 
 
-def test_missing_tenant_keeps_exempt_request_public() -> None:
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
+def test_missing_tenant_still_raises_on_protected_request(app: Flask) -> None:
+    with app.test_request_context("/test"):
+        with pytest.raises(ApiError) as exc:
+            resolve_request_tenant()
+        assert exc.value.error_code == "tenant_required"
+
+
+def test_missing_tenant_keeps_exempt_request_public(app: Flask) -> None:
+    with app.test_request_context("/v1.0/status"):
+        resolve_request_tenant()
+        assert getattr(g, "m8flow_tenant_id", None) is None
+        assert getattr(g, "_m8flow_public_request", False) is True
 
-        with app.test_request_context("/v1.0/status"):
+
+def test_invalid_tenant_raises(app: Flask, tokens: dict[str, str]) -> None:
+    token = tokens["tenant-missing"]
+
+    with app.test_request_context("/test", headers=_auth(token)):
+        with pytest.raises(ApiError) as exc:
             resolve_request_tenant()
-            assert getattr(g, "m8flow_tenant_id", None) is None
-            assert getattr(g, "_m8flow_public_request", False) is True
+        assert exc.value.error_code == "invalid_tenant"
 
 
-def test_invalid_tenant_raises() -> None:
+def test_org_uuid_claim_maps_to_legacy_local_tenant_row(app: Flask) -> None:
     from spiffworkflow_backend.models.user import UserModel
 
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-
-        user = UserModel(
-            username="tester",
-            email="tester@example.com",
-            service="local",
-            service_id="tester",
-        )
-        db.session.add(user)
-        db.session.flush()
+    _add_tenant("m8flow", "M8Flow Realm", "m8flow")
 
-        token = user.encode_auth_token({"m8flow_tenant_id": "tenant-missing"})
-        db.session.commit()
+    user = UserModel(
+        username="realm-tester",
+        email="realm-tester@example.com",
+        service="http://localhost:7002/realms/m8flow",
+        service_id="tester",
+    )
+    db.session.add(user)
+    db.session.commit()
 
-        with app.test_request_context("/test", headers={"Authorization": f"Bearer {token}"}):
-            with pytest.raises(ApiError) as exc:
-                resolve_request_tenant()
-            assert exc.value.error_code == "invalid_tenant"
+    token = user.encode_auth_token(
+        {
+            "organization": {
+                "m8flow": {
+                    "id": "370465d2-9b78-4c8b-9d82-c9a4818b747f",
+                }
+            },
+            "m8flow_authentication_identifier": "m8flow",
+        }
+    )
 
+    with app.test_request_context("/test", headers=_auth(token)):
+        resolve_request_tenant()
+        assert g.m8flow_tenant_id == "m8flow"
 
-def test_org_uuid_claim_maps_to_legacy_local_tenant_row() -> None:
-    from m8flow_backend.models.m8flow_tenant import M8flowTenantModel
-    from spiffworkflow_backend.models.user import UserModel
 
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
+class _UnboundTenantQuery:
+    """Stands in for a query on a model the SQLAlchemy instance does not know about."""
 
-        now = int(datetime.now(timezone.utc).timestamp())
-        db.session.add(
-            M8flowTenantModel(
-                id="m8flow",
-                name="M8Flow Realm",
-                slug="m8flow",
-                created_by="test",
-                modified_by="test",
-                created_at_in_seconds=now,
-                updated_at_in_seconds=now,
-            )
-        )
+    def _raise(self, *_args, **_kwargs):
+        raise RuntimeError("M8flowTenantModel is not registered with this 'SQLAlchemy' instance.")
 
-        user = UserModel(
-            username="tester",
-            email="tester@example.com",
-            service="http://localhost:7002/realms/m8flow",
-            service_id="tester",
-        )
-        db.session.add(user)
-        db.session.flush()
+    all = filter = _raise
 
-        token = user.encode_auth_token(
-            {
-                "organization": {
-                    "m8flow": {
-                        "id": "370465d2-9b78-4c8b-9d82-c9a4818b747f",
-                    }
-                },
-                "m8flow_authentication_identifier": "m8flow",
-            }
-        )
-        db.session.commit()
 
-        with app.test_request_context("/test", headers={"Authorization": f"Bearer {token}"}):
-            resolve_request_tenant()
-            assert g.m8flow_tenant_id == "m8flow"
+class _UnboundDb:
+    session = SimpleNamespace(query=lambda *_args, **_kwargs: _UnboundTenantQuery())
 
 
-def test_tenant_validation_raises_503_when_db_not_bound() -> None:
+def test_tenant_validation_raises_503_when_db_not_bound(app: Flask, tokens: dict[str, str]) -> None:
     """When db session raises 'not registered with this SQLAlchemy instance', raise 503 instead of failing open."""
-    from unittest.mock import MagicMock
-
     from m8flow_backend.canonical_db import get_canonical_db, set_canonical_db
-    from spiffworkflow_backend.models.user import UserModel
 
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
+    token = tokens["tenant-a"]
 
-        user = UserModel(
-            username="tester",
-            email="tester@example.com",
-            service="local",
-            service_id="tester",
-        )
-        db.session.add(user)
-        db.session.flush()
-        token = user.encode_auth_token({"m8flow_tenant_id": "tenant-a"})
-        db.session.commit()
+    prev = get_canonical_db()
+    set_canonical_db(_UnboundDb())
+    try:
+        with app.test_request_context("/test", headers=_auth(token)):
+            with pytest.raises(ApiError) as exc:
+                resolve_request_tenant()
+            assert exc.value.error_code == "service_unavailable"
+            assert exc.value.status_code == 503
+    finally:
+        set_canonical_db(prev)
 
-        runtime_error = RuntimeError(
-            "M8flowTenantModel is not registered with this 'SQLAlchemy' instance."
-        )
-        mock_db = MagicMock()
-        mock_db.session.query.return_value.filter.return_value.one_or_none.side_effect = (
-            runtime_error
-        )
-        prev = get_canonical_db()
-        set_canonical_db(mock_db)
-        try:
-            with app.test_request_context("/test", headers={"Authorization": f"Bearer {token}"}):
-                with pytest.raises(ApiError) as exc:
-                    resolve_request_tenant()
-                assert exc.value.error_code == "service_unavailable"
-                assert exc.value.status_code == 503
-        finally:
-            set_canonical_db(prev)
-
-
-def test_tenant_override_forbidden() -> None:
-    from spiffworkflow_backend.models.user import UserModel
 
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
+def test_tenant_validation_is_cached_until_a_tenant_is_written(app: Flask, tokens: dict[str, str]) -> None:
+    from sqlalchemy import event
 
-        user = UserModel(
-            username="tester",
-            email="tester@example.com",
-            service="local",
-            service_id="tester",
-        )
-        db.session.add(user)
-        db.session.flush()
+    from m8flow_backend.models.m8flow_tenant import M8flowTenantModel
+    from m8flow_backend.services import tenant_context_middleware as middleware
 
-        token = user.encode_auth_token({"m8flow_tenant_id": "tenant-b"})
-        db.session.commit()
+    tenant_selects: list[str] = []
 
-        with app.test_request_context("/test", headers={"Authorization": f"Bearer {token}"}):
-            g.m8flow_tenant_id = "tenant-a"
-            with pytest.raises(ApiError) as exc:
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        if "FROM m8flow_tenant" in statement:
+            tenant_selects.append(statement)
+
+    connection = db.session.connection()
+    event.listen(connection, "before_cursor_execute", _record)
+    try:
+        for _ in range(2):
+            with app.test_request_context("/test", headers=_auth(tokens["tenant-b"])):
                 resolve_request_tenant()
-            assert exc.value.error_code == "tenant_override_forbidden"
+                assert g.m8flow_tenant_id == "tenant-b"
+        assert len(tenant_selects) == 1
+
+        db.session.add(
+            M8flowTenantModel(id="tenant-c", name="Tenant C", slug="tenant-c-slug", created_by="test", modified_by="test")
+        )
+        db.session.commit()
+        assert middleware._canonical_tenant_id(db, "tenant-c-slug") == "tenant-c"
+        assert middleware._canonical_tenant_id(db, "tenant-b") == "tenant-b"
+        assert len(tenant_selects) == 2
+    finally:
+        event.remove(connection, "before_cursor_execute", _record)
+
 
+def test_tenant_override_forbidden(app: Flask, tokens: dict[str, str]) -> None:
+    token = tokens["tenant-b"]
 
-def test_tenant_context_propagates_to_queries(monkeypatch) -> None:
+    with app.test_request_context("/test", headers=_auth(token)):
+        g.m8flow_tenant_id = "tenant-a"
+        with pytest.raises(ApiError) as exc:
+            resolve_request_tenant()
+        assert exc.value.error_code == "tenant_override_forbidden"
+
+
+def test_tenant_context_propagates_to_queries(app: Flask, tokens: dict[str, str], monkeypatch) -> None:
     from m8flow_backend.models.tenant_scoped import M8fTenantScopedMixin, TenantScoped
     from m8flow_backend.services import tenant_scoping_patch
 
@@ -318,132 +288,68 @@ def test_tenant_context_propagates_to_queries(monkeypatch) -> None:
         id = db.Column(db.Integer, primary_key=True)
         name = db.Column(db.String(50), nullable=False)
 
-    app = _make_app()
+    TestItem.__table__.create(db.session.connection())
 
-    # Exercise the real lifecycle (including teardown_request reset of ContextVar)
-    @app.get("/add/<name>")
-    def _add(name: str) -> str:
-        resolve_request_tenant()
-        db.session.add(TestItem(name=name))
-        db.session.commit()
-        return "ok"
-
-    @app.get("/list")
-    def _list() -> str:
-        resolve_request_tenant()
-        rows = TestItem.query.order_by(TestItem.name).all()
-        return ",".join([r.name for r in rows])
-
-    with app.app_context():
-        from spiffworkflow_backend.models.user import UserModel
-
-        db.drop_all()
-        db.create_all()
-        _seed_tenants()
-
-        user = UserModel(
-            username="tester",
-            email="tester@example.com",
-            service="local",
-            service_id="tester",
-        )
-        db.session.add(user)
-        db.session.flush()
-
-        token_tenant_a = user.encode_auth_token({"m8flow_tenant_id": "tenant-a"})
-        token_tenant_b = user.encode_auth_token({"m8flow_tenant_id": "tenant-b"})
-        db.session.commit()
-
-    client = app.test_client()
+    # Each request context runs the real teardown_request reset of the ContextVar when it pops.
+    def _add(name: str, token: str) -> None:
+        with app.test_request_context("/test", headers=_auth(token)):
+            resolve_request_tenant()
+            db.session.add(TestItem(name=name))
+            db.session.commit()
 
-    client.get("/add/A", headers={"Authorization": f"Bearer {token_tenant_a}"})
-    client.get("/add/B", headers={"Authorization": f"Bearer {token_tenant_b}"})
+    _add("A", tokens["tenant-a"])
+    _add("B", tokens["tenant-b"])
 
-    resp = client.get("/list", headers={"Authorization": f"Bearer {token_tenant_a}"})
-    assert resp.get_data(as_text=True) == "A"
+    with app.test_request_context("/test", headers=_auth(tokens["tenant-a"])):
+        resolve_request_tenant()
+        # Column-only selects still go through the ORM, so the tenant loader criteria apply.
+        assert db.session.scalars(select(TestItem.name).order_by(TestItem.name)).all() == ["A"]
 
 
-def test_login_return_path_is_not_tenant_context_exempt_by_prefix_collision() -> None:
-    app = _make_app()
-    with app.test_request_context("/v1.0/login_return"):
+def test_login_return_path_is_not_tenant_context_exempt_by_prefix_collision(tenant_middleware_app: Flask) -> None:
+    with tenant_middleware_app.test_request_context("/v1.0/login_return"):
         assert _is_tenant_context_exempt_request() is False
 
 
-def test_global_tenant_management_path_is_tenant_context_exempt() -> None:
-    app = _make_app()
-    with app.test_request_context("/v1.0/m8flow/tenants/tenant-a"):
+def test_global_tenant_management_path_is_tenant_context_exempt(tenant_middleware_app: Flask) -> None:
+    with tenant_middleware_app.test_request_context("/v1.0/m8flow/tenants/tenant-a"):
         assert _is_tenant_context_exempt_request() is True
 
 
-def test_organization_memberships_path_is_tenant_context_exempt() -> None:
-    app = _make_app()
-    with app.test_request_context("/v1.0/m8flow/organization-memberships"):
+def test_organization_memberships_path_is_tenant_context_exempt(tenant_middleware_app: Flask) -> None:
+    with tenant_middleware_app.test_request_context("/v1.0/m8flow/organization-memberships"):
         assert _is_tenant_context_exempt_request() is True
 
 
-def test_permissions_check_path_is_not_tenant_context_exempt() -> None:
-    app = _make_app()
-    with app.test_request_context("/v1.0/permissions-check"):
+def test_permissions_check_path_is_not_tenant_context_exempt(tenant_middleware_app: Flask) -> None:
+    with tenant_middleware_app.test_request_context("/v1.0/permissions-check"):
         assert _is_tenant_context_exempt_request() is False
 
 
-def test_resolves_tenant_from_jwt_claim_on_permissions_check_path(monkeypatch) -> None:
-    from m8flow_backend.models.m8flow_tenant import M8flowTenantModel
-    from spiffworkflow_backend.models.user import UserModel
-
-    app = _make_app()
-    org_tenant_id = "bb768eda-e8cb-4452-9a49-acd2115db07c"
+def test_resolves_tenant_from_jwt_claim_on_permissions_check_path(app: Flask, tokens: dict[str, str], monkeypatch) -> None:
+    org_tenant_id = _ORG_TENANT_ID
 
     monkeypatch.setattr(
         "m8flow_backend.services.tenant_context_middleware._tenant_from_context_var",
         lambda: None,
     )
 
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-        now = int(datetime.now(timezone.utc).timestamp())
-        db.session.add(
-            M8flowTenantModel(
-                id=org_tenant_id,
-                name="Org Tenant",
-                slug="org-tenant",
-                created_by="test",
-                modified_by="test",
-                created_at_in_seconds=now,
-                updated_at_in_seconds=now,
-            )
-        )
-
-        user = UserModel(
-            username="tester",
-            email="tester@example.com",
-            service="local",
-            service_id="tester",
-        )
-        db.session.add(user)
-        db.session.flush()
-
-        token = user.encode_auth_token({"m8flow_tenant_id": org_tenant_id})
-        db.session.commit()
-
-        with app.test_request_context(
-            "/v1.0/permissions-check",
-            headers={"Authorization": f"Bearer {token}"},
-        ):
-            resolve_request_tenant()
+    _add_tenant(org_tenant_id, "Org Tenant", "org-tenant")
+    token = tokens[org_tenant_id]
 
-            assert current_tenant_id_or_none() == org_tenant_id
-            assert g.m8flow_tenant_id == org_tenant_id
-            assert org_tenant_id in current_tenant_identifiers(org_tenant_id)
+    with app.test_request_context(
+        "/v1.0/permissions-check",
+        headers=_auth(token),
+    ):
+        resolve_request_tenant()
 
+        assert current_tenant_id_or_none() == org_tenant_id
+        assert g.m8flow_tenant_id == org_tenant_id
+        assert org_tenant_id in current_tenant_identifiers(org_tenant_id)
 
-def test_resolves_tenant_from_jwt_claim_on_status_path(monkeypatch) -> None:
-    from m8flow_backend.models.m8flow_tenant import M8flowTenantModel
-    from spiffworkflow_backend.models.user import UserModel
 
-    app = _make_app()
-    org_tenant_id = "bb768eda-e8cb-4452-9a49-acd2115db07c"
+def test_resolves_tenant_from_jwt_claim_on_status_path(app: Flask, tokens: dict[str, str], monkeypatch) -> None:
+    org_tenant_id = _ORG_TENANT_ID
     stale_placeholder_tenant_id = "default"
 
     monkeypatch.setattr(
@@ -451,51 +357,24 @@ def test_resolves_tenant_from_jwt_claim_on_status_path(monkeypatch) -> None:
         lambda: stale_placeholder_tenant_id,
     )
 
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-        now = int(datetime.now(timezone.utc).timestamp())
-        db.session.add(
-            M8flowTenantModel(
-                id=org_tenant_id,
-                name="Org Tenant",
-                slug="org-tenant",
-                created_by="test",
-                modified_by="test",
-                created_at_in_seconds=now,
-                updated_at_in_seconds=now,
-            )
-        )
+    _add_tenant(org_tenant_id, "Org Tenant", "org-tenant")
+    token = tokens[org_tenant_id]
 
-        user = UserModel(
-            username="tester",
-            email="tester@example.com",
-            service="local",
-            service_id="tester",
-        )
-        db.session.add(user)
-        db.session.flush()
-
-        token = user.encode_auth_token({"m8flow_tenant_id": org_tenant_id})
-        db.session.commit()
-
-        with app.test_request_context("/v1.0/status", headers={"Authorization": f"Bearer {token}"}):
-            g.m8flow_tenant_id = stale_placeholder_tenant_id
-            resolve_request_tenant()
+    with app.test_request_context("/v1.0/status", headers=_auth(token)):
+        g.m8flow_tenant_id = stale_placeholder_tenant_id
+        resolve_request_tenant()
 
-            assert current_tenant_id_or_none() == org_tenant_id
-            assert g.m8flow_tenant_id == org_tenant_id
-            assert org_tenant_id in current_tenant_identifiers(org_tenant_id)
+        assert current_tenant_id_or_none() == org_tenant_id
+        assert g.m8flow_tenant_id == org_tenant_id
+        assert org_tenant_id in current_tenant_identifiers(org_tenant_id)
 
 
-def test_resolves_tenant_from_jwt_claim_on_status_path_without_auth_realm_lookup(monkeypatch) -> None:
+def test_resolves_tenant_from_jwt_claim_on_status_path_without_auth_realm_lookup(app: Flask, monkeypatch) -> None:
     import jwt
 
-    from m8flow_backend.models.m8flow_tenant import M8flowTenantModel
     from spiffworkflow_backend.services.authentication_service import AuthenticationService
 
-    app = _make_app()
-    org_tenant_id = "bb768eda-e8cb-4452-9a49-acd2115db07c"
+    org_tenant_id = _ORG_TENANT_ID
     stale_placeholder_tenant_id = "default"
 
     monkeypatch.setattr(
@@ -508,80 +387,57 @@ def test_resolves_tenant_from_jwt_claim_on_status_path_without_auth_realm_lookup
         lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("parse_jwt_token should not be called")),
     )
 
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-        now = int(datetime.now(timezone.utc).timestamp())
-        db.session.add(
-            M8flowTenantModel(
-                id=org_tenant_id,
-                name="Org Tenant",
-                slug="org-tenant",
-                created_by="test",
-                modified_by="test",
-                created_at_in_seconds=now,
-                updated_at_in_seconds=now,
-            )
-        )
-        db.session.commit()
+    _add_tenant(org_tenant_id, "Org Tenant", "org-tenant")
 
-        token = jwt.encode(
-            {
-                "iss": "http://localhost:7002/realms/shared-users",
-                "m8flow_tenant_id": org_tenant_id,
-            },
-            "test-secret",
-            algorithm="HS256",
-        )
+    token = jwt.encode(
+        {
+            "iss": "http://localhost:7002/realms/shared-users",
+            "m8flow_tenant_id": org_tenant_id,
+        },
+        "test-secret",
+        algorithm="HS256",
+    )
 
-        with app.test_request_context("/v1.0/status", headers={"Authorization": f"Bearer {token}"}):
-            resolve_request_tenant()
+    with app.test_request_context("/v1.0/status", headers=_auth(token)):
+        resolve_request_tenant()
 
-            assert current_tenant_id_or_none() == org_tenant_id
-            assert g.m8flow_tenant_id == org_tenant_id
-            assert org_tenant_id in current_tenant_identifiers(org_tenant_id)
+        assert current_tenant_id_or_none() == org_tenant_id
+        assert g.m8flow_tenant_id == org_tenant_id
+        assert org_tenant_id in current_tenant_identifiers(org_tenant_id)
 
 
-def test_protected_request_without_tenant_claim_does_not_fall_back_to_default_auth_identifier(monkeypatch) -> None:
+def test_protected_request_without_tenant_claim_does_not_fall_back_to_default_auth_identifier(app: Flask, monkeypatch) -> None:
     import jwt
 
     from spiffworkflow_backend.services.authentication_service import AuthenticationService
 
-    app = _make_app()
-
     monkeypatch.setattr(
         AuthenticationService,
         "parse_jwt_token",
         lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("parse_jwt_token should not be called")),
     )
 
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-
-        token = jwt.encode(
-            {
-                "iss": "http://localhost:7002/realms/shared-users",
-                "preferred_username": "editor",
-            },
-            "test-secret",
-            algorithm="HS256",
-        )
+    token = jwt.encode(
+        {
+            "iss": "http://localhost:7002/realms/shared-users",
+            "preferred_username": "editor",
+        },
+        "test-secret",
+        algorithm="HS256",
+    )
 
-        with app.test_request_context("/test", headers={"Authorization": f"Bearer {token}"}):
-            with pytest.raises(ApiError) as exc:
-                resolve_request_tenant()
+    with app.test_request_context("/test", headers=_auth(token)):
+        with pytest.raises(ApiError) as exc:
+            resolve_request_tenant()
 
-            assert exc.value.error_code == "tenant_required"
+        assert exc.value.error_code == "tenant_required"
 
 
-def test_selected_tenant_cookie_overrides_explicit_token_tenant_for_shared_realm_multi_org_status(monkeypatch) -> None:
+def test_selected_tenant_cookie_overrides_explicit_token_tenant_for_shared_realm_multi_org_status(app: Flask, monkeypatch) -> None:
     import jwt
 
     from spiffworkflow_backend.services.authentication_service import AuthenticationService
 
-    app = _make_app()
-
     monkeypatch.setenv("M8FLOW_KEYCLOAK_SHARED_REALM", "m8flow")
     monkeypatch.setattr(
         AuthenticationService,
@@ -589,40 +445,34 @@ def test_selected_tenant_cookie_overrides_explicit_token_tenant_for_shared_realm
         lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("parse_jwt_token should not be called")),
     )
 
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-
-        token = jwt.encode(
-            {
-                "iss": "http://localhost:7002/realms/m8flow",
-                "m8flow_authentication_identifier": "m8flow",
-                "m8flow_tenant_id": "tenant-a",
-                "m8flow_tenant_alias": "tenant-a",
-                "organization": {
-                    "tenant-a": {"id": "tenant-a"},
-                    "it": {"id": "tenant-it-id"},
-                },
+    token = jwt.encode(
+        {
+            "iss": "http://localhost:7002/realms/m8flow",
+            "m8flow_authentication_identifier": "m8flow",
+            "m8flow_tenant_id": "tenant-a",
+            "m8flow_tenant_alias": "tenant-a",
+            "organization": {
+                "tenant-a": {"id": "tenant-a"},
+                "it": {"id": "tenant-it-id"},
             },
-            "test-secret",
-            algorithm="HS256",
-        )
-
-        with app.test_request_context(
-            "/v1.0/status",
-            headers={"Authorization": f"Bearer {token}"},
-            environ_base={"HTTP_COOKIE": "authentication_identifier=m8flow; m8flow_selected_tenant=tenant-it-id"},
-        ):
-            resolve_request_tenant()
+        },
+        "test-secret",
+        algorithm="HS256",
+    )
 
-            assert current_tenant_id_or_none() == "tenant-it-id"
-            assert g.m8flow_tenant_id == "tenant-it-id"
-            assert "tenant-it-id" in current_tenant_identifiers("tenant-it-id")
+    with app.test_request_context(
+        "/v1.0/status",
+        headers=_auth(token),
+        environ_base={"HTTP_COOKIE": "authentication_identifier=m8flow; m8flow_selected_tenant=tenant-it-id"},
+    ):
+        resolve_request_tenant()
 
+        assert current_tenant_id_or_none() == "tenant-it-id"
+        assert g.m8flow_tenant_id == "tenant-it-id"
+        assert "tenant-it-id" in current_tenant_identifiers("tenant-it-id")
 
-def test_resolves_tenant_from_request_header_when_user_belongs(monkeypatch) -> None:
-    app = _make_app()
 
+def test_resolves_tenant_from_request_header_when_user_belongs(app: Flask, monkeypatch) -> None:
     monkeypatch.setattr(
         "m8flow_backend.services.tenant_context_middleware._tenant_from_jwt_claim_cached",
         lambda *, allow_decode: None,
@@ -636,32 +486,26 @@ def test_resolves_tenant_from_request_header_when_user_belongs(monkeypatch) -> N
         SimpleNamespace(should_disable_auth_for_request=lambda: False),
     )
 
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-
-        user = SimpleNamespace(
-            id=7,
-            username="admin",
-            service="http://localhost:7002/realms/shared-users",
-            groups=[SimpleNamespace(identifier="tenant-a:tenant-admin")],
-        )
-
-        with app.test_request_context(
-            "/test",
-            headers={"x-m8flow-tenant-id": "tenant-a"},
-        ):
-            g.user = user
-            resolve_request_tenant()
+    user = SimpleNamespace(
+        id=7,
+        username="admin",
+        service="http://localhost:7002/realms/shared-users",
+        groups=[SimpleNamespace(identifier="tenant-a:tenant-admin")],
+    )
 
-            assert g.m8flow_tenant_id == "tenant-a"
-            assert current_tenant_id_or_none() == "tenant-a"
-            assert "tenant-a" in current_tenant_identifiers(g.m8flow_tenant_id)
+    with app.test_request_context(
+        "/test",
+        headers={"x-m8flow-tenant-id": "tenant-a"},
+    ):
+        g.user = user
+        resolve_request_tenant()
 
+        assert g.m8flow_tenant_id == "tenant-a"
+        assert current_tenant_id_or_none() == "tenant-a"
+        assert "tenant-a" in current_tenant_identifiers(g.m8flow_tenant_id)
 
-def test_rejects_tenant_header_when_user_not_member(monkeypatch) -> None:
-    app = _make_app()
 
+def test_rejects_tenant_header_when_user_not_member(app: Flask, monkeypatch) -> None:
     monkeypatch.setattr(
         "m8flow_backend.services.tenant_context_middleware._tenant_from_jwt_claim_cached",
         lambda *, allow_decode: None,
@@ -675,57 +519,45 @@ def test_rejects_tenant_header_when_user_not_member(monkeypatch) -> None:
         SimpleNamespace(should_disable_auth_for_request=lambda: False),
     )
 
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-
-        user = SimpleNamespace(
-            id=7,
-            username="admin",
-            service="http://localhost:7002/realms/shared-users",
-            groups=[SimpleNamespace(identifier="tenant-b:tenant-admin")],
-        )
+    user = SimpleNamespace(
+        id=7,
+        username="admin",
+        service="http://localhost:7002/realms/shared-users",
+        groups=[SimpleNamespace(identifier="tenant-b:tenant-admin")],
+    )
 
-        with app.test_request_context(
-            "/test",
-            headers={"x-m8flow-tenant-id": "tenant-a"},
-        ):
-            g.user = user
-            with pytest.raises(ApiError) as exc:
-                resolve_request_tenant()
+    with app.test_request_context(
+        "/test",
+        headers={"x-m8flow-tenant-id": "tenant-a"},
+    ):
+        g.user = user
+        with pytest.raises(ApiError) as exc:
+            resolve_request_tenant()
 
-            assert exc.value.error_code == "tenant_override_forbidden"
+        assert exc.value.error_code == "tenant_override_forbidden"
 
 
-def test_login_return_resolves_tenant_from_shared_realm_and_cookie() -> None:
+def test_login_return_resolves_tenant_from_shared_realm_and_cookie(app: Flask, monkeypatch) -> None:
     """Shared-realm login_return resolves tenant from m8flow_selected_tenant cookie."""
     import base64
-    import os
-
-    os.environ["M8FLOW_KEYCLOAK_SHARED_REALM"] = "m8flow"
-
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
 
-        state_payload = {
-            "final_url": "http://localhost:7000/",
-            "authentication_identifier": "m8flow",
-        }
-        state = base64.b64encode(bytes(str(state_payload), "utf-8")).decode("utf-8")
+    monkeypatch.setenv("M8FLOW_KEYCLOAK_SHARED_REALM", "m8flow")
 
-        with app.test_request_context(
-            f"/v1.0/login_return?state={state}",
-            environ_base={"HTTP_COOKIE": "m8flow_selected_tenant=tenant-it-id"},
-        ):
-            resolve_request_tenant()
-            assert g.m8flow_tenant_id == "tenant-it-id"
+    state_payload = {
+        "final_url": "http://localhost:7000/",
+        "authentication_identifier": "m8flow",
+    }
+    state = base64.b64encode(bytes(str(state_payload), "utf-8")).decode("utf-8")
 
-    os.environ.pop("M8FLOW_KEYCLOAK_SHARED_REALM", None)
+    with app.test_request_context(
+        f"/v1.0/login_return?state={state}",
+        environ_base={"HTTP_COOKIE": "m8flow_selected_tenant=tenant-it-id"},
+    ):
+        resolve_request_tenant()
+        assert g.m8flow_tenant_id == "tenant-it-id"
 
 
-def test_login_return_skips_tenant_resolution_when_no_selected_tenant_cookie() -> None:
+def test_login_return_skips_tenant_resolution_when_no_selected_tenant_cookie(app: Flask, monkeypatch) -> None:
     """
     /login_return is the OAuth callback and runs BEFORE the auth code is exchanged for a JWT.
     The before_request hook must NOT enforce tenant context here — the handler resolves the
@@ -733,152 +565,114 @@ def test_login_return_skips_tenant_resolution_when_no_selected_tenant_cookie() -
     Failing closed here would break every shared-realm login that didn't pre-set the cookie.
     """
     import base64
-    import os
 
-    os.environ["M8FLOW_KEYCLOAK_SHARED_REALM"] = "m8flow"
-
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-
-        state_payload = {
-            "final_url": "http://localhost:7000/",
-            "authentication_identifier": "m8flow",
-        }
-        state = base64.b64encode(bytes(str(state_payload), "utf-8")).decode("utf-8")
+    monkeypatch.setenv("M8FLOW_KEYCLOAK_SHARED_REALM", "m8flow")
 
-        with app.test_request_context(f"/v1.0/login_return?state={state}"):
-            resolve_request_tenant()
-            # Resolution succeeds without a tenant; the login_return handler will set context later.
-            assert getattr(g, "m8flow_tenant_id", "<unset>") is None
-            assert getattr(g, "_m8flow_global_request", False) is True
+    state_payload = {
+        "final_url": "http://localhost:7000/",
+        "authentication_identifier": "m8flow",
+    }
+    state = base64.b64encode(bytes(str(state_payload), "utf-8")).decode("utf-8")
 
-    os.environ.pop("M8FLOW_KEYCLOAK_SHARED_REALM", None)
+    with app.test_request_context(f"/v1.0/login_return?state={state}"):
+        resolve_request_tenant()
+        # Resolution succeeds without a tenant; the login_return handler will set context later.
+        assert getattr(g, "m8flow_tenant_id", "<unset>") is None
+        assert getattr(g, "_m8flow_global_request", False) is True
 
 
-def test_login_return_skips_tenant_validation_for_master_auth_identifier() -> None:
+def test_login_return_skips_tenant_validation_for_master_auth_identifier(app: Flask) -> None:
     import base64
 
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-
-        state_payload = {
-            "final_url": "http://localhost:6840/tenants",
-            "authentication_identifier": "master",
-        }
-        state = base64.b64encode(bytes(str(state_payload), "utf-8")).decode("utf-8")
-
-        with app.test_request_context(f"/v1.0/login_return?state={state}"):
-            resolve_request_tenant()
-            assert getattr(g, "m8flow_tenant_id", None) is None
-
-
-def test_master_realm_request_does_not_fall_back_to_default_tenant(monkeypatch) -> None:
-    app = _make_app()
-
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
-
-        with app.test_request_context(
-            "/v1.0/m8flow/tenants",
-            headers={"Authorization": "Bearer test-token"},
-        ):
-            g._m8flow_decoded_token = {
-                "iss": "http://localhost:7002/realms/master",
-                "preferred_username": "super-admin",
-                "groups": ["super-admin"],
-            }
-            resolve_request_tenant()
-
-            assert current_tenant_id_or_none() is None
-            assert getattr(g, "m8flow_tenant_id", None) is None
-            # /v1.0/m8flow/tenants is an exempt path so it gets the exempt flag
-            assert getattr(g, "_m8flow_tenant_context_exempt_request", False) is True
+    state_payload = {
+        "final_url": "http://localhost:6840/tenants",
+        "authentication_identifier": "master",
+    }
+    state = base64.b64encode(bytes(str(state_payload), "utf-8")).decode("utf-8")
 
+    with app.test_request_context(f"/v1.0/login_return?state={state}"):
+        resolve_request_tenant()
+        assert getattr(g, "m8flow_tenant_id", None) is None
 
-def test_master_super_admin_request_is_tenant_context_exempt(monkeypatch) -> None:
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
 
-        decoded = {
+def test_master_realm_request_does_not_fall_back_to_default_tenant(app: Flask, monkeypatch) -> None:
+    with app.test_request_context(
+        "/v1.0/m8flow/tenants",
+        headers=_auth("test-token"),
+    ):
+        g._m8flow_decoded_token = {
             "iss": "http://localhost:7002/realms/master",
-            "realm_access": {"roles": ["super-admin"]},
+            "preferred_username": "super-admin",
+            "groups": ["super-admin"],
         }
-        monkeypatch.setattr(
-            "m8flow_backend.services.tenant_context_middleware.AuthenticationService.parse_jwt_token",
-            lambda _identifier, _token: decoded,
-        )
+        resolve_request_tenant()
 
-        with app.test_request_context("/v1.0/process-instances", headers={"Authorization": "Bearer fake"}):
-            resolve_request_tenant()
-            assert getattr(g, "m8flow_tenant_id", None) is None
-            assert getattr(g, "_m8flow_tenant_context_exempt_request", False) is True
+        assert current_tenant_id_or_none() is None
+        assert getattr(g, "m8flow_tenant_id", None) is None
+        # /v1.0/m8flow/tenants is an exempt path so it gets the exempt flag
+        assert getattr(g, "_m8flow_tenant_context_exempt_request", False) is True
 
 
-def test_master_super_admin_groups_request_is_tenant_context_exempt(monkeypatch) -> None:
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
+def test_master_super_admin_request_is_tenant_context_exempt(app: Flask, monkeypatch) -> None:
+    decoded = {
+        "iss": "http://localhost:7002/realms/master",
+        "realm_access": {"roles": ["super-admin"]},
+    }
+    monkeypatch.setattr(
+        "m8flow_backend.services.tenant_context_middleware.AuthenticationService.parse_jwt_token",
+        lambda _identifier, _token: decoded,
+    )
 
-        decoded = {
-            "iss": "http://localhost:7002/realms/master",
-            "groups": ["/super-admin"],
-        }
-        monkeypatch.setattr(
-            "m8flow_backend.services.tenant_context_middleware.AuthenticationService.parse_jwt_token",
-            lambda _identifier, _token: decoded,
-        )
+    with app.test_request_context("/v1.0/process-instances", headers=_auth("fake")):
+        resolve_request_tenant()
+        assert getattr(g, "m8flow_tenant_id", None) is None
+        assert getattr(g, "_m8flow_tenant_context_exempt_request", False) is True
 
-        with app.test_request_context("/v1.0/process-instances", headers={"Authorization": "Bearer fake"}):
-            resolve_request_tenant()
-            assert getattr(g, "m8flow_tenant_id", None) is None
-            assert getattr(g, "_m8flow_tenant_context_exempt_request", False) is True
 
+def test_master_super_admin_groups_request_is_tenant_context_exempt(app: Flask, monkeypatch) -> None:
+    decoded = {
+        "iss": "http://localhost:7002/realms/master",
+        "groups": ["/super-admin"],
+    }
+    monkeypatch.setattr(
+        "m8flow_backend.services.tenant_context_middleware.AuthenticationService.parse_jwt_token",
+        lambda _identifier, _token: decoded,
+    )
+
+    with app.test_request_context("/v1.0/process-instances", headers=_auth("fake")):
+        resolve_request_tenant()
+        assert getattr(g, "m8flow_tenant_id", None) is None
+        assert getattr(g, "_m8flow_tenant_context_exempt_request", False) is True
 
-def test_non_master_super_admin_request_is_not_tenant_context_exempt(monkeypatch) -> None:
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
 
-        decoded = {
-            "iss": "http://localhost:7002/realms/tenant-a",
-            "realm_access": {"roles": ["super-admin"]},
-        }
-        monkeypatch.setattr(
-            "m8flow_backend.services.tenant_context_middleware.AuthenticationService.parse_jwt_token",
-            lambda _identifier, _token: decoded,
-        )
+def test_non_master_super_admin_request_is_not_tenant_context_exempt(app: Flask, monkeypatch) -> None:
+    decoded = {
+        "iss": "http://localhost:7002/realms/tenant-a",
+        "realm_access": {"roles": ["super-admin"]},
+    }
+    monkeypatch.setattr(
+        "m8flow_backend.services.tenant_context_middleware.AuthenticationService.parse_jwt_token",
+        lambda _identifier, _token: decoded,
+    )
 
-        with app.test_request_context("/v1.0/process-instances", headers={"Authorization": "Bearer fake"}):
-            with pytest.raises(ApiError) as exc:
-                resolve_request_tenant()
-            assert exc.value.error_code == "tenant_required"
+    with app.test_request_context("/v1.0/process-instances", headers=_auth("fake")):
+        with pytest.raises(ApiError) as exc:
+            resolve_request_tenant()
+        assert exc.value.error_code == "tenant_required"
 
 
-def test_user_group_super_admin_request_is_tenant_context_exempt_without_token_decode() -> None:
-    app = _make_app()
-    with app.app_context():
-        db.create_all()
-        _seed_tenants()
+def test_user_group_super_admin_request_is_tenant_context_exempt_without_token_decode(app: Flask) -> None:
+    class _Group:
+        def __init__(self, identifier: str) -> None:
+            self.identifier = identifier
 
-        class _Group:
-            def __init__(self, identifier: str) -> None:
-                self.identifier = identifier
+    class _User:
+        def __init__(self) -> None:
+            self.groups = [_Group("master:super-admin")]
 
-        class _User:
-            def __init__(self) -> None:
-                self.groups = [_Group("master:super-admin")]
+    with app.test_request_context("/v1.0/process-instances"):
+        g.user = _User()
+        resolve_request_tenant()
+        assert getattr(g, "m8flow_tenant_id", None) is None
+        assert getattr(g, "_m8flow_tenant_context_exempt_request", False) is True
 
-        with app.test_request_context("/v1.0/process-instances"):
-            g.user = _User()
-            resolve_request_tenant()
-            assert getattr(g, "m8flow_tenant_id", None) is None
-            assert getattr(g, "_m8flow_tenant_context_exempt_request", False) is True